@@ -0,0 +1 @@
+"""Scale benchmarks over a deterministic synthetic media corpus."""
@@ -0,0 +1,268 @@
+"""Run the scale benchmarks: ``python -m benchmarks --files 10000,100000``."""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict
+from datetime import datetime
+import gc
+import json
+import os
+from pathlib import Path
+import platform
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+from orgpicsvideos.core.fs import LocalFS, ThrottledFS, use_fs
+
+from .corpus import default_root, ensure_corpus
+from .iocount import count_io
+from .scenarios import SCENARIOS, Workspace
+
+RESULTS_VERSION = 2
+# Filesystem calls recorded per scenario and compared against the baseline.
+CALL_KEYS = ("stat", "open", "scandir")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Measure scan, plan, copy, resume and rebuild on a synthetic corpus.",
+    )
+    parser.add_argument(
+        "--files",
+        default="10000",
+        help="Comma-separated corpus sizes in media files (default: 10000)",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run; repeat for several (default: all)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per scenario (default: 3)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker threads passed to the code under test (default: CPU count)",
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=default_root(),
+        help="Directory for corpora and scratch data (default: tmpfs when available)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument(
+        "--payload-kb",
+        type=int,
+        default=0,
+        help="Extra bytes per media file, in KB, to make copies I/O-bound (default: 0)",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated delay per filesystem call, as on a NAS or USB card (default: 0)",
+    )
+    parser.add_argument(
+        "--bandwidth-mbps",
+        type=float,
+        default=0.0,
+        help="Simulated link speed for file data in MB/s (default: unlimited)",
+    )
+    parser.add_argument(
+        "--listing-stats",
+        action="store_true",
+        help="Simulate listings that carry file stats (SMB) instead of a call per stat",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Do not trace peak memory in the extra, untimed run per scenario",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("bench-results.json"),
+        help="Results file (default: bench-results.json)",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="Compare against a previous results file; exit 1 on regressions",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Allowed slowdown or memory growth over the baseline (default: 0.15)",
+    )
+    args = parser.parse_args()
+
+    try:
+        sizes = [int(value) for value in args.files.split(",")]
+    except ValueError as exc:
+        raise SystemExit(f"--files must be comma-separated integers: {args.files}") from exc
+    if args.repeat < 1:
+        raise SystemExit("--repeat must be at least 1")
+    if args.latency_ms < 0 or args.bandwidth_mbps < 0:
+        raise SystemExit("--latency-ms and --bandwidth-mbps must not be negative")
+    fs = LocalFS()
+    if args.latency_ms or args.bandwidth_mbps:
+        fs = ThrottledFS(
+            latency=args.latency_ms / 1000,
+            bandwidth=args.bandwidth_mbps * 1024 * 1024 or None,
+            listing_stats=args.listing_stats,
+        )
+    names = args.scenario or list(SCENARIOS)
+
+    results = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "jobs": args.jobs,
+            "seed": args.seed,
+            "payload_kb": args.payload_kb,
+            "latency_ms": args.latency_ms,
+            "bandwidth_mbps": args.bandwidth_mbps,
+            "listing_stats": args.listing_stats,
+            "root": str(args.root),
+        },
+        "sizes": {},
+    }
+    for size in sizes:
+        print(f"Corpus: {size} files", file=sys.stderr)
+        corpus = args.root / f"corpus-{size}"
+        info = ensure_corpus(corpus, size, args.seed, args.payload_kb)
+        workspace = Workspace(corpus, args.root / f"scratch-{size}", args.jobs)
+        scenarios = {}
+        try:
+            for name in names:
+                with use_fs(fs):
+                    result = measure(SCENARIOS[name], workspace, args.repeat, not args.no_memory)
+                scenarios[name] = result
+                print(f"  {format_line(name, result)}", file=sys.stderr)
+        finally:
+            shutil.rmtree(workspace.scratch, ignore_errors=True)
+        results["sizes"][str(size)] = {"corpus": asdict(info), "scenarios": scenarios}
+    args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(f"Results: {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        lines, regressions = compare(results, baseline, args.tolerance)
+        for line in lines:
+            print(line)
+        if regressions:
+            raise SystemExit(1)
+
+
+def measure(
+    setup: Callable[[Workspace], Callable[[], object]],
+    workspace: Workspace,
+    repeat: int,
+    memory: bool,
+) -> dict[str, object]:
+    """Time ``repeat`` runs, then count filesystem calls (and peak memory) in one more."""
+
+    walls = []
+    for _ in range(repeat):
+        run = setup(workspace)
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        walls.append(time.perf_counter() - start)
+    result: dict[str, object] = {
+        "wall_s": round(statistics.median(walls), 6),
+        "wall_min_s": round(min(walls), 6),
+        "runs": repeat,
+    }
+    # A separate run: the counting shim and tracemalloc both slow the code down.
+    run = setup(workspace)
+    gc.collect()
+    if memory:
+        tracemalloc.start()
+    try:
+        with count_io() as io:
+            run()
+        if memory:
+            _, peak = tracemalloc.get_traced_memory()
+            result["peak_mb"] = round(peak / (1024 * 1024), 3)
+    finally:
+        if memory:
+            tracemalloc.stop()
+    result["calls"] = {"stat": io.stats, "open": io["open"], "scandir": io["scandir"]}
+    result["read_bytes"] = io["read_bytes"]
+    return result
+
+
+def format_line(name: str, result: dict[str, object]) -> str:
+    line = f"{name:<14} {result['wall_s']:.3f}s"
+    if "peak_mb" in result:
+        line += f"  peak={result['peak_mb']:.1f}MB"
+    if "calls" in result:
+        calls = result["calls"]
+        line += "  " + " ".join(f"{key}={calls[key]}" for key in CALL_KEYS)  # type: ignore[index]
+    return line
+
+
+def compare(
+    results: dict[str, object], baseline: dict[str, object], tolerance: float
+) -> tuple[list[str], int]:
+    """Return report lines and the number of regressions beyond ``tolerance``.
+
+    Wall time, peak memory and stat/open/scandir counts are compared for
+    every size and scenario present in both files.
+    """
+
+    lines = [f"Compared with baseline (tolerance {tolerance:.0%}):"]
+    regressions = 0
+    for size, current in results["sizes"].items():  # type: ignore[attr-defined]
+        base = baseline.get("sizes", {}).get(size)  # type: ignore[attr-defined]
+        if base is None:
+            lines.append(f"  {size}: not in baseline")
+            continue
+        for name, result in current["scenarios"].items():
+            old = base["scenarios"].get(name)
+            if old is None:
+                lines.append(f"  {size} {name}: not in baseline")
+                continue
+            for key, unit in (("wall_s", "s"), ("peak_mb", "MB")):
+                if key not in result or not old.get(key):
+                    continue
+                change = result[key] / old[key] - 1
+                flag = ""
+                if change > tolerance:
+                    regressions += 1
+                    flag = "  REGRESSION"
+                lines.append(
+                    f"  {size} {name} {key}: {old[key]:.3f}{unit} -> "
+                    f"{result[key]:.3f}{unit} ({change:+.1%}){flag}"
+                )
+            calls, old_calls = result.get("calls", {}), old.get("calls", {})
+            for key in CALL_KEYS:
+                if key not in calls or key not in old_calls:
+                    continue
+                # Call counts are deterministic, so growth means a new probe per item.
+                before, after = old_calls[key], calls[key]
+                flag = ""
+                if after > before * (1 + tolerance):
+                    regressions += 1
+                    flag = "  REGRESSION"
+                lines.append(f"  {size} {name} {key}: {before} -> {after}{flag}")
+    return lines, regressions
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Deterministic synthetic media corpus for benchmarks.
+
+Files are real enough for the extractors: JPEGs carry EXIF ``DateTime`` and
+``DateTimeOriginal`` and MP4s carry an ``mvhd`` creation time. The layout
+mimics camera cards: nested ``DCIM`` folders, names that repeat across
+folders (so planning hits ``unique_path`` collisions), byte-identical
+copies, macOS ``._`` sidecars and OS junk files.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+import io
+import json
+import os
+from pathlib import Path
+import random
+import struct
+
+# Bump when the layout or file contents change, so cached corpora are rebuilt.
+VERSION = 2
+MARKER = "corpus.json"
+
+FILES_PER_FOLDER = 500
+FOLDERS_PER_CARD = 10
+VIDEO_RATIO = 0.1
+DUPLICATE_RATIO = 0.02
+SIDECAR_RATIO = 0.05
+# Capture dates are drawn from a few months so many names collide per target folder.
+FIRST_DAY = datetime(2018, 1, 1)
+DAYS = 3 * 365
+
+_MP4_EPOCH = datetime(1904, 1, 1)
+_jpeg_template: bytes | None = None
+
+
+@dataclass
+class CorpusInfo:
+    """What ``generate`` wrote; stored as ``corpus.json`` in the corpus root."""
+
+    version: int
+    seed: int
+    files: int
+    payload_kb: int
+    images: int = 0
+    videos: int = 0
+    duplicates: int = 0
+    sidecars: int = 0
+    junk: int = 0
+    folders: int = 0
+    bytes: int = 0
+
+
+def default_root() -> Path:
+    """Return a tmpfs-backed directory when there is one, so disks don't skew results."""
+
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm / "orgpicsvideos-bench"
+    import tempfile
+
+    return Path(tempfile.gettempdir()) / "orgpicsvideos-bench"
+
+
+def ensure_corpus(root: Path, files: int, seed: int = 0, payload_kb: int = 0) -> CorpusInfo:
+    """Return the corpus under ``root``, generating it unless an identical one exists."""
+
+    marker = root / MARKER
+    if marker.exists():
+        info = CorpusInfo(**json.loads(marker.read_text(encoding="utf-8")))
+        if (info.version, info.seed, info.files, info.payload_kb) == (
+            VERSION,
+            seed,
+            files,
+            payload_kb,
+        ):
+            return info
+        import shutil
+
+        shutil.rmtree(root)
+    return generate(root, files, seed, payload_kb)
+
+
+def generate(root: Path, files: int, seed: int = 0, payload_kb: int = 0) -> CorpusInfo:
+    """Write ``files`` media files (plus sidecars and junk) under ``root``."""
+
+    rng = random.Random(seed)
+    info = CorpusInfo(VERSION, seed, files, payload_kb)
+    payload = payload_kb * 1024
+    previous: list[tuple[bytes, str]] = []
+    folder: Path | None = None
+    for index in range(files):
+        if index % FILES_PER_FOLDER == 0:
+            card, number = divmod(index // FILES_PER_FOLDER, FOLDERS_PER_CARD)
+            folder = root / f"card{card:03d}" / "DCIM" / f"{100 + number}MEDIA"
+            folder.mkdir(parents=True, exist_ok=True)
+            for junk in (".DS_Store", "Thumbs.db"):
+                (folder / junk).write_bytes(b"\0" * 64)
+            info.junk += 2
+            info.folders += 1
+        assert folder is not None
+        # Counters repeat per card, like a camera that rolls over.
+        number = index % (FILES_PER_FOLDER * FOLDERS_PER_CARD) + 1
+        captured = FIRST_DAY + timedelta(days=rng.randrange(DAYS), seconds=rng.randrange(86400))
+        if previous and rng.random() < DUPLICATE_RATIO:
+            data, suffix = rng.choice(previous)
+            name = f"COPY_{number:04d}{suffix}"
+            info.duplicates += 1
+        elif rng.random() < VIDEO_RATIO:
+            suffix = ".MP4"
+            name = f"MVI_{number:04d}{suffix}"
+            data = mp4_bytes(captured, index, payload)
+        else:
+            suffix = ".JPG"
+            name = f"IMG_{number:04d}{suffix}"
+            data = jpeg_bytes(captured, index, payload)
+        if len(previous) < 1000:
+            previous.append((data, suffix))
+        if suffix == ".MP4":
+            info.videos += 1
+        else:
+            info.images += 1
+        path = folder / name
+        path.write_bytes(data)
+        # Modified a little after capture, as when a card is written.
+        mtime = captured + timedelta(minutes=rng.randrange(1, 600))
+        mtime_ns = int(mtime.timestamp()) * 1_000_000_000
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        info.bytes += len(data)
+        if rng.random() < SIDECAR_RATIO:
+            (folder / f"._{name}").write_bytes(appledouble_bytes())
+            info.sidecars += 1
+    root.mkdir(parents=True, exist_ok=True)
+    (root / MARKER).write_text(json.dumps(asdict(info)), encoding="utf-8")
+    return info
+
+
+def jpeg_bytes(captured: datetime, serial: int, payload: int = 0) -> bytes:
+    """Return a decodable JPEG whose EXIF dates are ``captured``.
+
+    ``serial`` goes into a comment so every file has distinct content. The
+    ``payload`` padding follows the end-of-image marker, where it stands in
+    for image data that metadata readers never need to read.
+    """
+
+    template = _template()
+    comment = f"orgpicsvideos-bench {serial}".encode()
+    segment = b"\xff\xfe" + struct.pack(">H", len(comment) + 2) + comment
+    return template[:2] + _exif_segment(captured) + segment + template[2:] + b"\0" * payload
+
+
+def mp4_bytes(captured: datetime, serial: int, payload: int = 0) -> bytes:
+    """Return a minimal MP4 (``ftyp``, ``moov/mvhd``, ``mdat``) created at ``captured``."""
+
+    seconds = int((captured - _MP4_EPOCH).total_seconds())
+    ftyp = _box(b"ftyp", b"isom" + struct.pack(">I", 0x200) + b"isommp42")
+    matrix = struct.pack(">9I", 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000)
+    mvhd = _box(
+        b"mvhd",
+        struct.pack(">B3xIIII", 0, seconds, seconds, 1000, 1000)
+        + struct.pack(">IH10x", 0x10000, 0x100)
+        + matrix
+        + b"\0" * 24
+        + struct.pack(">I", 2),
+    )
+    mdat = _box(b"mdat", struct.pack(">Q", serial) + b"\0" * payload)
+    return ftyp + _box(b"moov", mvhd) + mdat
+
+
+def appledouble_bytes() -> bytes:
+    """Return a 4 KB AppleDouble header like macOS writes to non-HFS volumes."""
+
+    header = struct.pack(">IIH", 0x00051607, 0x00020000, 0) + b"Mac OS X        "
+    return header + b"\0" * (4096 - len(header))
+
+
+def _template() -> bytes:
+    global _jpeg_template
+    if _jpeg_template is None:
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("L", (8, 8), 128).save(buffer, "JPEG", quality=50)
+        _jpeg_template = buffer.getvalue()
+    return _jpeg_template
+
+
+def _exif_segment(captured: datetime) -> bytes:
+    # Little-endian TIFF: IFD0 holds DateTime and a pointer to the Exif IFD,
+    # which holds DateTimeOriginal, as cameras write them.
+    stamp = captured.strftime("%Y:%m:%d %H:%M:%S").encode() + b"\0"
+    ifd0, exif_ifd = 8, 8 + 30 + 20
+    tiff = b"II*\x00" + struct.pack("<I", ifd0)
+    tiff += struct.pack("<H", 2)
+    tiff += struct.pack("<HHII", 0x0132, 2, 20, ifd0 + 30)
+    tiff += struct.pack("<HHII", 0x8769, 4, 1, exif_ifd)
+    tiff += struct.pack("<I", 0) + stamp
+    tiff += struct.pack("<H", 1)
+    tiff += struct.pack("<HHII", 0x9003, 2, 20, exif_ifd + 18)
+    tiff += struct.pack("<I", 0) + stamp
+    body = b"Exif\0\0" + tiff
+    return b"\xff\xe1" + struct.pack(">H", len(body) + 2) + body
+
+
+def _box(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body) + 8) + kind + body
@@ -0,0 +1,178 @@
+"""Filesystem call counter shared by the benchmarks and the I/O budget tests.
+
+``count_io`` patches the ``os``, ``builtins`` and ``io`` entry points that
+the code under test reaches (directly or through ``core.fs``), so counts
+are the same on every platform and include calls made by worker threads.
+"""
+
+from __future__ import annotations
+
+import builtins
+from collections import Counter
+from contextlib import contextmanager
+import io
+import os
+import threading
+from typing import Any, Callable, Iterator
+
+
+class IOCounts(Counter):
+    """Filesystem calls made while a ``count_io`` block was active.
+
+    Keys are ``stat`` (``os.stat``/``os.lstat``, so also ``pathlib`` and
+    ``os.path`` checks), ``entry_stat`` (first ``DirEntry.stat`` per entry),
+    ``scandir``, ``listdir``, ``open`` (file objects and raw fds),
+    ``read_bytes``, ``xattr``, ``mkdir``, ``rename`` and ``unlink``.
+    """
+
+    @property
+    def stats(self) -> int:
+        return self["stat"] + self["entry_stat"]
+
+
+class _Entry:
+    __slots__ = ("_entry", "_counts", "_stats")
+
+    def __init__(self, entry: os.DirEntry[str], counts: Callable[[str, int], None]) -> None:
+        self._entry = entry
+        self._counts = counts
+        self._stats: set[bool] = set()
+
+    name = property(lambda self: self._entry.name)
+    path = property(lambda self: self._entry.path)
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self) -> bool:
+        return self._entry.is_symlink()
+
+    def inode(self) -> int:
+        return self._entry.inode()
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        # DirEntry caches its stat, so only the first call per mode is a syscall.
+        if follow_symlinks not in self._stats:
+            self._stats.add(follow_symlinks)
+            self._counts("entry_stat", 1)
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def __fspath__(self) -> str:
+        return self._entry.path
+
+
+class _Scandir:
+    def __init__(self, it: Any, counts: Callable[[str, int], None]) -> None:
+        self._it = it
+        self._counts = counts
+
+    def __iter__(self) -> Iterator[_Entry]:
+        return self
+
+    def __next__(self) -> _Entry:
+        return _Entry(next(self._it), self._counts)
+
+    def __enter__(self) -> _Scandir:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._it.close()
+
+    def close(self) -> None:
+        self._it.close()
+
+
+class _File:
+    def __init__(self, handle: Any, counts: Callable[[str, int], None]) -> None:
+        self._handle = handle
+        self._counts = counts
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._handle, name)
+
+    def read(self, *args: Any) -> Any:
+        data = self._handle.read(*args)
+        self._counts("read_bytes", len(data))
+        return data
+
+    def read1(self, *args: Any) -> Any:
+        data = self._handle.read1(*args)
+        self._counts("read_bytes", len(data))
+        return data
+
+    def readinto(self, buffer: Any) -> Any:
+        count = self._handle.readinto(buffer)
+        self._counts("read_bytes", count or 0)
+        return count
+
+    def __iter__(self) -> Iterator[Any]:
+        for line in self._handle:
+            self._counts("read_bytes", len(line))
+            yield line
+
+    def __enter__(self) -> _File:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._handle.close()
+
+
+@contextmanager
+def count_io() -> Iterator[IOCounts]:
+    """Count filesystem calls made, from any thread, inside the block."""
+
+    counts = IOCounts()
+    lock = threading.Lock()
+
+    def add(key: str, value: int) -> None:
+        with lock:
+            counts[key] += value
+
+    def counted(key: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            add(key, 1)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    real_open = builtins.open
+    real_scandir = os.scandir
+
+    def open_file(*args: Any, **kwargs: Any) -> Any:
+        add("open", 1)
+        return _File(real_open(*args, **kwargs), add)
+
+    def scandir(*args: Any, **kwargs: Any) -> _Scandir:
+        add("scandir", 1)
+        return _Scandir(real_scandir(*args, **kwargs), add)
+
+    patches: list[tuple[Any, str, Any]] = [
+        (builtins, "open", open_file),
+        (io, "open", open_file),
+        (os, "scandir", scandir),
+    ]
+    for name, key in (
+        ("stat", "stat"),
+        ("lstat", "stat"),
+        ("listdir", "listdir"),
+        ("open", "open"),
+        ("getxattr", "xattr"),
+        ("mkdir", "mkdir"),
+        ("rename", "rename"),
+        ("replace", "rename"),
+        ("unlink", "unlink"),
+        ("remove", "unlink"),
+    ):
+        if hasattr(os, name):
+            patches.append((os, name, counted(key, getattr(os, name))))
+    originals = [(target, name, getattr(target, name)) for target, name, _ in patches]
+    for target, name, replacement in patches:
+        setattr(target, name, replacement)
+    try:
+        yield counts
+    finally:
+        for target, name, original in originals:
+            setattr(target, name, original)
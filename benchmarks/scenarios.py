@@ -0,0 +1,141 @@
+"""Benchmark scenarios over a generated corpus.
+
+Each scenario's ``setup`` does the untimed preparation and returns the
+callable that is measured. Setups may be called several times (repeats and
+the counting pass), so they start from a fresh scratch directory when the
+measured step writes anything.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import os
+from pathlib import Path
+import shutil
+from typing import Callable
+
+from orgpicsvideos.core.cache import MetadataCache
+from orgpicsvideos.core.copier import execute_plan
+from orgpicsvideos.core.hashing import DuplicateFinder
+from orgpicsvideos.core.logger import LogWriter, load_successful_destinations
+from orgpicsvideos.core.planner import build_plan
+from orgpicsvideos.core.rebuild import rebuild_destination
+from orgpicsvideos.core.scanner import scan_media
+from orgpicsvideos.core.types import MediaFile
+
+from .corpus import MARKER
+
+
+@dataclass
+class Workspace:
+    """A corpus plus a scratch directory for destinations and caches."""
+
+    corpus: Path
+    scratch: Path
+    jobs: int
+    _media: list[MediaFile] | None = field(default=None, repr=False)
+    _imported: tuple[Path, Path] | None = field(default=None, repr=False)
+
+    def fresh(self, name: str) -> Path:
+        path = self.scratch / name
+        if path.exists():
+            shutil.rmtree(path)
+        path.mkdir(parents=True)
+        return path
+
+    def media(self) -> list[MediaFile]:
+        if self._media is None:
+            self._media = list(scan_media(self.corpus, jobs=self.jobs))
+        return self._media
+
+    def imported(self) -> tuple[Path, Path]:
+        """Return a destination holding a full import of the corpus, and its log."""
+
+        if self._imported is None:
+            destination = self.fresh("imported")
+            log_path = destination / "import.log"
+            plan = build_plan(self.media(), destination)
+            with LogWriter(log_path, self.corpus, destination) as writer:
+                execute_plan(plan.operations, writer.write, jobs=self.jobs)
+            self._imported = destination, log_path
+        return self._imported
+
+
+Setup = Callable[[Workspace], Callable[[], object]]
+
+
+def _scan(ws: Workspace) -> Callable[[], object]:
+    return lambda: list(scan_media(ws.corpus, jobs=ws.jobs))
+
+
+def _scan_cached(ws: Workspace) -> Callable[[], object]:
+    cache_path = ws.scratch / "cache" / "metadata.sqlite"
+    if not cache_path.exists():
+        with MetadataCache(cache_path) as cache:
+            for _ in scan_media(ws.corpus, jobs=ws.jobs, cache=cache):
+                pass
+
+    def run() -> object:
+        with MetadataCache(cache_path) as cache:
+            return list(scan_media(ws.corpus, jobs=ws.jobs, cache=cache))
+
+    return run
+
+
+def _plan(ws: Workspace) -> Callable[[], object]:
+    media = ws.media()
+    destination = ws.fresh("plan")
+    return lambda: build_plan(media, destination)
+
+
+def _plan_content(ws: Workspace) -> Callable[[], object]:
+    media = ws.media()
+    destination = ws.fresh("plan")
+    return lambda: build_plan(media, destination, duplicates=DuplicateFinder(ws.jobs))
+
+
+def _execute(ws: Workspace) -> Callable[[], object]:
+    destination = ws.fresh("execute")
+    plan = build_plan(ws.media(), destination)
+
+    def run() -> object:
+        with LogWriter(destination / "import.log", ws.corpus, destination) as writer:
+            execute_plan(plan.operations, writer.write, jobs=ws.jobs)
+        return plan
+
+    return run
+
+
+def _resume(ws: Workspace) -> Callable[[], object]:
+    destination, log_path = ws.imported()
+
+    def run() -> object:
+        done = load_successful_destinations(log_path, ws.corpus, destination)
+        media = list(scan_media(ws.corpus, jobs=ws.jobs))
+        return build_plan(media, destination, skip_destinations=done)
+
+    return run
+
+
+def _rebuild(ws: Workspace) -> Callable[[], object]:
+    # An unorganized library: the corpus tree itself, hardlinked so setup is cheap.
+    destination = ws.fresh("rebuild")
+    for directory, _, names in os.walk(ws.corpus):
+        target = destination / os.path.relpath(directory, ws.corpus)
+        target.mkdir(exist_ok=True)
+        for name in names:
+            if name != MARKER:
+                os.link(os.path.join(directory, name), target / name)
+    log_path = ws.scratch / "rebuild.log"
+    return lambda: rebuild_destination(destination, log_path, jobs=ws.jobs)
+
+
+SCENARIOS: dict[str, Setup] = {
+    "scan": _scan,
+    "scan_cached": _scan_cached,
+    "plan": _plan,
+    "plan_content": _plan_content,
+    "execute": _execute,
+    "resume": _resume,
+    "rebuild": _rebuild,
+}
@@ -4,22 +4,26 @@ from __future__ import annotations
 
 import argparse
 import os
+import sys
 from pathlib import Path
+from typing import Iterator
 
+from orgpicsvideos.core.deleter import REPORT_FORMATS, DeleteBatch, ReportWriter, delete_batches
+from orgpicsvideos.core.walk import walk
 
-def iter_files(root: Path):
-    stack = [root]
-    while stack:
-        current = stack.pop()
-        try:
-            with os.scandir(current) as it:
-                for entry in it:
-                    if entry.is_dir(follow_symlinks=False):
-                        stack.append(Path(entry.path))
-                    elif entry.is_file(follow_symlinks=False):
-                        yield Path(entry.path)
-        except PermissionError:
-            continue
+
+def iter_batches(root: Path, threshold_bytes: int, jobs: int = 1) -> Iterator[DeleteBatch]:
+    """Yield per-directory batches of files smaller than the threshold."""
+
+    # The walker stats each file once while listing its directory.
+    for listing in walk(root, stat_file=True, jobs=jobs):
+        files = [
+            (entry.name, entry.stat.st_size)
+            for entry in listing.files
+            if entry.stat is not None and entry.stat.st_size < threshold_bytes
+        ]
+        if files:
+            yield DeleteBatch(listing.path, files)
 
 
 def main() -> None:
@@ -38,38 +42,59 @@ def main() -> None:
         action="store_true",
         help="Show files that would be deleted without deleting them",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker threads for walking and deleting (default: CPU count)",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help="Write the per-file report to this file instead of stdout",
+    )
+    parser.add_argument(
+        "--format",
+        choices=REPORT_FORMATS,
+        default="text",
+        help="Report format (default: text)",
+    )
     args = parser.parse_args()
 
     root = args.root
     if not root.exists() or not root.is_dir():
         raise SystemExit(f"Root is not a directory: {root}")
+    if args.jobs < 1:
+        raise SystemExit("--jobs must be at least 1")
 
     # Threshold is defined in KB for easy user input; convert to bytes.
     threshold_bytes = args.threshold_kb * 1024
-    deleted = 0
-    total = 0
+    batches = iter_batches(root, threshold_bytes, jobs=args.jobs)
 
-    for path in iter_files(root):
-        try:
-            size = path.stat().st_size
-        except OSError:
-            continue
-        if size < threshold_bytes:
-            total += 1
-            if args.dry_run:
-                print(f"DRY-RUN delete {path} ({size} bytes)")
-                continue
-            try:
-                path.unlink()
-                deleted += 1
-                print(f"deleted {path} ({size} bytes)")
-            except OSError as exc:
-                print(f"failed {path} ({size} bytes): {exc}")
+    if args.report:
+        with args.report.open("w", encoding="utf-8") as handle:
+            summary = delete_batches(
+                batches, ReportWriter(handle, args.format), dry_run=args.dry_run, jobs=args.jobs
+            )
+    else:
+        summary = delete_batches(
+            batches, ReportWriter(sys.stdout, args.format), dry_run=args.dry_run, jobs=args.jobs
+        )
 
+    # Keep stdout parseable when the report is written there.
+    out = sys.stdout if args.report else sys.stderr
+    reclaimed = f"{summary.bytes_reclaimed} bytes ({summary.bytes_reclaimed / (1024 * 1024):.1f} MiB)"
     if args.dry_run:
-        print(f"Dry-run complete. Candidates: {total}")
+        print(
+            f"Dry-run complete. Candidates: {summary.candidates}. Reclaimable: {reclaimed}.",
+            file=out,
+        )
     else:
-        print(f"Deleted {deleted} files (candidates: {total}).")
+        print(
+            f"Deleted {summary.deleted} files (candidates: {summary.candidates}, "
+            f"failed: {summary.failed}). Reclaimed: {reclaimed}.",
+            file=out,
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+"""Persistent metadata cache so unchanged files are not re-parsed."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+import sqlite3
+import threading
+
+from .types import STATE_DIR_NAME, MediaType
+
+# Commit in batches; a commit per file would dominate runtime on large libraries.
+_COMMIT_EVERY = 1000
+
+
+class MetadataCache:
+    """SQLite-backed cache of creation times and content digests keyed by path, size and mtime.
+
+    Entries are only trusted when size and mtime_ns still match the file on disk.
+    The cache is safe to share between worker threads.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pending = 0
+
+    def __enter__(self) -> "MetadataCache":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        self.close()
+
+    def open(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            "path TEXT PRIMARY KEY, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "created_at TEXT NOT NULL, "
+            "media_type TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS digests ("
+            "path TEXT NOT NULL, "
+            "kind TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "digest TEXT NOT NULL, "
+            "PRIMARY KEY (path, kind))"
+        )
+        conn.commit()
+        self._conn = conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+                self._pending = 0
+
+    def get(self, path: Path, size: int, mtime_ns: int) -> tuple[datetime, MediaType] | None:
+        """Return the cached (created_at, media_type) if the entry is still fresh."""
+
+        with self._lock:
+            row = self._require().execute(
+                "SELECT size, mtime_ns, created_at, media_type FROM metadata WHERE path = ?",
+                (str(path),),
+            ).fetchone()
+        if not row or row[0] != size or row[1] != mtime_ns:
+            return None
+        try:
+            return datetime.fromisoformat(row[2]), MediaType(row[3])
+        except ValueError:
+            return None
+
+    def put(
+        self,
+        path: Path,
+        size: int,
+        mtime_ns: int,
+        created_at: datetime,
+        media_type: MediaType,
+    ) -> None:
+        with self._lock:
+            self._require().execute(
+                "INSERT OR REPLACE INTO metadata (path, size, mtime_ns, created_at, media_type) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (str(path), size, mtime_ns, created_at.isoformat(), media_type.value),
+            )
+            self._mark_dirty()
+
+    def get_digest(self, path: Path, kind: str, size: int, mtime_ns: int) -> str | None:
+        """Return a cached content digest if the file is unchanged."""
+
+        with self._lock:
+            row = self._require().execute(
+                "SELECT size, mtime_ns, digest FROM digests WHERE path = ? AND kind = ?",
+                (str(path), kind),
+            ).fetchone()
+        if not row or row[0] != size or row[1] != mtime_ns:
+            return None
+        return row[2]
+
+    def put_digest(self, path: Path, kind: str, size: int, mtime_ns: int, digest: str) -> None:
+        with self._lock:
+            self._require().execute(
+                "INSERT OR REPLACE INTO digests (path, kind, size, mtime_ns, digest) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (str(path), kind, size, mtime_ns, digest),
+            )
+            self._mark_dirty()
+
+    def rename(self, old: Path, new: Path) -> None:
+        """Re-key an entry after a move so the next run still hits the cache."""
+
+        with self._lock:
+            conn = self._require()
+            for table in ("metadata", "digests"):
+                conn.execute(f"DELETE FROM {table} WHERE path = ?", (str(new),))
+                conn.execute(f"UPDATE {table} SET path = ? WHERE path = ?", (str(new), str(old)))
+            self._mark_dirty()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._require().commit()
+            self._pending = 0
+
+    def _mark_dirty(self) -> None:
+        self._pending += 1
+        if self._pending >= _COMMIT_EVERY:
+            self._require().commit()
+            self._pending = 0
+
+    def _require(self) -> sqlite3.Connection:
+        if not self._conn:
+            raise RuntimeError("MetadataCache not opened")
+        return self._conn
+
+
+def default_cache_path(destination_root: Path) -> Path:
+    """Return the metadata cache location inside a destination root."""
+
+    return destination_root / STATE_DIR_NAME / "metadata.sqlite"
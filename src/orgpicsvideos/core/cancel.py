@@ -0,0 +1,53 @@
+"""Cooperative cancellation and pausing for long-running walks and executions."""
+
+from __future__ import annotations
+
+import threading
+
+
+class OperationCancelled(Exception):
+    """Raised when a cancel token is triggered during a long-running operation."""
+
+
+# Loops that handle many cheap items check the token every this many items.
+CHECK_INTERVAL = 256
+
+
+class CancelToken:
+    """Thread-safe flags checked periodically by workers.
+
+    ``checkpoint`` is the one call workers make: it raises once cancelled and
+    blocks while paused. Cancelling also releases paused workers.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def cancel(self) -> None:
+        self._event.set()
+        self._running.set()
+
+    def pause(self) -> None:
+        if not self._event.is_set():
+            self._running.clear()
+
+    def resume(self) -> None:
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelled("Operation cancelled")
+
+    def checkpoint(self) -> None:
+        self._running.wait()
+        self.raise_if_cancelled()
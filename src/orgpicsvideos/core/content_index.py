@@ -0,0 +1,221 @@
+"""Persistent content index of an organized library."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Iterable
+
+from .cancel import CancelToken
+from .hashing import FULL, PARTIAL, FileRef
+from .scanner import SKIP_DIR_NAMES
+from .types import STATE_DIR_NAME, OperationType, PlannedOperation
+from .utils import is_media_name
+from .walk import walk
+
+# Commit in batches, as the metadata cache does.
+_COMMIT_EVERY = 1000
+_DIGEST_COLUMNS = {PARTIAL: "partial", FULL: "full"}
+# Digests survive a re-add only while size and mtime are unchanged.
+_UPSERT = (
+    "INSERT INTO files (path, size, mtime_ns) VALUES (?, ?, ?) "
+    "ON CONFLICT (path) DO UPDATE SET "
+    "partial = CASE WHEN size = excluded.size AND mtime_ns = excluded.mtime_ns "
+    "THEN partial END, "
+    "full = CASE WHEN size = excluded.size AND mtime_ns = excluded.mtime_ns THEN full END, "
+    "size = excluded.size, mtime_ns = excluded.mtime_ns"
+)
+
+
+class ContentIndex:
+    """SQLite index of every media file in a destination: size -> digests -> paths.
+
+    Rows are keyed by path and looked up by size, so "is this content
+    anywhere in the library?" needs no walk of the destination. Digests are
+    filled in lazily the first time a file has to be compared, and are only
+    trusted while size and mtime_ns still match. ``record`` keeps the index
+    in step with executed operations.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pending = 0
+
+    def __enter__(self) -> "ContentIndex":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        self.close()
+
+    def open(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "partial TEXT, "
+            "full TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS files_size ON files (size)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.commit()
+        self._conn = conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+                self._pending = 0
+
+    @property
+    def populated(self) -> bool:
+        """True once ``populate`` has indexed the whole library."""
+
+        with self._lock:
+            row = self._require().execute(
+                "SELECT value FROM meta WHERE key = 'populated'"
+            ).fetchone()
+        return row is not None
+
+    def populate(
+        self, destination_root: Path, jobs: int = 1, cancel: CancelToken | None = None
+    ) -> int:
+        """Index every media file under ``destination_root`` (sizes only) and return the count."""
+
+        count = 0
+        listings = walk(
+            destination_root,
+            skip_dir=SKIP_DIR_NAMES.__contains__,
+            stat_file=is_media_name,
+            jobs=jobs,
+            cancel=cancel,
+        )
+        for listing in listings:
+            rows = [
+                (entry.path, entry.stat.st_size, entry.stat.st_mtime_ns)
+                for entry in listing.files
+                if entry.stat is not None
+            ]
+            if rows:
+                with self._lock:
+                    self._require().executemany(_UPSERT, rows)
+                    self._mark_dirty(len(rows))
+                count += len(rows)
+        with self._lock:
+            self._require().execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('populated', ?)",
+                (str(count),),
+            )
+            self._require().commit()
+            self._pending = 0
+        return count
+
+    def add(self, path: Path, size: int, mtime_ns: int) -> None:
+        with self._lock:
+            self._require().execute(_UPSERT, (str(path), size, mtime_ns))
+            self._mark_dirty()
+
+    def remove(self, path: Path) -> None:
+        with self._lock:
+            self._require().execute("DELETE FROM files WHERE path = ?", (str(path),))
+            self._mark_dirty()
+
+    def move(self, old: Path, new: Path) -> None:
+        """Re-key an entry after a move; its digests stay valid."""
+
+        with self._lock:
+            conn = self._require()
+            conn.execute("DELETE FROM files WHERE path = ?", (str(new),))
+            moved = conn.execute(
+                "UPDATE files SET path = ? WHERE path = ?", (str(new), str(old))
+            ).rowcount
+            self._mark_dirty()
+        if not moved:
+            self._add_from_disk(new)
+
+    def record(self, op: PlannedOperation) -> None:
+        """Apply a successful plan operation to the index."""
+
+        if op.op_type == OperationType.COPY:
+            self._add_from_disk(op.destination)
+        elif op.op_type == OperationType.MOVE and op.source is not None:
+            if is_media_name(op.destination.name):
+                self.move(op.source, op.destination)
+            else:
+                self.remove(op.source)
+        elif op.op_type == OperationType.DELETE:
+            self.remove(op.destination)
+
+    def with_sizes(self, sizes: Iterable[int]) -> list[FileRef]:
+        """Return indexed files whose size is one of ``sizes``."""
+
+        refs: list[FileRef] = []
+        with self._lock:
+            conn = self._require()
+            for size in set(sizes):
+                for path, mtime_ns in conn.execute(
+                    "SELECT path, mtime_ns FROM files WHERE size = ?", (size,)
+                ):
+                    refs.append(FileRef(Path(path), size, mtime_ns))
+        return refs
+
+    def get_digest(self, path: Path, kind: str, size: int, mtime_ns: int) -> str | None:
+        column = _DIGEST_COLUMNS[kind]
+        with self._lock:
+            row = self._require().execute(
+                f"SELECT size, mtime_ns, {column} FROM files WHERE path = ?", (str(path),)
+            ).fetchone()
+        if not row or row[0] != size or row[1] != mtime_ns:
+            return None
+        return row[2]
+
+    def put_digest(self, path: Path, kind: str, size: int, mtime_ns: int, digest: str) -> None:
+        """Store a digest for an indexed file; files outside the library are ignored."""
+
+        column = _DIGEST_COLUMNS[kind]
+        with self._lock:
+            self._require().execute(
+                f"UPDATE files SET {column} = ? WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (digest, str(path), size, mtime_ns),
+            )
+            self._mark_dirty()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._require().execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def _add_from_disk(self, path: Path) -> None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.remove(path)
+            return
+        self.add(path, stat.st_size, stat.st_mtime_ns)
+
+    def _mark_dirty(self, rows: int = 1) -> None:
+        self._pending += rows
+        if self._pending >= _COMMIT_EVERY:
+            self._require().commit()
+            self._pending = 0
+
+    def _require(self) -> sqlite3.Connection:
+        if not self._conn:
+            raise RuntimeError("ContentIndex not opened")
+        return self._conn
+
+
+def default_index_path(destination_root: Path) -> Path:
+    """Return the content index location inside a destination root."""
+
+    return destination_root / STATE_DIR_NAME / "content.sqlite"
@@ -2,59 +2,202 @@
 
 from __future__ import annotations
 
-import shutil
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+import hashlib
 from pathlib import Path
-from typing import Callable, Iterable
+from typing import TYPE_CHECKING, Callable, Iterable, Sequence, TypeVar
 
+from .cancel import CancelToken
+from .fs import current_fs
+from .metrics import METRICS, timed
+from .trace import TRACER, traced
+from .plan_table import PlanTable
 from .types import OperationType, PlannedOperation
+from .xattrs import Stamp, write_stamp
 
+if TYPE_CHECKING:
+    from .content_index import ContentIndex
 
 LogCallback = Callable[[str], None]
 ProgressCallback = Callable[[int, int], None]
 OpCallback = Callable[[PlannedOperation, bool], None]
+# (success, failure reason, SHA-256 of the copied data when hashed)
+_Result = tuple[bool, str, str | None]
+T = TypeVar("T")
 
+# File transfers can run concurrently; mkdir/delete act as ordering barriers.
+_PARALLEL_OPS = {OperationType.COPY, OperationType.MOVE}
 
+
+@timed("exec")
+@traced("exec")
 def execute_plan(
     operations: Iterable[PlannedOperation],
     log_cb: LogCallback,
     progress_cb: ProgressCallback | None = None,
     op_cb: OpCallback | None = None,
+    jobs: int = 1,
+    cancel: CancelToken | None = None,
+    index: ContentIndex | None = None,
+    stamps: bool = False,
 ) -> None:
-    """Execute a plan, logging results for each operation."""
+    """Execute a plan, logging results for each operation.
+
+    With ``jobs > 1`` consecutive copy/move operations run in a thread pool.
+    Callbacks are always invoked on the calling thread.
+
+    A ``cancel`` token is checked before each operation is started. Pausing
+    first reports every operation already in flight; cancelling does the
+    same and then raises ``OperationCancelled``, so every started operation
+    is logged and nothing after it has run.
+
+    An ``index`` is updated after every successful copy, move or delete.
+    With ``stamps``, each copied file gets extended-attribute stamps of its
+    capture time and source mtime from the plan (see ``core.xattrs``) and of
+    its SHA-256, computed from the data as it is copied.
+    """
 
-    ops = list(operations)
+    # Plans are usually a PlanTable; iterate it in place rather than materializing.
+    ops = operations if isinstance(operations, Sequence) else list(operations)
     total = len(ops)
-    for index, op in enumerate(ops, start=1):
-        success = True
-        reason = ""
-        try:
-            if op.op_type == OperationType.MKDIR:
-                op.destination.mkdir(parents=True, exist_ok=True)
-            elif op.op_type == OperationType.COPY:
-                if op.source is None:
-                    raise RuntimeError("Missing source for copy operation")
-                op.destination.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(op.source, op.destination)
-            elif op.op_type == OperationType.MOVE:
-                if op.source is None:
-                    raise RuntimeError("Missing source for move operation")
-                op.destination.parent.mkdir(parents=True, exist_ok=True)
-                shutil.move(op.source, op.destination)
-            elif op.op_type == OperationType.DELETE:
-                if op.destination.exists():
-                    op.destination.unlink()
-            else:
-                raise RuntimeError(f"Unsupported operation: {op.op_type}")
-        except Exception as exc:  # noqa: BLE001
-            success = False
-            reason = str(exc)
+    done = 0
 
-        log_line = _format_log_line(op, success, reason)
-        log_cb(log_line)
+    def report(op: PlannedOperation, success: bool, reason: str, sha: str | None) -> None:
+        nonlocal done
+        # Results arrive in plan order, so ``done`` is still this op's index.
+        if stamps and success and op.op_type == OperationType.COPY:
+            write_stamp(op.destination, _copy_stamp(ops, done, sha))
+        if METRICS.enabled:
+            _count(ops, done, op, success)
+        done += 1
+        log_cb(_format_log_line(op, success, reason))
+        if index is not None and success:
+            index.record(op)
         if op_cb:
             op_cb(op, success)
         if progress_cb:
-            progress_cb(index, total)
+            progress_cb(done, total)
+
+    if jobs <= 1:
+        for op in ops:
+            if cancel is not None:
+                cancel.checkpoint()
+            report(op, *_run_operation(op, stamps))
+        return
+
+    window = jobs * 4
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="exec") as pool:
+        pending: deque[tuple[PlannedOperation, Future[_Result]]] = deque()
+
+        def drain(limit: int) -> None:
+            while len(pending) > limit:
+                op, future = pending.popleft()
+                report(op, *future.result())
+
+        try:
+            for op in ops:
+                if cancel is not None:
+                    if cancel.paused or cancel.cancelled:
+                        drain(0)
+                    cancel.checkpoint()
+                if op.op_type in _PARALLEL_OPS:
+                    pending.append((op, pool.submit(_run_operation, op, stamps)))
+                    drain(window)
+                    continue
+                drain(0)
+                report(op, *_run_operation(op, stamps))
+        finally:
+            drain(0)
+
+
+def _run_operation(op: PlannedOperation, hash_copies: bool = False) -> _Result:
+    if METRICS.enabled or TRACER.enabled:
+        kind = op.op_type.value
+        with METRICS.timer(f"exec.{kind}"), TRACER.span(kind, "exec", op.destination):
+            return _apply_operation(op, hash_copies)
+    return _apply_operation(op, hash_copies)
+
+
+def _apply_operation(op: PlannedOperation, hash_copies: bool) -> _Result:
+    fs = current_fs()
+    sha = None
+    try:
+        if op.op_type == OperationType.MKDIR:
+            fs.mkdir(op.destination)
+        elif op.op_type == OperationType.COPY:
+            if op.source is None:
+                raise RuntimeError("Missing source for copy operation")
+            if hash_copies:
+                sha = _into_parent(_copy_hashed, op.source, op.destination)
+            else:
+                _into_parent(fs.copy, op.source, op.destination)
+        elif op.op_type == OperationType.MOVE:
+            if op.source is None:
+                raise RuntimeError("Missing source for move operation")
+            _into_parent(_move, op.source, op.destination)
+        elif op.op_type == OperationType.DELETE:
+            # Already gone counts as deleted.
+            with suppress(FileNotFoundError):
+                fs.unlink(op.destination)
+        else:
+            raise RuntimeError(f"Unsupported operation: {op.op_type}")
+    except Exception as exc:  # noqa: BLE001
+        return False, str(exc), None
+    return True, "", sha
+
+
+def _into_parent(action: Callable[[Path, Path], T], source: Path, destination: Path) -> T:
+    # Plans create their folders before the transfers, so the parent is only
+    # made (and probed) when the transfer finds it missing.
+    try:
+        return action(source, destination)
+    except FileNotFoundError:
+        fs = current_fs()
+        if fs.is_dir(destination.parent):
+            raise
+        fs.mkdir(destination.parent)
+        return action(source, destination)
+
+
+def _copy_hashed(source: Path, destination: Path) -> str:
+    # The digest of ``hashing.full_digest``, without reading the file a second time.
+    digest = hashlib.sha256()
+    current_fs().copy(source, destination, digest.update)
+    return digest.hexdigest()
+
+
+def _move(source: Path, destination: Path) -> None:
+    fs = current_fs()
+    try:
+        fs.rename(source, destination)
+    except OSError:
+        # Across devices (or onto an existing file on Windows) fall back to copy and delete.
+        fs.copy(source, destination)
+        fs.unlink(source)
+
+
+def _count(
+    ops: Sequence[PlannedOperation], position: int, op: PlannedOperation, success: bool
+) -> None:
+    kind = op.op_type.value
+    if not success:
+        METRICS.incr(f"exec.{kind}.failed")
+        return
+    METRICS.incr(f"exec.{kind}.ok")
+    # Plan tables carry the source size, so transfers are measured without a stat.
+    if op.op_type in _PARALLEL_OPS and isinstance(ops, PlanTable):
+        METRICS.incr(f"exec.{kind}.bytes", ops.size(position))
+
+
+def _copy_stamp(ops: Sequence[PlannedOperation], position: int, sha: str | None) -> Stamp:
+    # Only plan tables carry the capture time and source mtime.
+    if not isinstance(ops, PlanTable):
+        return Stamp(sha=sha)
+    return Stamp(
+        captured=ops.captured(position), sha=sha, src_mtime_ns=ops.mtime_ns(position) or None
+    )
 
 
 def _format_log_line(op: PlannedOperation, success: bool, reason: str) -> str:
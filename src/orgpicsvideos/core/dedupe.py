@@ -0,0 +1,372 @@
+"""Find byte-identical files in a library and collapse them to links."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass, field
+import errno
+from itertools import groupby
+import json
+import os
+from pathlib import Path
+import shutil
+import sqlite3
+import sys
+import tempfile
+from typing import Callable, Iterable, Iterator
+
+from .cancel import CancelToken
+from .hashing import PARTIAL_BYTES, full_digest, partial_digest
+from .scanner import SKIP_DIR_NAMES
+from .utils import is_media_name
+from .walk import walk
+from .xattrs import Stamp, read_stamp, write_stamp
+
+LINK_MODES = ("hardlink", "reflink")
+
+# Linux FICLONE ioctl: share the source's extents with the destination.
+_FICLONE = 0x40049409
+_INSERT_EVERY = 10_000
+
+
+@dataclass
+class Inode:
+    """One file's data and every walked path that links to it."""
+
+    ino: int
+    nlink: int
+    mtime_ns: int
+    paths: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class DuplicateSet:
+    """Byte-identical files on one device; the first inode is kept."""
+
+    size: int
+    inodes: list[Inode]
+
+
+@dataclass(frozen=True)
+class DedupeResult:
+    path: str
+    original: str
+    size: int
+    status: str  # "linked", "dry-run" or "failed"
+    error: str = ""
+
+
+@dataclass
+class DedupeSummary:
+    files: int = 0
+    duplicates: int = 0
+    linked: int = 0
+    failed: int = 0
+    bytes_reclaimable: int = 0
+
+
+class FileSpool:
+    """On-disk table of every walked file, so memory does not grow with the library.
+
+    Files are read back ordered by (device, size, inode); only one size
+    group is held in memory at a time.
+    """
+
+    def __init__(self, directory: str | None = None) -> None:
+        self._tmp = tempfile.TemporaryDirectory(prefix="orgpicsvideos-dedupe-", dir=directory)
+        self._conn = sqlite3.connect(os.path.join(self._tmp.name, "files.sqlite"))
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE files (dev INTEGER, size INTEGER, ino INTEGER, "
+            "nlink INTEGER, mtime_ns INTEGER, path TEXT)"
+        )
+        self._rows: list[tuple[int, int, int, int, int, str]] = []
+        self.count = 0
+
+    def __enter__(self) -> "FileSpool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+        self._tmp.cleanup()
+
+    def add(self, path: str, stat: os.stat_result) -> None:
+        self._rows.append(
+            (stat.st_dev, stat.st_size, stat.st_ino, stat.st_nlink, stat.st_mtime_ns, path)
+        )
+        self.count += 1
+        if len(self._rows) >= _INSERT_EVERY:
+            self._flush()
+
+    def groups(self) -> Iterator[tuple[int, list[Inode]]]:
+        """Yield ``(size, inodes)`` for every size shared by two or more inodes on a device."""
+
+        self._flush()
+        self._conn.execute("CREATE INDEX IF NOT EXISTS files_key ON files (dev, size, ino)")
+        rows = self._conn.execute(
+            "SELECT dev, size, ino, nlink, mtime_ns, path FROM files "
+            "WHERE size > 0 ORDER BY dev, size, ino, path"
+        )
+        for (_, size), members in groupby(rows, key=lambda row: (row[0], row[1])):
+            inodes: list[Inode] = []
+            for _, _, ino, nlink, mtime_ns, path in members:
+                if not inodes or inodes[-1].ino != ino:
+                    inodes.append(Inode(ino, nlink, mtime_ns))
+                inodes[-1].paths.append(path)
+            if len(inodes) > 1:
+                yield size, inodes
+
+    def _flush(self) -> None:
+        if self._rows:
+            self._conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)", self._rows)
+            self._rows.clear()
+
+
+def spool_library(
+    root: Path,
+    spool: FileSpool,
+    jobs: int = 1,
+    cancel: CancelToken | None = None,
+) -> None:
+    """Record every media file under ``root`` in ``spool`` (one stat per file)."""
+
+    for listing in walk(
+        root,
+        skip_dir=SKIP_DIR_NAMES.__contains__,
+        stat_file=is_media_name,
+        jobs=jobs,
+        cancel=cancel,
+    ):
+        for entry in listing.files:
+            if entry.stat is not None:
+                spool.add(entry.path, entry.stat)
+
+
+def identical_sets(size: int, paths: list[str], stamp: bool = False) -> list[list[int]]:
+    """Return groups of indexes into ``paths`` whose files are byte-identical.
+
+    All files are ``size`` bytes. Runs in a worker process, so it only takes
+    and returns plain data. Full digests stamped on unchanged files are
+    trusted; with ``stamp``, digests that had to be computed are stamped.
+    """
+
+    groups = _split(range(len(paths)), lambda i: partial_digest(Path(paths[i]), size))
+    if size > 2 * PARTIAL_BYTES:
+        # Small files were read whole by the partial digest.
+        groups = [
+            group
+            for candidates in groups
+            for group in _split(candidates, lambda i: _stamped_digest(paths[i], stamp))
+        ]
+    return groups
+
+
+def find_duplicates(
+    spool: FileSpool,
+    jobs: int = 1,
+    cancel: CancelToken | None = None,
+    stamp: bool = False,
+) -> Iterator[DuplicateSet]:
+    """Yield sets of byte-identical files, hashing size groups on ``jobs`` processes.
+
+    Only one representative path per inode is hashed. Sets come out in size
+    order whatever the completion order, with at most ``jobs * 4`` groups in
+    flight. The kept inode is the one with the shortest, then first, path,
+    which prefers ``IMG.JPG`` over the ``IMG_1.JPG`` a later import made.
+    """
+
+    def collect(size: int, inodes: list[Inode], groups: list[list[int]]) -> list[DuplicateSet]:
+        sets = []
+        for group in groups:
+            members = [inodes[i] for i in group]
+            for member in members:
+                member.paths.sort(key=_name_order)
+            members.sort(key=lambda member: _name_order(member.paths[0]))
+            sets.append(DuplicateSet(size, members))
+        return sets
+
+    if jobs <= 1:
+        for size, inodes in spool.groups():
+            if cancel is not None:
+                cancel.checkpoint()
+            heads = [i.paths[0] for i in inodes]
+            yield from collect(size, inodes, identical_sets(size, heads, stamp))
+        return
+
+    pending: deque[tuple[int, list[Inode], Future[list[list[int]]]]] = deque()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        try:
+            for size, inodes in spool.groups():
+                if cancel is not None:
+                    cancel.checkpoint()
+                heads = [i.paths[0] for i in inodes]
+                future = pool.submit(identical_sets, size, heads, stamp)
+                pending.append((size, inodes, future))
+                while len(pending) > jobs * 4:
+                    size, inodes, future = pending.popleft()
+                    yield from collect(size, inodes, future.result())
+            while pending:
+                if cancel is not None:
+                    cancel.checkpoint()
+                size, inodes, future = pending.popleft()
+                yield from collect(size, inodes, future.result())
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+
+def collapse(
+    sets: Iterator[DuplicateSet],
+    on_result: Callable[[DedupeResult], None] | None = None,
+    log_cb: Callable[[str], None] | None = None,
+    dry_run: bool = False,
+    link: str = "hardlink",
+) -> DedupeSummary:
+    """Replace every duplicate path with a link to the kept file of its set.
+
+    A duplicate inode's bytes count as reclaimable only when every link to
+    it was walked; links from outside the library would keep it alive.
+    """
+
+    if link not in LINK_MODES:
+        raise ValueError(f"Unknown link mode: {link}")
+    summary = DedupeSummary()
+    for dup_set in sets:
+        kept = dup_set.inodes[0]
+        original = kept.paths[0]
+        for inode in dup_set.inodes[1:]:
+            complete = inode.nlink == len(inode.paths)
+            replaced = 0
+            for path in inode.paths:
+                summary.duplicates += 1
+                if dry_run:
+                    status, error = "dry-run", ""
+                else:
+                    try:
+                        replace_with_link(original, kept, path, inode, dup_set.size, link)
+                    except OSError as exc:
+                        status, error = "failed", str(exc)
+                    else:
+                        status, error = "linked", ""
+                if status == "failed":
+                    summary.failed += 1
+                else:
+                    replaced += 1
+                    if status == "linked":
+                        summary.linked += 1
+                if log_cb and not dry_run:
+                    log_cb(_format_log_line(path, original, status, error))
+                if on_result:
+                    on_result(DedupeResult(path, original, dup_set.size, status, error))
+            if complete and replaced == len(inode.paths):
+                summary.bytes_reclaimable += dup_set.size
+    return summary
+
+
+def replace_with_link(
+    original: str, kept: Inode, path: str, inode: Inode, size: int, link: str = "hardlink"
+) -> None:
+    """Atomically replace ``path`` with a hardlink or reflink to ``original``.
+
+    Both files are re-checked first and left alone if either changed since
+    it was hashed. The link is made under a temporary name and renamed over
+    ``path``, so ``path`` always holds a complete file.
+    """
+
+    _check_unchanged(original, kept, size)
+    _check_unchanged(path, inode, size)
+    directory, name = os.path.split(path)
+    temp = os.path.join(directory, f".{name}.dedupe-{os.getpid()}")
+    try:
+        if link == "hardlink":
+            os.link(original, temp)
+        else:
+            _reflink(original, temp)
+            # A clone is a separate file; keep the duplicate's own times and mode.
+            shutil.copystat(path, temp)
+        os.replace(temp, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(temp)
+        raise
+
+
+def format_result(result: DedupeResult, fmt: str = "text") -> str:
+    """Format one report line for ``ReportWriter``."""
+
+    if fmt == "jsonl":
+        data = {
+            "path": result.path,
+            "original": result.original,
+            "size": result.size,
+            "status": result.status,
+        }
+        if result.error:
+            data["error"] = result.error
+        return json.dumps(data)
+    if result.status == "dry-run":
+        return f"DRY-RUN link {result.path} -> {result.original} ({result.size} bytes)"
+    if result.status == "failed":
+        return f"failed {result.path} -> {result.original} ({result.size} bytes): {result.error}"
+    return f"linked {result.path} -> {result.original} ({result.size} bytes)"
+
+
+def _split(indexes: Iterable[int], digest: Callable[[int], str]) -> list[list[int]]:
+    buckets: dict[str, list[int]] = {}
+    for index in indexes:
+        try:
+            buckets.setdefault(digest(index), []).append(index)
+        except OSError:
+            continue
+    return [group for group in buckets.values() if len(group) > 1]
+
+
+def _stamped_digest(path: str, stamp: bool) -> str:
+    stamped = read_stamp(path)
+    if stamped is not None and stamped.sha is not None:
+        return stamped.sha
+    digest = full_digest(Path(path))
+    if stamp:
+        write_stamp(path, Stamp(sha=digest))
+    return digest
+
+
+def _name_order(path: str) -> tuple[int, str]:
+    return len(os.path.basename(path)), path
+
+
+def _check_unchanged(path: str, inode: Inode, size: int) -> None:
+    stat = os.stat(path)
+    if (stat.st_ino, stat.st_size, stat.st_mtime_ns) != (inode.ino, size, inode.mtime_ns):
+        raise OSError(errno.ESTALE, "changed since it was hashed", path)
+
+
+def _reflink(source: str, destination: str) -> None:
+    if sys.platform == "darwin":
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(source), os.fsencode(destination), 0) != 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), destination)
+        return
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.EOPNOTSUPP, "reflinks are not supported on this platform") from None
+    with open(source, "rb") as src, open(destination, "xb") as dst:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+
+
+def _format_log_line(path: str, original: str, status: str, error: str) -> str:
+    # Same shape as the copier's lines so log tooling can read both.
+    detail = f"link {path} -> {original}"
+    if status == "failed":
+        return f"{detail} [FAIL] reason={error}"
+    return f"{detail} [SUCCESS]"
@@ -0,0 +1,163 @@
+"""Batched, parallel file deletion with buffered reports."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import json
+import os
+from typing import Any, Callable, Iterable, TextIO
+
+from .fs import DIR_OPEN_FLAGS
+
+_UNLINK_DIR_FD = os.unlink in os.supports_dir_fd
+
+REPORT_FORMATS = ("text", "jsonl")
+
+
+@dataclass(frozen=True)
+class DeleteBatch:
+    """Files to delete from a single directory."""
+
+    directory: str
+    files: list[tuple[str, int]]  # (name, size)
+
+
+@dataclass(frozen=True)
+class DeleteResult:
+    path: str
+    size: int
+    status: str  # "deleted", "dry-run" or "failed"
+    error: str = ""
+
+
+@dataclass
+class DeleteSummary:
+    candidates: int = 0
+    deleted: int = 0
+    failed: int = 0
+    bytes_reclaimed: int = 0
+
+
+class ReportWriter:
+    """Buffer report lines and write them in chunks instead of one print per file.
+
+    ``formatter`` turns a result into one line; other tools pass their own.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        fmt: str = "text",
+        buffer_lines: int = 1000,
+        formatter: Callable[[Any, str], str] | None = None,
+    ) -> None:
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format: {fmt}")
+        self.stream = stream
+        self.fmt = fmt
+        self._format = formatter or format_result
+        self._buffer: list[str] = []
+        self._buffer_lines = buffer_lines
+
+    def add(self, result: Any) -> None:
+        self._buffer.append(self._format(result, self.fmt))
+        if len(self._buffer) >= self._buffer_lines:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.stream.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self.stream.flush()
+
+
+def format_result(result: DeleteResult, fmt: str = "text") -> str:
+    """Format one report line; dry-run and real runs differ only in status."""
+
+    if fmt == "jsonl":
+        data = {"path": result.path, "size": result.size, "status": result.status}
+        if result.error:
+            data["error"] = result.error
+        return json.dumps(data)
+    if result.status == "dry-run":
+        return f"DRY-RUN delete {result.path} ({result.size} bytes)"
+    if result.status == "failed":
+        return f"failed {result.path} ({result.size} bytes): {result.error}"
+    return f"deleted {result.path} ({result.size} bytes)"
+
+
+def delete_batches(
+    batches: Iterable[DeleteBatch],
+    report: ReportWriter | None = None,
+    dry_run: bool = False,
+    jobs: int = 1,
+) -> DeleteSummary:
+    """Delete files batch by batch, one directory fd per batch.
+
+    Batches run on a pool of ``jobs`` threads; results are reported from the
+    calling thread. A dry run reports the same lines without unlinking.
+    """
+
+    summary = DeleteSummary()
+
+    def record(results: list[DeleteResult]) -> None:
+        for result in results:
+            summary.candidates += 1
+            if result.status == "failed":
+                summary.failed += 1
+            else:
+                summary.bytes_reclaimed += result.size
+                if result.status == "deleted":
+                    summary.deleted += 1
+            if report:
+                report.add(result)
+
+    if dry_run:
+        for batch in batches:
+            record([_result(batch, name, size, "dry-run") for name, size in batch.files])
+    elif jobs <= 1:
+        for batch in batches:
+            record(_delete_batch(batch))
+    else:
+        pending: deque[Future[list[DeleteResult]]] = deque()
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="delete") as pool:
+            for batch in batches:
+                pending.append(pool.submit(_delete_batch, batch))
+                while len(pending) > jobs * 4:
+                    record(pending.popleft().result())
+            while pending:
+                record(pending.popleft().result())
+    if report:
+        report.flush()
+    return summary
+
+
+def _delete_batch(batch: DeleteBatch) -> list[DeleteResult]:
+    results: list[DeleteResult] = []
+    fd = None
+    if _UNLINK_DIR_FD:
+        try:
+            fd = os.open(batch.directory, DIR_OPEN_FLAGS)
+        except OSError:
+            fd = None
+    try:
+        for name, size in batch.files:
+            try:
+                if fd is not None:
+                    os.unlink(name, dir_fd=fd)
+                else:
+                    os.unlink(os.path.join(batch.directory, name))
+            except OSError as exc:
+                results.append(_result(batch, name, size, "failed", str(exc)))
+                continue
+            results.append(_result(batch, name, size, "deleted"))
+    finally:
+        if fd is not None:
+            os.close(fd)
+    return results
+
+
+def _result(batch: DeleteBatch, name: str, size: int, status: str, error: str = "") -> DeleteResult:
+    return DeleteResult(os.path.join(batch.directory, name), size, status, error)
@@ -0,0 +1,306 @@
+"""Filesystem calls used by the walker, extractors, planner and copier.
+
+Every scandir, stat, open, copy, rename, mkdir, unlink and xattr call on
+those paths goes through the active ``LocalFS``, so another implementation can be
+swapped in with ``use_fs``. ``ThrottledFS`` is the local filesystem with
+per-call latency and a bandwidth cap, to benchmark and test the parallel
+walkers and executors against something shaped like a NAS or a USB card.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+import os
+from pathlib import Path
+import shutil
+import stat as stat_module
+import threading
+import time
+from typing import IO, Any, Callable, ContextManager, Iterator
+
+StrPath = str | os.PathLike[str]
+
+# Listing through a directory fd lets per-entry stats use fstatat() relative to
+# it instead of resolving the full path again. Windows has no fd-based scandir,
+# but its DirEntry already carries the stat from the directory listing.
+_USE_DIR_FD = os.scandir in os.supports_fd and os.stat in os.supports_dir_fd
+DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_CLOEXEC", 0)
+_COPY_CHUNK = 1024 * 1024
+
+
+class LocalFS:
+    """The local filesystem.
+
+    ``scandir`` entries have the ``os.DirEntry`` interface, but their
+    ``path`` may be just the name; join the listed directory and ``name``.
+    """
+
+    def scandir(self, path: StrPath) -> ContextManager[Iterator[os.DirEntry[str]]]:
+        return _scandir(path)
+
+    def stat(self, path: StrPath) -> os.stat_result:
+        return os.stat(path)
+
+    def open(self, path: StrPath, mode: str = "rb") -> IO[Any]:
+        return open(path, mode)
+
+    def copy(
+        self,
+        source: StrPath,
+        destination: StrPath,
+        on_data: Callable[[bytes], object] | None = None,
+    ) -> None:
+        """Copy contents, mode and times; ``destination`` is the file, not its folder.
+
+        ``on_data`` is called with each chunk as it is copied, e.g. to hash it.
+        """
+
+        if on_data is None:
+            shutil.copyfile(source, destination)
+        else:
+            with open(source, "rb") as src, open(destination, "wb") as dst:
+                while chunk := src.read(_COPY_CHUNK):
+                    on_data(chunk)
+                    dst.write(chunk)
+        shutil.copystat(source, destination)
+
+    def rename(self, source: StrPath, destination: StrPath) -> None:
+        os.rename(source, destination)
+
+    def mkdir(self, path: StrPath) -> None:
+        """Create ``path`` and missing parents; an existing directory is fine."""
+
+        # Path.mkdir tries the leaf first; os.makedirs stats every ancestor.
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+    def unlink(self, path: StrPath) -> None:
+        os.unlink(path)
+
+    def getxattr(self, path: StrPath, name: str) -> bytes:
+        return os.getxattr(path, name)
+
+    def setxattr(self, path: StrPath, name: str, value: bytes) -> None:
+        os.setxattr(path, name, value)
+
+    def removexattr(self, path: StrPath, name: str) -> None:
+        os.removexattr(path, name)
+
+    def exists(self, path: StrPath) -> bool:
+        try:
+            self.stat(path)
+        except OSError:
+            return False
+        return True
+
+    def is_dir(self, path: StrPath) -> bool:
+        try:
+            return stat_module.S_ISDIR(self.stat(path).st_mode)
+        except OSError:
+            return False
+
+
+@contextmanager
+def _scandir(path: StrPath) -> Iterator[Iterator[os.DirEntry[str]]]:
+    if _USE_DIR_FD:
+        fd = os.open(path, DIR_OPEN_FLAGS)
+        try:
+            with os.scandir(fd) as entries:
+                yield entries
+        finally:
+            os.close(fd)
+    else:
+        with os.scandir(path) as entries:
+            yield entries
+
+
+class ThrottledFS(LocalFS):
+    """The local filesystem slowed down to look like a remote or slow one.
+
+    Every call waits ``latency`` seconds first, concurrently with other
+    threads' calls, as requests to a NAS do. File data read through
+    ``open`` or moved by ``copy`` shares one link of ``bandwidth`` bytes
+    per second. With ``listing_stats`` (SMB) directory listings carry each
+    entry's stat; without it (NFS, USB) the first ``DirEntry.stat`` of an
+    entry is a call of its own. ``calls`` counts calls by name.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        bandwidth: float | None = None,
+        listing_stats: bool = False,
+    ) -> None:
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.listing_stats = listing_stats
+        self.calls: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._link_free_at = 0.0
+
+    def scandir(self, path: StrPath) -> ContextManager[Iterator[os.DirEntry[str]]]:
+        self._call("scandir")
+        return self._throttled_scandir(path)
+
+    def stat(self, path: StrPath) -> os.stat_result:
+        self._call("stat")
+        return os.stat(path)
+
+    def open(self, path: StrPath, mode: str = "rb") -> IO[Any]:
+        self._call("open")
+        return _ThrottledFile(open(path, mode), self)  # type: ignore[return-value]
+
+    def copy(
+        self,
+        source: StrPath,
+        destination: StrPath,
+        on_data: Callable[[bytes], object] | None = None,
+    ) -> None:
+        self._call("copy")
+        super().copy(source, destination, on_data)
+        self.transfer(os.stat(destination).st_size)
+
+    def rename(self, source: StrPath, destination: StrPath) -> None:
+        self._call("rename")
+        os.rename(source, destination)
+
+    def mkdir(self, path: StrPath) -> None:
+        self._call("mkdir")
+        super().mkdir(path)
+
+    def unlink(self, path: StrPath) -> None:
+        self._call("unlink")
+        os.unlink(path)
+
+    def getxattr(self, path: StrPath, name: str) -> bytes:
+        self._call("getxattr")
+        return os.getxattr(path, name)
+
+    def setxattr(self, path: StrPath, name: str, value: bytes) -> None:
+        self._call("setxattr")
+        os.setxattr(path, name, value)
+
+    def removexattr(self, path: StrPath, name: str) -> None:
+        self._call("removexattr")
+        os.removexattr(path, name)
+
+    def transfer(self, size: int) -> None:
+        """Wait until ``size`` bytes fit through the link after earlier transfers."""
+
+        if not self.bandwidth or size <= 0:
+            return
+        with self._lock:
+            start = max(time.monotonic(), self._link_free_at)
+            self._link_free_at = done = start + size / self.bandwidth
+        delay = done - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _call(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    @contextmanager
+    def _throttled_scandir(self, path: StrPath) -> Iterator[Iterator[os.DirEntry[str]]]:
+        with _scandir(path) as entries:
+            if self.listing_stats:
+                yield entries
+            else:
+                yield (_ThrottledEntry(entry, self) for entry in entries)  # type: ignore[misc]
+
+
+class _ThrottledEntry:
+    __slots__ = ("_entry", "_fs", "_stat_paid")
+
+    def __init__(self, entry: os.DirEntry[str], fs: ThrottledFS) -> None:
+        self._entry = entry
+        self._fs = fs
+        self._stat_paid = False
+
+    name = property(lambda self: self._entry.name)
+    path = property(lambda self: self._entry.path)
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self) -> bool:
+        return self._entry.is_symlink()
+
+    def inode(self) -> int:
+        return self._entry.inode()
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        # DirEntry caches its stat, so only the first call goes to the "server".
+        if not self._stat_paid:
+            self._stat_paid = True
+            self._fs._call("stat")
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def __fspath__(self) -> str:
+        return self._entry.path
+
+
+class _ThrottledFile:
+    def __init__(self, handle: IO[Any], fs: ThrottledFS) -> None:
+        self._handle = handle
+        self._fs = fs
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._handle, name)
+
+    def read(self, *args: Any) -> Any:
+        data = self._handle.read(*args)
+        self._fs.transfer(len(data))
+        return data
+
+    def read1(self, *args: Any) -> Any:
+        data = self._handle.read1(*args)  # type: ignore[attr-defined]
+        self._fs.transfer(len(data))
+        return data
+
+    def readinto(self, buffer: Any) -> Any:
+        count = self._handle.readinto(buffer)  # type: ignore[attr-defined]
+        self._fs.transfer(count or 0)
+        return count
+
+    def write(self, data: Any) -> int:
+        count = self._handle.write(data)
+        self._fs.transfer(count)
+        return count
+
+    def __iter__(self) -> Iterator[Any]:
+        for line in self._handle:
+            self._fs.transfer(len(line))
+            yield line
+
+    def __enter__(self) -> _ThrottledFile:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._handle.close()
+
+
+_current: LocalFS = LocalFS()
+
+
+def current_fs() -> LocalFS:
+    """Return the filesystem the core modules are using."""
+
+    return _current
+
+
+@contextmanager
+def use_fs(fs: LocalFS) -> Iterator[LocalFS]:
+    """Route core filesystem calls, from every thread, through ``fs`` inside the block."""
+
+    global _current
+    previous, _current = _current, fs
+    try:
+        yield fs
+    finally:
+        _current = previous
@@ -0,0 +1,204 @@
+"""Staged content hashing for duplicate detection."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import hashlib
+from pathlib import Path
+import threading
+from typing import TYPE_CHECKING, Hashable, Iterable, Sequence
+
+from .cache import MetadataCache
+from .cancel import CancelToken
+
+if TYPE_CHECKING:
+    from .content_index import ContentIndex
+
+# Bytes read from each end of a file for the partial digest.
+PARTIAL_BYTES = 64 * 1024
+_CHUNK = 1024 * 1024
+
+PARTIAL = "partial"
+FULL = "full"
+
+
+@dataclass(frozen=True)
+class FileRef:
+    """A file to compare, with the size and mtime used to key cached digests."""
+
+    path: Path
+    size: int
+    mtime_ns: int = 0
+
+
+def partial_digest(path: Path, size: int) -> str:
+    """Return a digest of the size plus the first and last ``PARTIAL_BYTES``.
+
+    Files up to twice ``PARTIAL_BYTES`` are read whole, so for them the
+    partial digest already identifies the content.
+    """
+
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with path.open("rb") as handle:
+        if size <= 2 * PARTIAL_BYTES:
+            digest.update(handle.read())
+        else:
+            digest.update(handle.read(PARTIAL_BYTES))
+            handle.seek(size - PARTIAL_BYTES)
+            digest.update(handle.read(PARTIAL_BYTES))
+    return digest.hexdigest()
+
+
+def full_digest(path: Path) -> str:
+    """Return the SHA-256 of the whole file."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DuplicateFinder:
+    """Find byte-identical files by size, then partial hash, then full hash.
+
+    Each stage only hashes files that still share a bucket with another
+    file, so most files are never read. Digests are computed on a thread
+    pool (hashing and reads release the GIL) and cached in memory and, when
+    given, in the ``MetadataCache`` and the library's ``ContentIndex``.
+
+    With an ``index``, ``build_plan`` compares files against the whole
+    library instead of only their target folder.
+    """
+
+    def __init__(
+        self,
+        jobs: int = 1,
+        cache: MetadataCache | None = None,
+        index: ContentIndex | None = None,
+    ) -> None:
+        self.jobs = jobs
+        self.cache = cache
+        self.index = index
+        self.bytes_hashed = 0
+        self._memo: dict[tuple[str, str], str | None] = {}
+        self._lock = threading.Lock()
+
+    def find(
+        self,
+        candidates: Sequence[tuple[Hashable, FileRef]],
+        known: Iterable[tuple[Hashable, FileRef]] = (),
+        cancel: CancelToken | None = None,
+    ) -> dict[int, Path]:
+        """Return ``{candidate index: path of identical file}``.
+
+        Files are only compared within the same group key. A candidate
+        duplicates a ``known`` file, or an earlier candidate, of that group;
+        the first candidate of an identical set is never reported.
+        """
+
+        buckets: dict[tuple[Hashable, int], list[tuple[int, FileRef]]] = {}
+        for group, ref in known:
+            buckets.setdefault((group, ref.size), []).append((-1, ref))
+        for index, (group, ref) in enumerate(candidates):
+            buckets.setdefault((group, ref.size), []).append((index, ref))
+        # Only buckets holding a candidate and at least one other file can match.
+        survivors = [
+            members
+            for members in buckets.values()
+            if len(members) > 1 and any(index >= 0 for index, _ in members)
+        ]
+
+        survivors = self._split(survivors, PARTIAL, cancel)
+        small = [m for m in survivors if m[0][1].size <= 2 * PARTIAL_BYTES]
+        large = [m for m in survivors if m[0][1].size > 2 * PARTIAL_BYTES]
+        survivors = small + self._split(large, FULL, cancel)
+
+        matches: dict[int, Path] = {}
+        for members in survivors:
+            # Known files come first, then candidates in plan order.
+            original = members[0][1].path
+            for index, ref in members[1:]:
+                if index >= 0:
+                    matches[index] = original
+        return matches
+
+    def _split(
+        self,
+        buckets: list[list[tuple[int, FileRef]]],
+        kind: str,
+        cancel: CancelToken | None,
+    ) -> list[list[tuple[int, FileRef]]]:
+        refs = [ref for members in buckets for _, ref in members]
+        digests = self._digests(refs, kind, cancel)
+        result = []
+        for members in buckets:
+            split: dict[str, list[tuple[int, FileRef]]] = {}
+            for index, ref in members:
+                digest = digests.get(str(ref.path))
+                if digest is not None:
+                    split.setdefault(digest, []).append((index, ref))
+            result.extend(
+                group
+                for group in split.values()
+                if len(group) > 1 and any(index >= 0 for index, _ in group)
+            )
+        return result
+
+    def _digests(
+        self, refs: list[FileRef], kind: str, cancel: CancelToken | None
+    ) -> dict[str, str | None]:
+        unique = list({str(ref.path): ref for ref in refs}.values())
+        if self.jobs <= 1 or len(unique) < 2:
+            results = []
+            for ref in unique:
+                if cancel is not None:
+                    cancel.checkpoint()
+                results.append(self.digest(ref, kind))
+        else:
+            pool = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="hash")
+            try:
+                futures = [pool.submit(self.digest, ref, kind) for ref in unique]
+                results = []
+                for future in futures:
+                    if cancel is not None:
+                        cancel.checkpoint()
+                    results.append(future.result())
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+        return {str(ref.path): digest for ref, digest in zip(unique, results)}
+
+    def digest(self, ref: FileRef, kind: str) -> str | None:
+        """Return the ``PARTIAL`` or ``FULL`` digest of a file, or None if unreadable."""
+
+        key = (str(ref.path), kind)
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+        digest = None
+        stores = [store for store in (self.index, self.cache) if store is not None]
+        if ref.mtime_ns:
+            for store in stores:
+                digest = store.get_digest(ref.path, kind, ref.size, ref.mtime_ns)
+                if digest is not None:
+                    break
+        if digest is None:
+            try:
+                if kind == PARTIAL:
+                    digest = partial_digest(ref.path, ref.size)
+                    read = min(ref.size, 2 * PARTIAL_BYTES)
+                else:
+                    digest = full_digest(ref.path)
+                    read = ref.size
+            except OSError:
+                digest = None
+            else:
+                with self._lock:
+                    self.bytes_hashed += read
+                if ref.mtime_ns:
+                    for store in stores:
+                        store.put_digest(ref.path, kind, ref.size, ref.mtime_ns, digest)
+        with self._lock:
+            self._memo[key] = digest
+        return digest
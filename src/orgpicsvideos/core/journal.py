@@ -0,0 +1,183 @@
+"""Persisted rebuild plans and progress cursors."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Iterable
+
+from .types import STATE_DIR_NAME, MediaType, OperationType, PlannedOperation
+
+PLAN_FORMAT_VERSION = 1
+
+
+class JournalError(Exception):
+    """Raised when a plan file or journal cannot be read."""
+
+
+def write_plan(
+    plan_path: Path,
+    destination_root: Path,
+    operations: Iterable[PlannedOperation],
+    summary: dict[str, int],
+    origin: str | None = None,
+) -> None:
+    """Write a plan as JSON lines: a header line, then one operation per line."""
+
+    plan_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = plan_path.with_name(plan_path.name + ".tmp")
+    header = {
+        "version": PLAN_FORMAT_VERSION,
+        "destination": str(destination_root),
+        "summary": summary,
+        "origin": origin,
+    }
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        handle.write(json.dumps(header) + "\n")
+        for op in operations:
+            handle.write(json.dumps(_op_to_dict(op)) + "\n")
+    os.replace(tmp_path, plan_path)
+
+
+def read_plan(plan_path: Path) -> tuple[Path, list[PlannedOperation], dict[str, Any]]:
+    """Return (destination_root, operations, header) from a plan file."""
+
+    try:
+        with plan_path.open("r", encoding="utf-8") as handle:
+            header = json.loads(handle.readline())
+            if header.get("version") != PLAN_FORMAT_VERSION:
+                raise JournalError(f"Unsupported plan version in {plan_path}")
+            operations = [_op_from_dict(json.loads(line)) for line in handle if line.strip()]
+    except (OSError, ValueError, KeyError) as exc:
+        raise JournalError(f"Cannot read plan {plan_path}: {exc}") from exc
+    return Path(header["destination"]), operations, header
+
+
+def read_plan_header(plan_path: Path) -> dict[str, Any]:
+    """Return only the header of a plan file."""
+
+    try:
+        with plan_path.open("r", encoding="utf-8") as handle:
+            header = json.loads(handle.readline())
+    except (OSError, ValueError) as exc:
+        raise JournalError(f"Cannot read plan {plan_path}: {exc}") from exc
+    if not isinstance(header, dict) or "destination" not in header:
+        raise JournalError(f"Cannot read plan {plan_path}: missing header")
+    return header
+
+
+class RebuildJournal:
+    """Plan plus a progress cursor for an in-flight rebuild.
+
+    The cursor is a watermark: every operation before it has been attempted.
+    Operations completed past the watermark are found again on resume by
+    revalidating sources, so the cursor only needs to be written periodically.
+    """
+
+    def __init__(self, directory: Path, flush_every: int = 500, flush_interval: float = 2.0) -> None:
+        self.directory = directory
+        self.plan_path = directory / "plan.jsonl"
+        self.cursor_path = directory / "cursor"
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval
+        self._cursor = 0
+        self._finished: set[int] = set()
+        self._since_flush = 0
+        self._last_flush = 0.0
+
+    def pending(self) -> bool:
+        return self.plan_path.exists()
+
+    def origin(self) -> str | None:
+        try:
+            return read_plan_header(self.plan_path).get("origin")
+        except JournalError:
+            return None
+
+    def begin(
+        self,
+        destination_root: Path,
+        operations: list[PlannedOperation],
+        summary: dict[str, int],
+        origin: str | None = None,
+    ) -> None:
+        write_plan(self.plan_path, destination_root, operations, summary, origin=origin)
+        self._reset(0)
+        self._write_cursor()
+
+    def load(self) -> tuple[list[PlannedOperation], dict[str, Any], int]:
+        """Return (operations, header, cursor) of the pending plan."""
+
+        _root, operations, header = read_plan(self.plan_path)
+        try:
+            cursor = int(self.cursor_path.read_text(encoding="utf-8").strip() or 0)
+        except (OSError, ValueError):
+            cursor = 0
+        self._reset(min(cursor, len(operations)))
+        return operations, header, self._cursor
+
+    def mark_done(self, index: int) -> None:
+        self._finished.add(index)
+        while self._cursor in self._finished:
+            self._finished.discard(self._cursor)
+            self._cursor += 1
+        self._since_flush += 1
+        now = time.monotonic()
+        if self._since_flush >= self._flush_every or now - self._last_flush >= self._flush_interval:
+            self._write_cursor()
+
+    def flush(self) -> None:
+        self._write_cursor()
+
+    def finish(self) -> None:
+        for path in (self.plan_path, self.cursor_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    @property
+    def cursor(self) -> int:
+        return self._cursor
+
+    def _reset(self, cursor: int) -> None:
+        self._cursor = cursor
+        self._finished.clear()
+        self._since_flush = 0
+        self._last_flush = time.monotonic()
+
+    def _write_cursor(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cursor_path.with_name("cursor.tmp")
+        tmp_path.write_text(str(self._cursor), encoding="utf-8")
+        os.replace(tmp_path, self.cursor_path)
+        self._since_flush = 0
+        self._last_flush = time.monotonic()
+
+
+def default_journal_dir(destination_root: Path) -> Path:
+    """Return the rebuild journal location inside a destination root."""
+
+    return destination_root / STATE_DIR_NAME / "rebuild"
+
+
+def _op_to_dict(op: PlannedOperation) -> dict[str, Any]:
+    data: dict[str, Any] = {"op": op.op_type.value, "dst": str(op.destination)}
+    if op.source is not None:
+        data["src"] = str(op.source)
+    if op.media_type is not None:
+        data["media"] = op.media_type.value
+    return data
+
+
+def _op_from_dict(data: dict[str, Any]) -> PlannedOperation:
+    source = data.get("src")
+    media = data.get("media")
+    return PlannedOperation(
+        op_type=OperationType(data["op"]),
+        source=Path(source) if source is not None else None,
+        destination=Path(data["dst"]),
+        media_type=MediaType(media) if media is not None else None,
+    )
@@ -4,7 +4,11 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
-from typing import TextIO
+from typing import Iterator, TextIO
+
+from .metrics import METRICS
+from .progress import format_hms
+from .types import Plan
 
 
 class LogWriter:
@@ -32,8 +36,9 @@ class LogWriter:
     def write(self, line: str) -> None:
         if not self._handle:
             raise RuntimeError("LogWriter not opened")
-        self._handle.write(line + "\n")
-        self._handle.flush()
+        with METRICS.timer("log.write"):
+            self._handle.write(line + "\n")
+            self._handle.flush()
 
 
 def make_log_path(destination_root: Path) -> Path:
@@ -92,3 +97,64 @@ def load_successful_destinations(
         return set()
 
     return destinations
+
+
+def read_log_header(log_path: Path) -> tuple[Path, Path] | None:
+    """Return the (source, destination) recorded in a log's first line."""
+
+    try:
+        with log_path.open("r", encoding="utf-8") as handle:
+            header = handle.readline().strip()
+    except OSError:
+        return None
+    if not header.startswith("SOURCE -> DEST: "):
+        return None
+    payload = header[len("SOURCE -> DEST: ") :]
+    if " -> " not in payload:
+        return None
+    src_text, dest_text = payload.rsplit(" -> ", 1)
+    return Path(src_text), Path(dest_text)
+
+
+def iter_successful_copies(log_path: Path) -> Iterator[tuple[Path, Path]]:
+    """Yield (source, destination) for every ``copy ... [SUCCESS]`` line, in log order."""
+
+    header = read_log_header(log_path)
+    # Split on the destination root when known, so " -> " inside a source name is harmless.
+    marker = f" -> {header[1]}" if header else " -> "
+    with log_path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.rstrip("\n")
+            if not line.startswith("copy ") or not line.endswith(" [SUCCESS]"):
+                continue
+            payload = line[len("copy ") : -len(" [SUCCESS]")]
+            split = payload.find(marker)
+            if split < 0:
+                continue
+            yield Path(payload[:split]), Path(payload[split + len(" -> ") :])
+
+
+def format_scan_summary(plan: Plan) -> str:
+    return (
+        "SCAN SUMMARY: "
+        f"found={plan.total_found} "
+        f"images={plan.total_images} "
+        f"videos={plan.total_videos} "
+        f"to_copy={plan.total_files} "
+        f"skipped={plan.total_skipped} "
+        f"dirs={plan.total_dirs}"
+    )
+
+
+def format_resume_summary(plan: Plan) -> str:
+    enabled = "yes" if plan.resume_enabled else "no"
+    return (
+        "RESUME: "
+        f"enabled={enabled} "
+        f"skipped_resume={plan.skipped_resume} "
+        f"skipped_duplicates={plan.skipped_duplicates}"
+    )
+
+
+def format_duration_line(label: str, seconds: float) -> str:
+    return f"{label}: {format_hms(seconds)}"
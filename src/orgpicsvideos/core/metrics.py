@@ -0,0 +1,193 @@
+"""Process-wide counters, histograms and timers for end-of-run performance reports."""
+
+from __future__ import annotations
+
+from contextlib import nullcontext
+import functools
+import json
+import threading
+import time
+from typing import Callable, ContextManager, Iterable, Iterator, TypeVar
+
+F = TypeVar("F", bound=Callable[..., object])
+T = TypeVar("T")
+
+# Returned by ``timer`` while disabled, so an instrumented block costs one call.
+_NULL_TIMER: ContextManager[None] = nullcontext()
+
+
+class _Histogram:
+    __slots__ = ("count", "total", "low", "high")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.low = float("inf")
+        self.high = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.low:
+            self.low = value
+        if value > self.high:
+            self.high = value
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: Metrics, name: str) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+
+class Metrics:
+    """Counters and histograms keyed by dotted names such as ``scan.stat``.
+
+    Everything is a no-op until ``enable`` is called; hot loops may also
+    check ``enabled`` themselves to skip building names or values. Timers
+    record seconds into a histogram of the same name. Updates are safe from
+    worker threads.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._histograms: dict[str, _Histogram] = {}
+
+    def enable(self) -> None:
+        self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def incr(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = _Histogram()
+            histogram.add(value)
+
+    def timer(self, name: str) -> ContextManager[None]:
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        """Return counters, histogram summaries and derived MB/s rates.
+
+        A rate is derived for every ``<phase>.<name>.bytes`` counter whose
+        phase has a timer, e.g. ``exec.copy.bytes`` over the ``exec`` wall time.
+        """
+
+        with self._lock:
+            counters = dict(sorted(self._counters.items()))
+            histograms = {
+                name: {
+                    "count": h.count,
+                    "sum": round(h.total, 6),
+                    "mean": round(h.total / h.count, 6),
+                    "min": round(h.low, 6),
+                    "max": round(h.high, 6),
+                }
+                for name, h in sorted(self._histograms.items())
+            }
+        rates = {}
+        for name, value in counters.items():
+            phase, _, rest = name.partition(".")
+            wall = histograms.get(phase)
+            if rest.endswith(".bytes") and wall and wall["sum"]:
+                rates[name[: -len(".bytes")] + ".mb_per_s"] = round(
+                    value / (1024 * 1024) / float(wall["sum"]), 3
+                )
+        return {"counters": counters, "histograms": histograms, "rates": rates}
+
+
+METRICS = Metrics()
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorate a function so each call is recorded by the ``name`` timer."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):  # type: ignore[no-untyped-def]
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+            with _Timer(METRICS, name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def timed_iter(name: str, items: Iterable[T]) -> Iterator[T]:
+    """Yield from ``items``, recording only the time spent producing them as ``name``.
+
+    Time the consumer spends between items is left out, so a timed generator
+    does not overlap the timer of the phase that consumes it.
+    """
+
+    iterator = iter(items)
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        METRICS.observe(name, elapsed)
+
+
+def format_metrics_line(snapshot: dict[str, dict[str, object]]) -> str:
+    """Return the one-line JSON block written at the end of a log."""
+
+    return "METRICS: " + json.dumps(snapshot, sort_keys=True)
+
+
+def format_metrics_report(snapshot: dict[str, dict[str, object]]) -> list[str]:
+    """Return human-readable lines for the CLIs, slowest histograms first."""
+
+    lines = ["Performance:"]
+    for name, value in snapshot["counters"].items():
+        lines.append(f"  {name}: {value}")
+    histograms = sorted(
+        snapshot["histograms"].items(), key=lambda item: item[1]["sum"], reverse=True
+    )
+    for name, h in histograms:
+        lines.append(
+            f"  {name}: n={h['count']} total={h['sum']:.3f}s "
+            f"mean={h['mean'] * 1000:.2f}ms max={h['max'] * 1000:.2f}ms"
+        )
+    for name, value in snapshot["rates"].items():
+        lines.append(f"  {name}: {value:.1f} MB/s")
+    return lines
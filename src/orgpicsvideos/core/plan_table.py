@@ -0,0 +1,336 @@
+"""Columnar storage for planned operations."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence, overload
+
+from .types import MediaType, OperationType, PlannedOperation
+
+_OP_TYPES = tuple(OperationType)
+_OP_CODES = {op_type: code for code, op_type in enumerate(_OP_TYPES)}
+_MEDIA_TYPES = (None, MediaType.IMAGE, MediaType.VIDEO)
+_MEDIA_CODES = {media_type: code for code, media_type in enumerate(_MEDIA_TYPES)}
+# Capture times are stored as naive microseconds since datetime.min; -1 is "unknown".
+_NO_TIME = -1
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class StringPool:
+    """Interned strings addressed by integer id."""
+
+    __slots__ = ("strings", "_ids")
+
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class DirectoryPool(StringPool):
+    """Interned directory strings addressed by integer id.
+
+    Path objects are built on first use and kept, so each directory is
+    parsed once however many operations refer to it.
+    """
+
+    __slots__ = ("_paths",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._paths: dict[int, Path] = {}
+
+    def path(self, dir_id: int) -> Path:
+        path = self._paths.get(dir_id)
+        if path is None:
+            path = self._paths[dir_id] = Path(self.strings[dir_id])
+        return path
+
+
+class PlanRow:
+    """A view of one ``PlanTable`` row that reads like a ``PlannedOperation``.
+
+    It holds the row's codes and pool ids; ``source`` and ``destination``
+    are joined on first access, so code that only checks ``op_type`` never
+    builds a Path. Rows compare and hash equal to the matching operation.
+    """
+
+    __slots__ = (
+        "op_code",
+        "media_code",
+        "src_dir",
+        "src_name",
+        "dst_dir",
+        "dst_name",
+        "_dirs",
+        "_names",
+        "_source",
+        "_destination",
+    )
+
+    def __init__(self, segment: _Segment, row: int) -> None:
+        self.op_code = segment.op_type[row]
+        self.media_code = segment.media_type[row]
+        self.src_dir = segment.src_dir[row]
+        self.src_name = segment.src_name[row]
+        self.dst_dir = segment.dst_dir[row]
+        self.dst_name = segment.dst_name[row]
+        self._dirs = segment.dirs
+        self._names = segment.names
+        self._source: Path | None = None
+        self._destination: Path | None = None
+
+    @property
+    def op_type(self) -> OperationType:
+        return _OP_TYPES[self.op_code]
+
+    @property
+    def media_type(self) -> MediaType | None:
+        return _MEDIA_TYPES[self.media_code]
+
+    @property
+    def source(self) -> Path | None:
+        if self._source is None and self.src_dir >= 0:
+            self._source = self._dirs.path(self.src_dir) / self._names.strings[self.src_name]
+        return self._source
+
+    @property
+    def destination(self) -> Path:
+        if self._destination is None:
+            self._destination = (
+                self._dirs.path(self.dst_dir) / self._names.strings[self.dst_name]
+            )
+        return self._destination
+
+    def operation(self) -> PlannedOperation:
+        return PlannedOperation(self.op_type, self.source, self.destination, self.media_type)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (PlanRow, PlannedOperation)):
+            return (
+                self.op_type == other.op_type
+                and self.source == other.source
+                and self.destination == other.destination
+                and self.media_type == other.media_type
+            )
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.op_type, self.source, self.destination, self.media_type))
+
+    def __repr__(self) -> str:
+        return f"PlanRow({self.operation()!r})"
+
+
+class _Segment:
+    """One contiguous block of rows; frozen once shared by a concatenation."""
+
+    __slots__ = (
+        "dirs",
+        "names",
+        "op_type",
+        "media_type",
+        "src_dir",
+        "src_name",
+        "dst_dir",
+        "dst_name",
+        "size",
+        "mtime_ns",
+        "captured",
+        "frozen",
+    )
+
+    def __init__(self, dirs: DirectoryPool, names: StringPool) -> None:
+        self.dirs = dirs
+        # Basenames are interned too; a copy's source and destination usually
+        # share one entry.
+        self.names = names
+        self.op_type = bytearray()
+        self.media_type = bytearray()
+        self.src_dir = array("l")
+        self.src_name = array("l")
+        self.dst_dir = array("l")
+        self.dst_name = array("l")
+        self.size = array("q")
+        self.mtime_ns = array("q")
+        self.captured = array("q")
+        self.frozen = False
+
+    def __len__(self) -> int:
+        return len(self.op_type)
+
+
+class PlanTable(Sequence[PlannedOperation]):
+    """Planned operations stored as columns instead of one object per operation.
+
+    Directories and basenames are interned in shared pools, so a row costs
+    a few integers. Indexing and iteration return ``PlanRow`` views built on
+    demand; nothing holds them. Use ``op_type(i)`` when only the type is
+    needed. Rows live in segments, so ``a + b`` and prepending a short list
+    of operations share the existing columns instead of copying them.
+    """
+
+    def __init__(self, operations: Iterable[PlannedOperation] = ()) -> None:
+        self._segments: list[_Segment] = []
+        self._starts: list[int] = []
+        self._length = 0
+        self.extend(operations)
+
+    def append(
+        self,
+        op_type: OperationType,
+        destination: Path,
+        source: Path | None = None,
+        media_type: MediaType | None = None,
+        size: int = 0,
+        mtime_ns: int = 0,
+        captured: datetime | None = None,
+    ) -> None:
+        segment = self._tail()
+        dirs, names = segment.dirs, segment.names
+        dst_dir, dst_name = _split(str(destination))
+        name_id = names.intern(dst_name)
+        if source is None:
+            segment.src_dir.append(-1)
+            segment.src_name.append(-1)
+        else:
+            src_dir, src_name = _split(str(source))
+            segment.src_dir.append(dirs.intern(src_dir))
+            segment.src_name.append(name_id if src_name == dst_name else names.intern(src_name))
+        segment.dst_dir.append(dirs.intern(dst_dir))
+        segment.dst_name.append(name_id)
+        segment.op_type.append(_OP_CODES[op_type])
+        segment.media_type.append(_MEDIA_CODES[media_type])
+        segment.size.append(size)
+        segment.mtime_ns.append(mtime_ns)
+        segment.captured.append(
+            _NO_TIME
+            if captured is None
+            else (captured.replace(tzinfo=None) - datetime.min) // _MICROSECOND
+        )
+        self._length += 1
+
+    def extend(self, operations: Iterable[PlannedOperation]) -> None:
+        for op in operations:
+            self.append(op.op_type, op.destination, op.source, op.media_type)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> PlanRow: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[PlanRow]: ...
+
+    def __getitem__(self, index):  # type: ignore[no-untyped-def]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        segment, row = self._locate(index)
+        return PlanRow(segment, row)
+
+    def __iter__(self) -> Iterator[PlanRow]:
+        for segment in self._segments:
+            for row in range(len(segment)):
+                yield PlanRow(segment, row)
+
+    def __add__(self, other: Iterable[PlannedOperation]) -> PlanTable:
+        return PlanTable.concat(self, other)
+
+    def __radd__(self, other: Iterable[PlannedOperation]) -> PlanTable:
+        return PlanTable.concat(other, self)
+
+    def __repr__(self) -> str:
+        return f"PlanTable(len={self._length}, segments={len(self._segments)})"
+
+    @classmethod
+    def concat(cls, *parts: Iterable[PlannedOperation]) -> PlanTable:
+        """Join tables (and plain operation lists) without copying table columns."""
+
+        table = cls()
+        for part in parts:
+            if not isinstance(part, PlanTable):
+                part = cls(part)
+            for segment in part._segments:
+                if not len(segment):
+                    continue
+                segment.frozen = True
+                table._starts.append(table._length)
+                table._segments.append(segment)
+                table._length += len(segment)
+        return table
+
+    def op_type(self, index: int) -> OperationType:
+        segment, row = self._locate(index)
+        return _OP_TYPES[segment.op_type[row]]
+
+    def size(self, index: int) -> int:
+        segment, row = self._locate(index)
+        return segment.size[row]
+
+    def mtime_ns(self, index: int) -> int:
+        segment, row = self._locate(index)
+        return segment.mtime_ns[row]
+
+    def captured(self, index: int) -> datetime | None:
+        """Return the capture time the planner used for a copy, if recorded."""
+
+        segment, row = self._locate(index)
+        value = segment.captured[row]
+        return None if value == _NO_TIME else datetime.min + value * _MICROSECOND
+
+    def op_types(self) -> Iterator[OperationType]:
+        for segment in self._segments:
+            yield from map(_OP_TYPES.__getitem__, segment.op_type)
+
+    def destination_dirs(self) -> Iterator[str]:
+        """Yield the destination's parent directory string for each row, without Paths."""
+
+        for segment in self._segments:
+            yield from map(segment.dirs.strings.__getitem__, segment.dst_dir)
+
+    def sizes(self) -> Iterator[int]:
+        for segment in self._segments:
+            yield from segment.size
+
+    def _tail(self) -> _Segment:
+        if self._segments and not self._segments[-1].frozen:
+            return self._segments[-1]
+        if self._segments:
+            # Shared segments stay untouched; new rows reuse their append-only pools.
+            previous = self._segments[-1]
+            segment = _Segment(previous.dirs, previous.names)
+        else:
+            segment = _Segment(DirectoryPool(), StringPool())
+        self._starts.append(self._length)
+        self._segments.append(segment)
+        return segment
+
+    def _locate(self, index: int) -> tuple[_Segment, int]:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("PlanTable index out of range")
+        position = bisect_right(self._starts, index) - 1
+        return self._segments[position], index - self._starts[position]
+
+
+def _split(path: str) -> tuple[str, str]:
+    # ``os.path.split`` without its normalization; Path strings are already clean.
+    head, sep, name = path.rpartition(os.sep)
+    if sep and (not head or head.endswith(":")):
+        head += sep
+    return head, name
@@ -3,34 +3,110 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 
+from .cancel import CHECK_INTERVAL, CancelToken
+from .fs import current_fs
+from .hashing import DuplicateFinder, FileRef
+from .metrics import timed
+from .plan_table import PlanTable
+from .trace import traced
 from .types import (
     MediaFile,
     MediaType,
     OperationType,
     Plan,
     PlannedDirectory,
-    PlannedOperation,
     SkipReason,
     SkippedFile,
 )
 from .utils import is_probable_duplicate, split_media_dirs, unique_path
 
+if TYPE_CHECKING:
+    from .content_index import ContentIndex
 
+
+class DestinationInventory:
+    """Destination directory listings, read once per directory.
+
+    Existence probes for planned directories and target files are answered
+    from one ``scandir`` per directory instead of a ``stat`` per path.
+    """
+
+    def __init__(self) -> None:
+        self._listings: dict[Path, tuple[set[str], set[str]] | None] = {}
+        self._files: dict[Path, list[FileRef]] = {}
+
+    def dir_exists(self, path: Path) -> bool:
+        return self._listing(path) is not None
+
+    def exists(self, path: Path) -> bool:
+        listing = self._listing(path.parent)
+        if listing is None:
+            return False
+        names, folded = listing
+        if path.name in names:
+            return True
+        # Case-insensitive volumes: confirm a case-only match with a real probe.
+        return path.name.casefold() in folded and current_fs().exists(path)
+
+    def files(self, directory: Path) -> list[FileRef]:
+        """Return the regular files in ``directory`` with their size and mtime."""
+
+        files = self._files.get(directory)
+        if files is None:
+            files = []
+            try:
+                with current_fs().scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith("._") or not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                        path = directory / entry.name
+                        files.append(FileRef(path, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                pass
+            self._files[directory] = files
+        return files
+
+    def _listing(self, directory: Path) -> tuple[set[str], set[str]] | None:
+        if directory in self._listings:
+            return self._listings[directory]
+        try:
+            with current_fs().scandir(directory) as entries:
+                names = {entry.name for entry in entries}
+            listing: tuple[set[str], set[str]] | None = (names, {n.casefold() for n in names})
+        except OSError:
+            listing = None
+        self._listings[directory] = listing
+        return listing
+
+
+@timed("plan")
+@traced("plan")
 def build_plan(
     media_files: Iterable[MediaFile],
     destination_root: Path,
     skip_destinations: set[Path] | None = None,
+    cancel: CancelToken | None = None,
+    duplicates: DuplicateFinder | None = None,
 ) -> Plan:
-    """Create a copy plan for the provided media files."""
+    """Create a copy plan for the provided media files.
+
+    A ``cancel`` token is checked every few files to stop or pause planning.
+    With a ``duplicates`` finder, files are skipped as duplicates only when
+    their content matches a file in the target folder or an earlier file of
+    this plan, instead of by name, size and mtime. If the finder has a
+    content index, any file of the library counts.
+    """
 
     # Copy operations are planned after we compute the target directory and
     # resolve filename collisions. Skipped files are tracked for UI visibility.
     skip_destinations = skip_destinations or set()
-    copy_ops: list[PlannedOperation] = []
+    copy_ops = PlanTable()
     mkdirs: set[Path] = set()
     taken_paths: set[Path] = set()
+    next_counter: dict[Path, int] = {}
     total_images = 0
     total_videos = 0
     total_files = 0
@@ -40,9 +116,29 @@ def build_plan(
     skipped_duplicates = 0
     # Track skipped files so the UI can render them in the planned tree.
     skipped_files: list[SkippedFile] = []
+    inventory = DestinationInventory()
+    # Files awaiting the staged content check: (media, base destination).
+    pending: list[tuple[MediaFile, Path]] = []
+
+    def plan_copy(media: MediaFile, base_destination: Path) -> None:
+        nonlocal total_files
+        # Ensure a stable unique destination within this plan.
+        destination = unique_path(base_destination, taken_paths, inventory.exists, next_counter)
+        copy_ops.append(
+            OperationType.COPY,
+            destination,
+            source=media.path,
+            media_type=media.media_type,
+            size=media.size or 0,
+            mtime_ns=media.mtime_ns or 0,
+            captured=media.created_at,
+        )
+        total_files += 1
 
     for media in media_files:
         total_found += 1
+        if cancel is not None and total_found % CHECK_INTERVAL == 0:
+            cancel.checkpoint()
         target_dir = split_media_dirs(destination_root, media.created_at, media.media_type)
         if media.media_type == MediaType.IMAGE:
             total_images += 1
@@ -64,8 +160,13 @@ def build_plan(
                 )
             )
             continue
+        if duplicates is not None:
+            pending.append((media, base_destination))
+            continue
         # Fast duplicate heuristic: if destination exists and matches size+mtime, skip.
-        if base_destination.exists() and is_probable_duplicate(media.path, base_destination):
+        if inventory.exists(base_destination) and is_probable_duplicate(
+            media.path, base_destination, media.size, media.mtime_ns
+        ):
             total_skipped += 1
             skipped_duplicates += 1
             skipped_files.append(
@@ -76,30 +177,30 @@ def build_plan(
                 )
             )
             continue
-        # Ensure a stable unique destination within this plan.
-        destination = unique_path(base_destination, taken_paths)
-        copy_ops.append(
-            PlannedOperation(
-                op_type=OperationType.COPY,
-                source=media.path,
-                destination=destination,
-                media_type=media.media_type,
+        plan_copy(media, base_destination)
+
+    if duplicates is not None and pending:
+        matches = _content_duplicates(pending, duplicates, inventory, cancel)
+        for index, (media, base_destination) in enumerate(pending):
+            if index not in matches:
+                plan_copy(media, base_destination)
+                continue
+            total_skipped += 1
+            skipped_duplicates += 1
+            skipped_files.append(
+                SkippedFile(
+                    source=media.path,
+                    destination=base_destination,
+                    reason=SkipReason.CONTENT_DUPLICATE,
+                )
             )
-        )
-        total_files += 1
 
     sorted_dirs = sorted(mkdirs)
-    mkdir_ops = [
-        PlannedOperation(
-            op_type=OperationType.MKDIR,
-            source=None,
-            destination=directory,
-        )
-        for directory in sorted_dirs
-    ]
+    mkdir_ops = PlanTable()
+    for directory in sorted_dirs:
+        mkdir_ops.append(OperationType.MKDIR, directory)
     planned_dirs = [
-        PlannedDirectory(path=directory, exists=directory.exists())
-        for directory in sorted_dirs
+        _planned_directory(directory, destination_root, inventory) for directory in sorted_dirs
     ]
 
     return Plan(
@@ -115,3 +216,84 @@ def build_plan(
         skipped_resume=skipped_resume,
         skipped_duplicates=skipped_duplicates,
     )
+
+
+def _content_duplicates(
+    pending: list[tuple[MediaFile, Path]],
+    duplicates: DuplicateFinder,
+    inventory: DestinationInventory,
+    cancel: CancelToken | None,
+) -> dict[int, Path]:
+    # Each file is compared with the files already in its target folder and
+    # with the other files of this plan headed there; with a content index,
+    # with every file of the library and of the plan.
+    library = duplicates.index
+    candidates: list[tuple[Path | None, FileRef]] = []
+    for media, base_destination in pending:
+        size, mtime_ns = media.size, media.mtime_ns
+        if size is None:
+            try:
+                stat = current_fs().stat(media.path)
+                size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            except OSError:
+                size = -1
+        group = None if library is not None else base_destination.parent
+        candidates.append((group, FileRef(media.path, size, mtime_ns or 0)))
+    target_dirs = {base_destination.parent for _, base_destination in pending}
+    known: dict[Path, tuple[Path | None, FileRef]] = {}
+    # Folder listings also catch files added to the library behind the index's back.
+    for target_dir in target_dirs:
+        for ref in inventory.files(target_dir):
+            known[ref.path] = (None if library is not None else target_dir, ref)
+    # Index rows are only as fresh as the last run; the files they name may be gone.
+    unconfirmed: set[Path] = set()
+    if library is not None:
+        for ref in library.with_sizes(ref.size for _, ref in candidates):
+            if ref.path not in known:
+                known[ref.path] = (None, ref)
+                unconfirmed.add(ref.path)
+    while True:
+        matches = duplicates.find(candidates, known.values(), cancel)
+        stale = [
+            path
+            for path in unconfirmed.intersection(matches.values())
+            if library is not None and not _confirm_indexed(library, known[path][1])
+        ]
+        if not stale:
+            return matches
+        # Compare again without them so their stored digests cannot skip a file.
+        for path in stale:
+            del known[path]
+            unconfirmed.discard(path)
+
+
+def _confirm_indexed(library: ContentIndex, ref: FileRef) -> bool:
+    # Drop or re-key index rows whose file was deleted or changed behind the index's back.
+    try:
+        stat = current_fs().stat(ref.path)
+    except OSError:
+        library.remove(ref.path)
+        return False
+    if (stat.st_size, stat.st_mtime_ns) != (ref.size, ref.mtime_ns):
+        library.add(ref.path, stat.st_size, stat.st_mtime_ns)
+        return False
+    return True
+
+
+def _planned_directory(
+    directory: Path, destination_root: Path, inventory: DestinationInventory
+) -> PlannedDirectory:
+    # Existence is recorded here, off the GUI thread, for the directory and
+    # each of its ancestors below the destination root.
+    try:
+        parts = directory.relative_to(destination_root).parts
+    except ValueError:
+        return PlannedDirectory(path=directory, exists=inventory.dir_exists(directory))
+    depth = 0
+    current = destination_root
+    for part in parts:
+        current = current / part
+        if not inventory.dir_exists(current):
+            break
+        depth += 1
+    return PlannedDirectory(path=directory, exists=depth == len(parts), existing_depth=depth)
@@ -0,0 +1,165 @@
+"""Progress reporting with rate and ETA for the CLIs."""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from typing import TextIO
+
+
+class ProgressLine:
+    """Render a throttled single-line progress indicator.
+
+    On a terminal the line is redrawn in place; otherwise a plain line is
+    written at most every ``plain_interval`` seconds so logs stay readable.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        stream: TextIO | None = None,
+        interval: float = 0.2,
+        plain_interval: float = 5.0,
+    ) -> None:
+        self.label = label
+        self.stream = stream or sys.stderr
+        self._tty = bool(getattr(self.stream, "isatty", lambda: False)())
+        self._interval = interval if self._tty else plain_interval
+        self._start = time.monotonic()
+        self._last_render = 0.0
+        self._done = 0
+        self._total: int | None = None
+        self._width = 0
+        self._rendered: tuple[int, int | None] | None = None
+
+    def update(self, done: int, total: int | None = None) -> None:
+        self._done = done
+        if total is not None:
+            self._total = total
+        now = time.monotonic()
+        if now - self._last_render >= self._interval:
+            self._last_render = now
+            self._render(now)
+
+    def finish(self) -> None:
+        if self._rendered != (self._done, self._total):
+            self._render(time.monotonic())
+        if self._tty:
+            self.stream.write("\n")
+            self.stream.flush()
+
+    def _render(self, now: float) -> None:
+        self._rendered = (self._done, self._total)
+        text = format_progress(self.label, self._done, self._total, now - self._start)
+        if self._tty:
+            padding = " " * max(0, self._width - len(text))
+            self._width = len(text)
+            self.stream.write(f"\r{text}{padding}")
+        else:
+            self.stream.write(text + "\n")
+        self.stream.flush()
+
+
+
+class JsonProgress:
+    """Write throttled progress records as JSON lines for scripts and supervisors.
+
+    Each record carries the phase, file and byte counts, rates and an ETA in
+    seconds (``null`` while unknown). Records are written at most every
+    ``interval`` seconds per phase; ``finish`` always writes the final state.
+    """
+
+    def __init__(self, stream: TextIO, interval: float = 1.0) -> None:
+        self.stream = stream
+        self.interval = interval
+        self._phase: str | None = None
+        self._start = 0.0
+        self._last_write = 0.0
+        self._files = 0
+        self._files_total: int | None = None
+        self._bytes = 0
+        self._bytes_total: int | None = None
+        self._written = True
+
+    def update(
+        self,
+        phase: str,
+        files: int,
+        files_total: int | None = None,
+        bytes_done: int = 0,
+        bytes_total: int | None = None,
+    ) -> None:
+        now = time.monotonic()
+        if phase != self._phase:
+            self.finish()
+            self._phase = phase
+            self._start = now
+            self._last_write = 0.0
+        self._files = files
+        self._files_total = files_total
+        self._bytes = bytes_done
+        self._bytes_total = bytes_total
+        self._written = False
+        if now - self._last_write >= self.interval:
+            self._write(now)
+
+    def finish(self) -> None:
+        if not self._written:
+            self._write(time.monotonic())
+
+    def event(self, name: str, **fields: object) -> None:
+        self.finish()
+        self._emit({"event": name, **fields})
+
+    def _write(self, now: float) -> None:
+        self._last_write = now
+        self._written = True
+        elapsed = now - self._start
+        rate = self._files / elapsed if elapsed > 0 else 0.0
+        byte_rate = self._bytes / elapsed if elapsed > 0 else 0.0
+        # Bytes predict copy time better than file counts when sizes are known.
+        eta = None
+        if self._bytes_total and byte_rate > 0:
+            eta = max(0, self._bytes_total - self._bytes) / byte_rate
+        elif self._files_total and rate > 0:
+            eta = max(0, self._files_total - self._files) / rate
+        self._emit(
+            {
+                "event": "progress",
+                "phase": self._phase,
+                "files": self._files,
+                "files_total": self._files_total,
+                "bytes": self._bytes,
+                "bytes_total": self._bytes_total,
+                "elapsed": round(elapsed, 3),
+                "rate": round(rate, 2),
+                "bytes_rate": round(byte_rate, 1),
+                "eta": None if eta is None else round(eta, 1),
+            }
+        )
+
+    def _emit(self, record: dict[str, object]) -> None:
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+
+def format_progress(label: str, done: int, total: int | None, elapsed: float) -> str:
+    """Return a progress line such as ``move 10/40 (25.0%) 5.0 files/s ETA 00:00:06``."""
+
+    rate = done / elapsed if elapsed > 0 else 0.0
+    if total:
+        percent = 100.0 * done / total
+        text = f"{label} {done}/{total} ({percent:.1f}%) {rate:.1f} files/s"
+        if rate > 0 and done < total:
+            text += f" ETA {format_hms((total - done) / rate)}"
+        return text
+    return f"{label} {done} {rate:.1f} files/s"
+
+
+def format_hms(seconds: float) -> str:
+    total_seconds = int(round(seconds))
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    secs = total_seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
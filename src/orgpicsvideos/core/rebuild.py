@@ -2,16 +2,25 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 import os
 from pathlib import Path
-from typing import Iterable
+from typing import Callable
 
+from .cache import MetadataCache
+from .content_index import ContentIndex
 from .copier import execute_plan
+from .journal import JournalError, RebuildJournal, read_plan, write_plan
 from .logger import LogWriter
-from .scanner import scan_media
+from .metrics import METRICS, format_metrics_line
+from .planner import DestinationInventory
+from .scanner import SKIP_DIR_NAMES, TreeInventory, iter_media_candidates, scan_media
 from .types import OperationType, PlannedOperation
 from .utils import is_probable_duplicate, split_media_dirs, unique_path
+from .walk import walk
+
+# Called with (phase, done, total); total is None while the walk is still running.
+RebuildProgressCallback = Callable[[str, int, "int | None"], None]
 
 
 @dataclass
@@ -23,41 +32,75 @@ class RebuildSummary:
     deleted_empty_dirs: int
 
 
-def build_sidecar_delete_ops(destination_root: Path) -> list[PlannedOperation]:
+def build_sidecar_delete_ops(
+    destination_root: Path,
+    inventory: TreeInventory | None = None,
+) -> list[PlannedOperation]:
+    # Reuse sidecars found by an earlier walk instead of walking the tree again.
+    if inventory is not None:
+        sidecars = inventory.sidecars
+    else:
+        sidecars = [
+            Path(entry.path)
+            for listing in walk(destination_root, skip_dir=SKIP_DIR_NAMES.__contains__)
+            for entry in listing.files
+            if entry.name.startswith("._")
+        ]
     return [
         PlannedOperation(op_type=OperationType.DELETE, source=None, destination=sidecar)
-        for sidecar in destination_root.rglob("._*")
+        for sidecar in sidecars
     ]
 
 
 def build_rebuild_operations(
     destination_root: Path,
     delete_sidecars: bool = True,
+    jobs: int = 1,
+    cache: MetadataCache | None = None,
+    progress_cb: RebuildProgressCallback | None = None,
+    inventory: TreeInventory | None = None,
 ) -> tuple[list[PlannedOperation], RebuildSummary]:
-    """Scan destination and build move operations to normalize structure."""
+    """Scan destination and build move operations to normalize structure.
+
+    Media, sidecars and directory occupancy all come from a single walk; pass
+    an ``inventory`` to keep the occupancy counts for empty-directory pruning.
+    """
 
     ops: list[PlannedOperation] = []
     mkdirs: set[Path] = set()
     taken_paths: set[Path] = set()
+    next_counter: dict[Path, int] = {}
+    # Target folders are listed once each instead of probing every target path.
+    targets = DestinationInventory()
     moved = 0
     skipped_same = 0
     skipped_dupe = 0
     total = 0
+    inventory = inventory if inventory is not None else TreeInventory()
 
-    for media in scan_media(destination_root):
+    for media in scan_media(destination_root, jobs=jobs, cache=cache, inventory=inventory):
         total += 1
+        if progress_cb:
+            progress_cb("scan", total, None)
         target_dir = split_media_dirs(destination_root, media.created_at, media.media_type)
         mkdirs.add(target_dir)
 
+        # Scanned paths and targets are both joined onto destination_root, so a
+        # plain comparison replaces resolving every file; samefile only runs when
+        # the target exists (e.g. case-insensitive volumes).
         target = target_dir / media.path.name
-        if target.resolve() == media.path.resolve():
+        if target == media.path:
             skipped_same += 1
             continue
-        if target.exists() and is_probable_duplicate(media.path, target):
-            skipped_dupe += 1
-            continue
+        if targets.exists(target):
+            if _same_file(target, media.path):
+                skipped_same += 1
+                continue
+            if is_probable_duplicate(media.path, target, media.size, media.mtime_ns):
+                skipped_dupe += 1
+                continue
 
-        target = unique_path(target, taken_paths)
+        target = unique_path(target, taken_paths, targets.exists, next_counter)
         ops.append(
             PlannedOperation(
                 op_type=OperationType.MOVE,
@@ -69,7 +112,7 @@ def build_rebuild_operations(
         moved += 1
 
     if delete_sidecars:
-        ops.extend(build_sidecar_delete_ops(destination_root))
+        ops.extend(build_sidecar_delete_ops(destination_root, inventory))
 
     mkdir_ops = [
         PlannedOperation(op_type=OperationType.MKDIR, source=None, destination=path)
@@ -86,13 +129,173 @@ def rebuild_destination(
     log_path: Path,
     delete_sidecars: bool = True,
     delete_empty_dirs: bool = False,
+    jobs: int = 1,
+    cache: MetadataCache | None = None,
+    progress_cb: RebuildProgressCallback | None = None,
+    journal: RebuildJournal | None = None,
+    index: ContentIndex | None = None,
 ) -> RebuildSummary:
     """Rebuild destination in-place and log operations.
 
-    Optionally removes empty directories after moves.
+    Metadata extraction and moves use up to ``jobs`` threads. When a ``cache``
+    is given, moved files are re-keyed so the next run still hits it; a
+    content ``index`` is kept in step the same way.
+    Optionally removes empty directories after moves, decided from the
+    occupancy counts of the planning walk rather than a second walk.
+
+    With a ``journal`` the computed plan and a progress cursor are persisted;
+    if the journal already holds an unfinished plan, execution continues from
+    its cursor instead of replanning.
+    """
+
+    # Journaled paths must still resolve when resumed from another working directory.
+    destination_root = destination_root.absolute()
+    if journal is not None and journal.pending():
+        ops, header, cursor = journal.load()
+        summary = _summary_from_dict(header.get("summary", {}))
+        return _execute_rebuild(
+            destination_root,
+            log_path,
+            ops,
+            summary,
+            start=cursor,
+            revalidate=True,
+            delete_empty_dirs=delete_empty_dirs,
+            jobs=jobs,
+            cache=cache,
+            progress_cb=progress_cb,
+            journal=journal,
+            index=index,
+        )
+
+    inventory = TreeInventory()
+    ops, summary = build_rebuild_operations(
+        destination_root,
+        delete_sidecars=delete_sidecars,
+        jobs=jobs,
+        cache=cache,
+        progress_cb=progress_cb,
+        inventory=inventory,
+    )
+    if journal is not None:
+        journal.begin(destination_root, ops, asdict(summary))
+    return _execute_rebuild(
+        destination_root,
+        log_path,
+        ops,
+        summary,
+        delete_empty_dirs=delete_empty_dirs,
+        jobs=jobs,
+        cache=cache,
+        progress_cb=progress_cb,
+        journal=journal,
+        inventory=inventory,
+        index=index,
+    )
+
+
+def write_rebuild_plan(
+    destination_root: Path,
+    plan_path: Path,
+    delete_sidecars: bool = True,
+    jobs: int = 1,
+    cache: MetadataCache | None = None,
+    progress_cb: RebuildProgressCallback | None = None,
+) -> RebuildSummary:
+    """Compute a rebuild plan and write it to ``plan_path`` without moving anything."""
+
+    # Plans may be applied later from another working directory.
+    destination_root = destination_root.absolute()
+    ops, summary = build_rebuild_operations(
+        destination_root,
+        delete_sidecars=delete_sidecars,
+        jobs=jobs,
+        cache=cache,
+        progress_cb=progress_cb,
+    )
+    write_plan(plan_path, destination_root, ops, asdict(summary))
+    return summary
+
+
+def apply_rebuild_plan(
+    plan_path: Path,
+    log_path: Path,
+    delete_empty_dirs: bool = False,
+    jobs: int = 1,
+    cache: MetadataCache | None = None,
+    progress_cb: RebuildProgressCallback | None = None,
+    journal: RebuildJournal | None = None,
+    index: ContentIndex | None = None,
+) -> RebuildSummary:
+    """Execute a plan written by ``write_rebuild_plan``.
+
+    Every operation is revalidated first, since the tree may have changed
+    since the plan was reviewed. An interrupted apply resumes from the journal;
+    a journal left by another rebuild or plan raises ``JournalError`` instead
+    of being overwritten.
     """
 
-    ops, summary = build_rebuild_operations(destination_root, delete_sidecars=delete_sidecars)
+    destination_root, ops, header = read_plan(plan_path)
+    origin = str(plan_path.resolve())
+    start = 0
+    if journal is not None:
+        if not journal.pending():
+            journal.begin(destination_root, ops, header.get("summary", {}), origin=origin)
+        elif journal.origin() == origin:
+            ops, header, start = journal.load()
+        else:
+            raise JournalError(
+                f"An unfinished rebuild is journaled in {journal.directory}; "
+                "finish it or start over with --fresh"
+            )
+    return _execute_rebuild(
+        destination_root,
+        log_path,
+        ops,
+        _summary_from_dict(header.get("summary", {})),
+        start=start,
+        revalidate=True,
+        delete_empty_dirs=delete_empty_dirs,
+        jobs=jobs,
+        cache=cache,
+        progress_cb=progress_cb,
+        journal=journal,
+        index=index,
+    )
+
+
+def _execute_rebuild(
+    destination_root: Path,
+    log_path: Path,
+    ops: list[PlannedOperation],
+    summary: RebuildSummary,
+    start: int = 0,
+    revalidate: bool = False,
+    delete_empty_dirs: bool = False,
+    jobs: int = 1,
+    cache: MetadataCache | None = None,
+    progress_cb: RebuildProgressCallback | None = None,
+    journal: RebuildJournal | None = None,
+    index: ContentIndex | None = None,
+    inventory: TreeInventory | None = None,
+) -> RebuildSummary:
+    pending = list(enumerate(ops))[start:]
+    index_of = {id(op): index for index, op in pending}
+
+    def op_cb(op: PlannedOperation, success: bool) -> None:
+        if journal is not None:
+            journal.mark_done(index_of[id(op)])
+        if not success:
+            return
+        if inventory is not None:
+            _apply_to_inventory(inventory, op)
+        if cache is not None and op.op_type == OperationType.MOVE and op.source:
+            cache.rename(op.source, op.destination)
+
+    def exec_progress(done: int, total: int) -> None:
+        if progress_cb:
+            progress_cb("move", done, total)
+
     with LogWriter(log_path, destination_root, destination_root) as writer:
         writer.write(
             "REBUILD SUMMARY: "
@@ -101,44 +304,134 @@ def rebuild_destination(
             f"skipped_same={summary.skipped_same_path} "
             f"skipped_duplicates={summary.skipped_duplicates}"
         )
-        execute_plan(ops, writer.write)
+        if revalidate:
+            pending = _revalidate(pending, start, writer.write, journal)
+        try:
+            execute_plan(
+                [op for _, op in pending],
+                writer.write,
+                exec_progress,
+                op_cb,
+                jobs=jobs,
+                index=index,
+            )
+        except BaseException:
+            if journal is not None:
+                journal.flush()
+            raise
         if delete_empty_dirs:
-            summary.deleted_empty_dirs = _delete_empty_dirs(destination_root, writer.write)
+            if inventory is None:
+                # Resumed plans have no walk of their own; list the tree (no metadata).
+                inventory = TreeInventory()
+                for _ in iter_media_candidates(destination_root, inventory=inventory, jobs=jobs):
+                    pass
+            summary.deleted_empty_dirs = _delete_empty_dirs(destination_root, inventory, writer.write)
+        if METRICS.enabled:
+            writer.write(format_metrics_line(METRICS.snapshot()))
+    if journal is not None:
+        journal.finish()
     return summary
 
 
-def _delete_empty_dirs(destination_root: Path, log_cb) -> int:  # type: ignore[no-untyped-def]
-    deleted = 0
-    # Walk bottom-up so children are removed before parents.
-    for root, dirs, files in os.walk(destination_root, topdown=False):
-        if root == str(destination_root):
+def _revalidate(
+    pending: list[tuple[int, PlannedOperation]],
+    start: int,
+    log_cb: Callable[[str], None],
+    journal: RebuildJournal | None,
+) -> list[tuple[int, PlannedOperation]]:
+    # One or two stats per operation: drop work that already happened (the
+    # cursor is only flushed periodically) and never overwrite a new file.
+    kept: list[tuple[int, PlannedOperation]] = []
+    applied = 0
+    missing = 0
+    conflicts = 0
+    for index, op in pending:
+        if op.op_type == OperationType.MOVE and op.source is not None:
+            if not op.source.exists():
+                if op.destination.exists():
+                    applied += 1
+                else:
+                    missing += 1
+                if journal is not None:
+                    journal.mark_done(index)
+                continue
+            if op.destination.exists():
+                conflicts += 1
+                log_cb(f"move {op.source} -> {op.destination} [FAIL] reason=destination exists")
+                if journal is not None:
+                    journal.mark_done(index)
+                continue
+        elif op.op_type == OperationType.DELETE and not op.destination.exists():
+            applied += 1
+            if journal is not None:
+                journal.mark_done(index)
             continue
-        # Treat OS metadata files as ignorable for emptiness checks.
-        ignorable = {".DS_Store", "Thumbs.db", "desktop.ini"}
-        path = Path(root)
-        # Re-evaluate directory contents to avoid stale os.walk state.
-        try:
-            entries = list(path.iterdir())
-        except Exception:  # noqa: BLE001
-            continue
-        real_files = [
-            p for p in entries
-            if p.is_file() and p.name not in ignorable and not p.name.startswith("._")
-        ]
-        real_dirs = [p for p in entries if p.is_dir()]
-        if real_files or real_dirs:
+        kept.append((index, op))
+    log_cb(
+        "REBUILD RESUME: "
+        f"start={start} "
+        f"remaining={len(kept)} "
+        f"already_applied={applied} "
+        f"missing={missing} "
+        f"conflicts={conflicts}"
+    )
+    return kept
+
+
+def _summary_from_dict(data: dict[str, int]) -> RebuildSummary:
+    return RebuildSummary(
+        moved=int(data.get("moved", 0)),
+        skipped_same_path=int(data.get("skipped_same_path", 0)),
+        skipped_duplicates=int(data.get("skipped_duplicates", 0)),
+        total_files=int(data.get("total_files", 0)),
+        deleted_empty_dirs=0,
+    )
+
+
+def _same_file(first: Path, second: Path) -> bool:
+    try:
+        return os.path.samefile(first, second)
+    except OSError:
+        return False
+
+
+def _apply_to_inventory(inventory: TreeInventory, op: PlannedOperation) -> None:
+    # Keep occupancy counts in step with what the operations changed on disk.
+    if op.op_type == OperationType.MKDIR:
+        inventory.add_dir(op.destination)
+    elif op.op_type == OperationType.MOVE and op.source:
+        inventory.remove_entry(op.source)
+        inventory.add_entry(op.destination)
+    elif op.op_type == OperationType.DELETE:
+        inventory.discard_ignorable(op.destination)
+
+
+def _delete_empty_dirs(
+    destination_root: Path,
+    inventory: TreeInventory,
+    log_cb: Callable[[str], None],
+) -> int:
+    deleted = 0
+    # Deepest first so children are removed (and parents decremented) before parents.
+    candidates = sorted(
+        (path for path in inventory.occupancy if path != destination_root),
+        key=lambda path: len(path.parts),
+        reverse=True,
+    )
+    for path in candidates:
+        if inventory.occupancy.get(path, 1) > 0:
             continue
-        # Remove ignorable files so the directory can be deleted.
-        for p in entries:
-            if p.is_file() and (p.name in ignorable or p.name.startswith("._")):
-                try:
-                    p.unlink()
-                except Exception:  # noqa: BLE001
-                    pass
+        # Remove sidecars and OS metadata files so the directory can be deleted.
+        for ignorable in inventory.ignorable.pop(path, ()):
+            try:
+                ignorable.unlink()
+            except OSError:
+                pass
         try:
             path.rmdir()
             deleted += 1
+            inventory.remove_entry(path)
             log_cb(f"rmdir {path} [SUCCESS]")
-        except Exception as exc:  # noqa: BLE001
+        except OSError as exc:
             log_cb(f"rmdir {path} [FAIL] reason={exc}")
     return deleted
@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 import os
 from pathlib import Path
-from typing import Callable, Iterable
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, TypeVar
 
-from .types import MediaFile
-from .utils import detect_media_type, get_creation_time
+from .cancel import CHECK_INTERVAL, CancelToken
+from .metrics import METRICS, timed_iter
+from .trace import TRACER
+from .types import STATE_DIR_NAME, MediaFile, MediaType
+from .utils import get_creation_time, is_media_name, media_type_for_name
+from .walk import walk
+
+if TYPE_CHECKING:
+    from .cache import MetadataCache
+
+_T = TypeVar("_T")
 
 SKIP_DIR_NAMES = {
     # macOS
@@ -17,6 +29,8 @@ SKIP_DIR_NAMES = {
     # Windows
     "System Volume Information",
     "$RECYCLE.BIN",
+    # Our own caches and journals
+    STATE_DIR_NAME,
 }
 
 # Files that should be silently skipped during scanning.
@@ -27,49 +41,191 @@ SKIP_FILE_NAMES = {
 }
 
 
+@dataclass
+class TreeInventory:
+    """Directory occupancy recorded while walking a tree.
+
+    ``occupancy`` counts the entries that keep each directory non-empty
+    (subdirectories, media and other files). ``._`` sidecars and OS metadata
+    files do not count; they are listed in ``ignorable`` per directory instead.
+    Directories that could not be listed are pinned as occupied.
+    """
+
+    occupancy: dict[Path, int] = field(default_factory=dict)
+    sidecars: list[Path] = field(default_factory=list)
+    ignorable: dict[Path, set[Path]] = field(default_factory=dict)
+
+    def add_dir(self, path: Path) -> None:
+        """Register a directory created after the walk (and any missing parents)."""
+
+        missing: list[Path] = []
+        current = path
+        while current not in self.occupancy and current.parent != current:
+            missing.append(current)
+            current = current.parent
+        for directory in reversed(missing):
+            self.occupancy[directory] = 0
+            self._adjust(directory.parent, 1)
+
+    def add_entry(self, path: Path) -> None:
+        self.add_dir(path.parent)
+        self._adjust(path.parent, 1)
+
+    def remove_entry(self, path: Path) -> None:
+        self._adjust(path.parent, -1)
+
+    def discard_ignorable(self, path: Path) -> None:
+        entries = self.ignorable.get(path.parent)
+        if entries:
+            entries.discard(path)
+
+    def _adjust(self, directory: Path, delta: int) -> None:
+        if directory in self.occupancy:
+            self.occupancy[directory] = max(0, self.occupancy[directory] + delta)
+
+
 def scan_media(
     source: Path,
     on_dir: Callable[[str], None] | None = None,
     log_cb: Callable[[str], None] | None = None,
+    jobs: int = 1,
+    cache: "MetadataCache | None" = None,
+    inventory: TreeInventory | None = None,
+    cancel: CancelToken | None = None,
 ) -> Iterable[MediaFile]:
-    """Yield media files under the source directory."""
+    """Yield media files under the source directory.
+
+    With ``jobs > 1`` directories are listed and metadata is extracted by
+    thread pools; results follow the order in which the walk found them. A ``cache`` skips
+    extraction for files whose size and mtime are unchanged since the last run.
+    An ``inventory`` is filled in during the same walk. A ``cancel`` token
+    stops or pauses the scan between directories and every few files.
+    """
+
+    candidates = iter_media_candidates(
+        source, on_dir, log_cb, inventory, jobs=jobs, cancel=cancel
+    )
+    if cancel is not None:
+        candidates = _checkpointed(candidates, cancel)
+    media = _resolve_all(candidates, jobs, cache)
+    if METRICS.enabled:
+        # Only the scan's own time; consumers such as the planner time themselves.
+        return timed_iter("scan", media)
+    return media
+
+
+def _resolve_all(
+    candidates: Iterable[tuple[Path, MediaType, os.stat_result | None]],
+    jobs: int,
+    cache: "MetadataCache | None",
+) -> Iterator[MediaFile]:
+    with TRACER.phase("scan"):
+        if jobs <= 1:
+            for path, media_type, stat in candidates:
+                yield _resolve_media(path, media_type, stat, cache)
+            return
 
-    # Use an explicit stack to avoid recursion limits on deep trees.
-    stack = [source]
-    while stack:
-        current = stack.pop()
+        # Bound in-flight work so memory stays flat on huge trees.
+        window = jobs * 4
+        pending: deque[Future[MediaFile]] = deque()
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="scan") as pool:
+            for path, media_type, stat in candidates:
+                pending.append(pool.submit(_resolve_media, path, media_type, stat, cache))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+def _checkpointed(items: Iterable[_T], cancel: CancelToken) -> Iterator[_T]:
+    for count, item in enumerate(items, 1):
+        if count % CHECK_INTERVAL == 0:
+            cancel.checkpoint()
+        yield item
+
+
+def iter_media_candidates(
+    source: Path,
+    on_dir: Callable[[str], None] | None = None,
+    log_cb: Callable[[str], None] | None = None,
+    inventory: TreeInventory | None = None,
+    jobs: int = 1,
+    cancel: CancelToken | None = None,
+) -> Iterator[tuple[Path, MediaType, os.stat_result | None]]:
+    """Yield (path, media_type, stat) for media files without reading metadata.
+
+    Only media files are stat'ed, once, by the walker. When ``inventory`` is
+    given, sidecars, OS metadata files and per-directory occupancy are
+    recorded as each directory is listed.
+    """
+
+    def on_enter(path: str) -> None:
         if on_dir:
-            on_dir(f"Current Dir - {current} (entries: 0)")
-        entries_seen = 0
-        try:
-            if log_cb:
-                log_cb(f"scandir_start path={current}")
-            with os.scandir(current) as it:
-                for entry in it:
-                    entries_seen += 1
-                    # Throttle UI updates to keep scanning fast on large folders.
-                    if on_dir and entries_seen % 200 == 0:
-                        on_dir(f"Current Dir - {current} (entries: {entries_seen})")
-                    if entry.is_dir(follow_symlinks=False):
-                        if entry.name in SKIP_DIR_NAMES:
-                            # Skip common system folders on external drives.
-                            continue
-                        stack.append(Path(entry.path))
-                    elif entry.is_file(follow_symlinks=False):
-                        path = Path(entry.path)
-                        if path.name.startswith("._") or path.name in SKIP_FILE_NAMES:
-                            continue
-                        media_type = detect_media_type(path)
-                        if not media_type:
-                            continue
-                        created_at = get_creation_time(path, media_type)
-                        yield MediaFile(path=path, created_at=created_at, media_type=media_type)
-            if on_dir:
-                on_dir(f"Current Dir - {current} (entries: {entries_seen})")
-            if log_cb:
-                log_cb(f"scandir_end path={current} entries={entries_seen}")
-        except PermissionError:
+            on_dir(f"Current Dir - {path} (entries: 0)")
+        if log_cb:
+            log_cb(f"scandir_start path={path}")
+
+    listings = walk(
+        source,
+        skip_dir=SKIP_DIR_NAMES.__contains__,
+        stat_file=is_media_name,
+        jobs=jobs,
+        cancel=cancel,
+        on_enter=on_enter if on_dir or log_cb else None,
+    )
+    for listing in listings:
+        current = Path(listing.path)
+        if listing.error is not None:
             if log_cb:
-                log_cb(f"scandir_error path={current} error=PermissionError")
-            # Skip unreadable directories.
+                log_cb(f"scandir_error path={current} error={type(listing.error).__name__}")
+            if inventory is not None:
+                # Contents are unknown; never treat the directory as empty.
+                inventory.occupancy[current] = 1
             continue
+        occupied = len(listing.dirs) + listing.skipped_dirs + listing.other
+        media = 0
+        for entry in listing.files:
+            name = entry.name
+            if name.startswith("._") or name in SKIP_FILE_NAMES:
+                if inventory is not None:
+                    path = Path(entry.path)
+                    if name.startswith("._"):
+                        inventory.sidecars.append(path)
+                    inventory.ignorable.setdefault(current, set()).add(path)
+                continue
+            occupied += 1
+            media_type = media_type_for_name(name)
+            if not media_type:
+                continue
+            media += 1
+            yield Path(entry.path), media_type, entry.stat
+        if METRICS.enabled:
+            # The walker stats media files only, once each.
+            METRICS.incr("scan.dirs")
+            METRICS.incr("scan.files", media)
+            METRICS.incr("scan.stat", sum(entry.stat is not None for entry in listing.files))
+        if inventory is not None:
+            inventory.occupancy[current] = occupied
+        if on_dir:
+            on_dir(f"Current Dir - {current} (entries: {listing.entry_count})")
+        if log_cb:
+            log_cb(f"scandir_end path={current} entries={listing.entry_count}")
+
+
+def _resolve_media(
+    path: Path,
+    media_type: MediaType,
+    stat: os.stat_result | None,
+    cache: "MetadataCache | None",
+) -> MediaFile:
+    size = stat.st_size if stat is not None else None
+    mtime_ns = stat.st_mtime_ns if stat is not None else None
+    if cache is not None and stat is not None:
+        cached = cache.get(path, stat.st_size, stat.st_mtime_ns)
+        if cached:
+            METRICS.incr("scan.cache_hits")
+            return MediaFile(path, cached[0], cached[1], size=size, mtime_ns=mtime_ns)
+    created_at = get_creation_time(path, media_type, stat)
+    if cache is not None and stat is not None:
+        cache.put(path, stat.st_size, stat.st_mtime_ns, created_at, media_type)
+    return MediaFile(path, created_at, media_type, size=size, mtime_ns=mtime_ns)
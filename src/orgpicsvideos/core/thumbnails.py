@@ -0,0 +1,192 @@
+"""Thumbnail generation with an on-disk, size-bounded LRU cache."""
+
+from __future__ import annotations
+
+import hashlib
+from io import BytesIO
+import os
+from pathlib import Path
+import sys
+import tempfile
+
+from PIL import ExifTags, Image
+
+from .types import MediaType
+from .utils import media_type_for_name
+
+THUMBNAIL_SIZE = (160, 160)
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+_EXIF_HEADER = b"Exif\x00\x00"
+_THUMB_OFFSET = 0x0201  # JPEGInterchangeFormat
+_THUMB_LENGTH = 0x0202  # JPEGInterchangeFormatLength
+
+
+def default_thumbnail_dir() -> Path:
+    """Return the per-user cache directory for thumbnails."""
+
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "orgpicsvideos" / "thumbnails"
+
+
+class ThumbnailCache:
+    """JPEG thumbnails on disk, keyed by (device, inode, size, mtime).
+
+    Reads refresh an entry's mtime, which is the LRU order used to evict the
+    oldest entries once the directory grows past ``max_bytes``. Entries are
+    written via a temporary file and ``os.replace`` so concurrent processes
+    never see partial files.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size: int | None = None
+
+    def get(self, stat: os.stat_result) -> bytes | None:
+        path = self._entry_path(stat)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, stat: os.stat_result, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(stat)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_name, path)
+        except OSError:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            return
+        if self._size is None:
+            self._size = self._disk_usage()
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _entry_path(self, stat: os.stat_result) -> Path:
+        key = f"{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+        return self.directory / (hashlib.sha1(key.encode()).hexdigest() + ".jpg")
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".jpg"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def _disk_usage(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        # Drop least recently used entries down to 90% of the budget.
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 9 // 10
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+        self._size = total
+
+
+def make_thumbnail(path: Path, size: tuple[int, int] = THUMBNAIL_SIZE) -> bytes | None:
+    """Return a JPEG thumbnail for an image, or None if it cannot be decoded.
+
+    The thumbnail embedded in the EXIF data is used when present; otherwise
+    the JPEG decoder is asked to downscale while decoding (``draft``) so the
+    full-resolution image is never materialized.
+    """
+
+    if media_type_for_name(path.name) != MediaType.IMAGE:
+        return None
+    try:
+        with Image.open(path) as img:
+            embedded = _exif_thumbnail(img)
+            if embedded is not None:
+                return embedded
+            img.draft("RGB", size)
+            img.thumbnail(size)
+            output = BytesIO()
+            img.convert("RGB").save(output, "JPEG", quality=85)
+            return output.getvalue()
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _exif_thumbnail(img: Image.Image) -> bytes | None:
+    raw = img.info.get("exif")
+    if not raw or not raw.startswith(_EXIF_HEADER):
+        return None
+    try:
+        ifd1 = img.getexif().get_ifd(ExifTags.IFD.IFD1)
+    except Exception:  # noqa: BLE001
+        return None
+    offset = ifd1.get(_THUMB_OFFSET)
+    length = ifd1.get(_THUMB_LENGTH)
+    if not offset or not length:
+        return None
+    # Offsets are relative to the TIFF header that follows "Exif\0\0".
+    start = len(_EXIF_HEADER) + offset
+    data = raw[start : start + length]
+    if len(data) != length or not data.startswith(b"\xff\xd8"):
+        return None
+    return data
+
+
+_caches: dict[tuple[str, int], ThumbnailCache] = {}
+
+
+def load_thumbnail(
+    path: str,
+    cache_dir: str,
+    max_bytes: int = DEFAULT_CACHE_BYTES,
+    size: tuple[int, int] = THUMBNAIL_SIZE,
+) -> bytes | None:
+    """Return a cached or freshly made thumbnail; safe to run in a worker process."""
+
+    cache = _caches.get((cache_dir, max_bytes))
+    if cache is None:
+        cache = ThumbnailCache(Path(cache_dir), max_bytes)
+        _caches[(cache_dir, max_bytes)] = cache
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    data = cache.get(stat)
+    if data is not None:
+        return data
+    data = make_thumbnail(Path(path), size)
+    if data is not None:
+        cache.put(stat, data)
+    return data
@@ -0,0 +1,206 @@
+"""Opt-in timeline tracing in Chrome Trace Event format (chrome://tracing, Perfetto)."""
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import nullcontext, suppress
+import functools
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, ContextManager, TypeVar
+
+if TYPE_CHECKING:
+    import cProfile
+
+F = TypeVar("F", bound=Callable[..., object])
+
+# About 100 MB of events; the oldest are dropped first once it is full.
+DEFAULT_CAPACITY = 500_000
+
+_NULL_SPAN: ContextManager[None] = nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "path", "start")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, path: object) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.path = path
+        self.start = 0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        self.tracer._record(self.name, self.cat, self.start, time.perf_counter_ns(), self.path)
+
+
+class _Phase(_Span):
+    __slots__ = ("profiler",)
+
+    def __init__(self, tracer: Tracer, name: str) -> None:
+        super().__init__(tracer, name, "phase", None)
+        self.profiler: cProfile.Profile | None = None
+
+    def __enter__(self) -> None:
+        self.profiler = self.tracer._start_profile()
+        super().__enter__()
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        super().__exit__(exc_type, exc, tb)
+        if self.profiler is not None:
+            self.tracer._finish_profile(self.profiler, self.name)
+
+
+class Tracer:
+    """Record complete spans with their thread into a bounded buffer.
+
+    Disabled until ``start``; while disabled ``span`` and ``phase`` return a
+    shared null context. Spans are stored as tuples and only converted to
+    trace events by ``save``. With a ``profile_prefix``, each top-level phase
+    also runs under cProfile on its calling thread and is dumped to
+    ``<prefix>.<phase>.prof``.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._events: deque[tuple[str, str, int, int, int, object]] = deque(
+            maxlen=DEFAULT_CAPACITY
+        )
+        self._recorded = 0
+        self._threads: dict[int, str] = {}
+        self._origin = 0
+        self._profile_prefix: Path | None = None
+        self._profiling = False
+        self._profiles: dict[str, int] = {}
+
+    def start(self, capacity: int = DEFAULT_CAPACITY, profile_prefix: Path | None = None) -> None:
+        with self._lock:
+            self._events = deque(maxlen=capacity)
+            self._recorded = 0
+            self._threads.clear()
+            self._profiles.clear()
+        self._profile_prefix = profile_prefix
+        self._origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def stop(self) -> None:
+        self.enabled = False
+
+    def resume(self) -> None:
+        """Record again after ``stop`` without clearing the buffer."""
+
+        self.enabled = True
+
+    def span(self, name: str, cat: str, path: object = None) -> ContextManager[None]:
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, path)
+
+    def phase(self, name: str) -> ContextManager[None]:
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Phase(self, name)
+
+    @property
+    def dropped(self) -> int:
+        return self._recorded - len(self._events)
+
+    def events(self) -> list[dict[str, object]]:
+        """Return the buffer as trace events, thread names first."""
+
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._events)
+            threads = dict(self._threads)
+        events: list[dict[str, object]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        for name, cat, start, duration, tid, path in spans:
+            event: dict[str, object] = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            if path is not None:
+                event["args"] = {"path": str(path)}
+            events.append(event)
+        return events
+
+    def save(self, path: Path) -> None:
+        data = {
+            "traceEvents": self.events(),
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+
+    def _record(self, name: str, cat: str, start: int, end: int, path: object) -> None:
+        tid = threading.get_native_id()
+        with self._lock:
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+            self._recorded += 1
+            self._events.append((name, cat, start, end - start, tid, path))
+
+    def _start_profile(self) -> cProfile.Profile | None:
+        # cProfile sees only the calling thread, and nested phases stay in their parent's dump.
+        if self._profile_prefix is None or self._profiling:
+            return None
+        import cProfile
+
+        self._profiling = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _finish_profile(self, profiler: cProfile.Profile, name: str) -> None:
+        profiler.disable()
+        self._profiling = False
+        assert self._profile_prefix is not None
+        count = self._profiles.get(name, 0) + 1
+        self._profiles[name] = count
+        suffix = f"{name}.prof" if count == 1 else f"{name}-{count}.prof"
+        # A profile that cannot be written must not fail the phase it measured.
+        with suppress(OSError):
+            profiler.dump_stats(f"{self._profile_prefix}.{suffix}")
+
+
+TRACER = Tracer()
+
+
+def start_trace(path: Path, profile: bool = False) -> None:
+    """Start ``TRACER`` for a run saved to ``path``; profiles go next to it."""
+
+    if profile:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    TRACER.start(profile_prefix=path.with_suffix("") if profile else None)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorate a function so each call is recorded as the ``name`` phase."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):  # type: ignore[no-untyped-def]
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with _Phase(TRACER, name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Sequence
 
 
 class MediaType(str, Enum):
@@ -45,6 +45,10 @@ VIDEO_EXTENSIONS = {
 }
 
 
+# Hidden directory under a destination root that holds tool state (caches, journals).
+STATE_DIR_NAME = ".orgpicsvideos"
+
+
 @dataclass(frozen=True)
 class MediaFile:
     """Represents a discovered media file."""
@@ -52,6 +56,8 @@ class MediaFile:
     path: Path
     created_at: datetime
     media_type: MediaType
+    size: int | None = None
+    mtime_ns: int | None = None
 
 
 class OperationType(str, Enum):
@@ -79,6 +85,9 @@ class PlannedDirectory:
 
     path: Path
     exists: bool
+    # Leading path components below the destination root that already exist
+    # (2 for ``2002/sep`` existing under a new ``2002/sep/pics``).
+    existing_depth: int = 0
 
 
 class SkipReason(str, Enum):
@@ -86,6 +95,7 @@ class SkipReason(str, Enum):
 
     RESUME = "resume"
     DUPLICATE = "duplicate"
+    CONTENT_DUPLICATE = "content_duplicate"
 
 
 @dataclass(frozen=True)
@@ -101,7 +111,8 @@ class SkippedFile:
 class Plan:
     """Planned operations and summary counts."""
 
-    operations: list[PlannedOperation]
+    # A ``PlanTable`` from ``build_plan``; any sequence of operations works.
+    operations: Sequence[PlannedOperation]
     directories: list[PlannedDirectory]
     skipped_files: list[SkippedFile]
     total_files: int
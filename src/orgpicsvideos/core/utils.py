@@ -3,15 +3,16 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+import os
 from pathlib import Path
 import sys
-from typing import Iterable
-
-from PIL import Image
-from hachoir.metadata import extractMetadata
-from hachoir.parser import createParser
+from typing import Callable, Iterable
 
+from .fs import current_fs
+from .metrics import METRICS
+from .trace import TRACER
 from .types import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, MediaType
+from .xattrs import read_stamp
 
 MONTH_NAMES = [
     "jan",
@@ -29,32 +30,48 @@ MONTH_NAMES = [
 ]
 
 
-def get_creation_time(path: Path, media_type: MediaType | None = None) -> datetime:
+def get_creation_time(
+    path: Path,
+    media_type: MediaType | None = None,
+    stat: os.stat_result | None = None,
+) -> datetime:
     """Return a best-effort creation timestamp for a file.
 
     Preference order:
+    0) A capture-time stamp written when the file was copied, if the file is unchanged.
     1) Media capture time (EXIF for images; container metadata for videos).
     2) For videos without reliable metadata, use mtime (often closer to capture date).
     3) File system birthtime where available; otherwise fall back to mtime (Unix) or ctime (Windows).
+
+    Pass the file's ``stat`` when the caller already has it (the scanner
+    gets one from the walker) so the fallbacks never stat the file again.
     """
 
+    stamp = read_stamp(path, stat)
+    if stamp is not None and stamp.captured is not None:
+        METRICS.incr("metadata.stamp_hits")
+        return stamp.captured
     media_type = media_type or detect_media_type(path)
+    # Extraction latency per extractor and extension, e.g. ``metadata.exif.jpg``.
+    extension = path.suffix.lower()
     if media_type == MediaType.IMAGE:
-        exif_dt = _image_exif_datetime(path)
+        with METRICS.timer(f"metadata.exif{extension}"), TRACER.span("exif", "metadata", path):
+            exif_dt = _image_exif_datetime(path)
         if exif_dt:
             return exif_dt
     if media_type == MediaType.VIDEO:
-        video_dt = _video_creation_datetime(path)
-        if video_dt and _is_reasonable_media_datetime(video_dt, path):
+        with METRICS.timer(f"metadata.video{extension}"), TRACER.span("video", "metadata", path):
+            video_dt = _video_creation_datetime(path)
+        if video_dt and _is_reasonable_media_datetime(video_dt, path, stat):
             return video_dt
         # Video metadata often missing or unreliable; prefer mtime over birthtime.
         try:
-            mtime = datetime.fromtimestamp(path.stat().st_mtime)
+            mtime = datetime.fromtimestamp(_stat(path, stat).st_mtime)
             return mtime
         except OSError:
             pass
 
-    stat = path.stat()
+    stat = _stat(path, stat)
     if sys.platform == "win32":
         return datetime.fromtimestamp(stat.st_ctime)
     # For images without EXIF, prefer mtime over birthtime on Unix-like systems.
@@ -68,7 +85,13 @@ def get_creation_time(path: Path, media_type: MediaType | None = None) -> dateti
 def detect_media_type(path: Path) -> MediaType | None:
     """Return media type based on file extension, or None if unknown."""
 
-    ext = path.suffix.lower()
+    return media_type_for_name(path.name)
+
+
+def media_type_for_name(name: str) -> MediaType | None:
+    """Return media type for a bare file name (no Path object needed)."""
+
+    ext = os.path.splitext(name)[1].lower()
     if ext in IMAGE_EXTENSIONS:
         return MediaType.IMAGE
     if ext in VIDEO_EXTENSIONS:
@@ -76,6 +99,12 @@ def detect_media_type(path: Path) -> MediaType | None:
     return None
 
 
+def is_media_name(name: str) -> bool:
+    """Return True for media file names, skipping AppleDouble ``._`` files."""
+
+    return not name.startswith("._") and media_type_for_name(name) is not None
+
+
 def month_name(dt: datetime) -> str:
     """Return three-letter month name."""
 
@@ -92,37 +121,66 @@ def is_under(path: Path, candidate_parent: Path) -> bool:
         return False
 
 
-def unique_path(destination: Path, taken: set[Path]) -> Path:
-    """Return a non-colliding destination path."""
+def unique_path(
+    destination: Path,
+    taken: set[Path],
+    exists: Callable[[Path], bool] | None = None,
+    next_counter: dict[Path, int] | None = None,
+) -> Path:
+    """Return a non-colliding destination path.
+
+    ``next_counter`` remembers, per requested path, the first ``_N`` suffix
+    not yet known to be taken. Sharing it across calls (with the same
+    ``taken`` set) keeps many files with one name at one probe each instead
+    of rescanning every earlier ``_1``, ``_2``, ... for each of them.
+    ``exists`` defaults to a stat through the active filesystem.
+    """
 
+    exists = exists or current_fs().exists
     # Check both in-memory collisions and existing paths on disk.
-    if destination not in taken and not destination.exists():
+    if destination not in taken and not exists(destination):
         taken.add(destination)
+        METRICS.incr("plan.unique_path.probes")
         return destination
 
     stem = destination.stem
     suffix = destination.suffix
     parent = destination.parent
-    counter = 1
+    start = counter = next_counter.get(destination, 1) if next_counter is not None else 1
     while True:
         candidate = parent / f"{stem}_{counter}{suffix}"
-        if candidate not in taken and not candidate.exists():
+        if candidate not in taken and not exists(candidate):
             taken.add(candidate)
+            if next_counter is not None:
+                next_counter[destination] = counter + 1
+            METRICS.incr("plan.unique_path.probes", counter - start + 2)
+            METRICS.incr("plan.unique_path.collisions")
             return candidate
         counter += 1
 
 
-def is_probable_duplicate(source: Path, destination: Path) -> bool:
-    """Heuristic duplicate check based on size and mtime."""
+def is_probable_duplicate(
+    source: Path,
+    destination: Path,
+    source_size: int | None = None,
+    source_mtime_ns: int | None = None,
+) -> bool:
+    """Heuristic duplicate check based on size and mtime.
+
+    Pass the source's size and mtime when they are already known to save a stat.
+    """
 
+    fs = current_fs()
     try:
-        src_stat = source.stat()
-        dst_stat = destination.stat()
+        if source_size is None or source_mtime_ns is None:
+            src_stat = fs.stat(source)
+            source_size, source_mtime_ns = src_stat.st_size, src_stat.st_mtime_ns
+        dst_stat = fs.stat(destination)
     except OSError:
         return False
     return (
-        src_stat.st_size == dst_stat.st_size
-        and abs(src_stat.st_mtime - dst_stat.st_mtime) < 1e-3
+        source_size == dst_stat.st_size
+        and abs(source_mtime_ns - dst_stat.st_mtime_ns) < 1_000_000
     )
 
 
@@ -136,9 +194,14 @@ def split_media_dirs(destination_root: Path, dt: datetime, media_type: MediaType
 
 
 def _image_exif_datetime(path: Path) -> datetime | None:
+    # Pillow and hachoir are imported on first use so the CLIs start quickly.
+    from PIL import Image
+
     try:
-        with Image.open(path) as img:
+        with current_fs().open(path) as handle, Image.open(handle) as img:
             exif = img.getexif()
+            # Approximate: the furthest offset Pillow read up to.
+            METRICS.incr("metadata.bytes_read", handle.tell())
             if not exif:
                 return None
             raw = exif.get(36867) or exif.get(36868) or exif.get(306)
@@ -158,12 +221,16 @@ def _parse_exif_datetime(value: str) -> datetime | None:
 
 def _video_creation_datetime(path: Path) -> datetime | None:
     # Video container metadata can be sparse or unreliable; parse conservatively.
+    from hachoir.metadata import extractMetadata
+    from hachoir.parser import createParser
+
     try:
-        parser = createParser(str(path))
-        if not parser:
-            return None
-        with parser:
-            metadata = extractMetadata(parser)
+        with current_fs().open(path) as handle:
+            parser = createParser(handle, str(path))
+            if not parser:
+                return None
+            with parser:
+                metadata = extractMetadata(parser)
         if not metadata:
             return None
         for key in ("creation_date", "date"):
@@ -180,14 +247,16 @@ def _video_creation_datetime(path: Path) -> datetime | None:
     return None
 
 
-def _is_reasonable_media_datetime(candidate: datetime, path: Path) -> bool:
+def _is_reasonable_media_datetime(
+    candidate: datetime, path: Path, stat: os.stat_result | None = None
+) -> bool:
     """Reject metadata dates that appear invalid for the file.
 
     This avoids camera defaults or container timestamps that are newer than the file itself.
     """
 
     try:
-        mtime = datetime.fromtimestamp(path.stat().st_mtime)
+        mtime = datetime.fromtimestamp(_stat(path, stat).st_mtime)
     except OSError:
         return True
     now = datetime.now()
@@ -197,3 +266,10 @@ def _is_reasonable_media_datetime(candidate: datetime, path: Path) -> bool:
     if candidate > mtime + timedelta(days=1):
         return False
     return True
+
+
+def _stat(path: Path, stat: os.stat_result | None) -> os.stat_result:
+    if stat is not None:
+        return stat
+    METRICS.incr("metadata.stat")
+    return current_fs().stat(path)
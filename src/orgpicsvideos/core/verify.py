@@ -0,0 +1,234 @@
+"""Parallel integrity check of copied files against their sources."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Callable, Iterable, Protocol
+
+from .cancel import CancelToken
+from .hashing import FULL, full_digest
+from .xattrs import read_stamp
+
+STATUSES = ("ok", "mismatch", "missing", "source-missing", "error")
+
+
+class DigestStore(Protocol):
+    """``MetadataCache`` and ``ContentIndex`` both keep digests keyed by size and mtime."""
+
+    def get_digest(self, path: Path, kind: str, size: int, mtime_ns: int) -> str | None: ...
+
+    def put_digest(
+        self, path: Path, kind: str, size: int, mtime_ns: int, digest: str
+    ) -> None: ...
+
+
+@dataclass(frozen=True)
+class VerifyResult:
+    source: str
+    destination: str
+    size: int
+    status: str  # one of STATUSES
+    error: str = ""
+
+
+@dataclass
+class VerifySummary:
+    checked: int = 0
+    ok: int = 0
+    mismatched: int = 0
+    missing: int = 0
+    source_missing: int = 0
+    errors: int = 0
+    reused: int = 0
+    bytes_hashed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def problems(self) -> int:
+        return self.mismatched + self.missing + self.source_missing + self.errors
+
+
+@dataclass(frozen=True)
+class _Fingerprint:
+    size: int
+    digest: str
+    hashed: int  # bytes read; 0 when a stored digest was reused
+
+
+class DevicePools:
+    """One small thread pool per device.
+
+    Hashing is I/O bound, and each device has its own sweet spot: a USB card
+    or a spinning disk slows down with many concurrent readers while an SSD
+    does not. Limiting readers per device keeps a slow source from starving
+    the destination, and vice versa. Devices are told apart by the
+    ``st_dev`` of each file's directory, stat'ed once per directory.
+    """
+
+    def __init__(self, per_device: int = 2) -> None:
+        self.per_device = per_device
+        self._pools: dict[int | None, ThreadPoolExecutor] = {}
+        self._devices: dict[str, int | None] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, path: Path, fn: Callable[..., object], *args: object) -> Future:
+        device = self.device(path)
+        with self._lock:
+            pool = self._pools.get(device)
+            if pool is None:
+                pool = self._pools[device] = ThreadPoolExecutor(
+                    max_workers=self.per_device, thread_name_prefix=f"verify-{device}"
+                )
+        return pool.submit(fn, *args)
+
+    def device(self, path: Path) -> int | None:
+        directory = os.path.dirname(path)
+        with self._lock:
+            if directory in self._devices:
+                return self._devices[directory]
+        try:
+            device: int | None = os.stat(directory).st_dev
+        except OSError:
+            device = None
+        with self._lock:
+            self._devices[directory] = device
+        return device
+
+    @property
+    def workers(self) -> int:
+        return max(1, len(self._pools)) * self.per_device
+
+    def shutdown(self, cancel_futures: bool = False) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=True, cancel_futures=cancel_futures)
+        self._pools.clear()
+
+
+def verify_copies(
+    pairs: Iterable[tuple[Path, Path]],
+    per_device: int = 2,
+    source_store: DigestStore | None = None,
+    destination_store: DigestStore | None = None,
+    rehash: bool = False,
+    on_result: Callable[[VerifyResult], None] | None = None,
+    cancel: CancelToken | None = None,
+) -> VerifySummary:
+    """Check that every (source, destination) pair is byte-identical.
+
+    Both files of a pair are fingerprinted concurrently on their device's
+    pool. A full digest already stored for an unchanged file, in a store or
+    in the ``sha`` stamp written when it was copied, is reused unless
+    ``rehash`` is set, and digests that had to be computed are stored
+    for next time. Results are reported in input order from the calling
+    thread, with a bounded number of pairs in flight.
+    """
+
+    summary = VerifySummary()
+    pools = DevicePools(per_device)
+    pending: deque[tuple[Path, Path, Future, Future]] = deque()
+    start = time.monotonic()
+
+    def fingerprint(path: Path, store: DigestStore | None) -> _Fingerprint:
+        stat = os.stat(path)
+        if store is not None and not rehash:
+            digest = store.get_digest(path, FULL, stat.st_size, stat.st_mtime_ns)
+            if digest is not None:
+                return _Fingerprint(stat.st_size, digest, 0)
+        if not rehash:
+            # Stamps are dropped by read_stamp once the file's size or mtime changes.
+            stamp = read_stamp(path, stat)
+            if stamp is not None and stamp.sha is not None:
+                return _Fingerprint(stat.st_size, stamp.sha, 0)
+        digest = full_digest(path)
+        if store is not None:
+            store.put_digest(path, FULL, stat.st_size, stat.st_mtime_ns, digest)
+        return _Fingerprint(stat.st_size, digest, stat.st_size)
+
+    def resolve(source: Path, destination: Path, src: Future, dst: Future) -> None:
+        result = _compare(source, destination, src, dst)
+        summary.checked += 1
+        if result.status == "ok":
+            summary.ok += 1
+        elif result.status == "mismatch":
+            summary.mismatched += 1
+        elif result.status == "missing":
+            summary.missing += 1
+        elif result.status == "source-missing":
+            summary.source_missing += 1
+        else:
+            summary.errors += 1
+        for future in (src, dst):
+            if future.exception() is None:
+                done: _Fingerprint = future.result()
+                summary.bytes_hashed += done.hashed
+                if done.hashed == 0 and done.size:
+                    summary.reused += 1
+        if on_result:
+            on_result(result)
+
+    try:
+        for source, destination in pairs:
+            if cancel is not None:
+                cancel.checkpoint()
+            src = pools.submit(source, fingerprint, source, source_store)
+            dst = pools.submit(destination, fingerprint, destination, destination_store)
+            pending.append((source, destination, src, dst))
+            while len(pending) > pools.workers * 4:
+                resolve(*pending.popleft())
+        while pending:
+            if cancel is not None:
+                cancel.checkpoint()
+            resolve(*pending.popleft())
+    finally:
+        pools.shutdown(cancel_futures=True)
+        summary.seconds = time.monotonic() - start
+    return summary
+
+
+def _compare(source: Path, destination: Path, src: Future, dst: Future) -> VerifyResult:
+    # A missing destination is the verdict that matters, whatever happened to the source.
+    dst_error = dst.exception()
+    src_error = src.exception()
+    if isinstance(dst_error, FileNotFoundError):
+        return VerifyResult(str(source), str(destination), 0, "missing")
+    if isinstance(src_error, FileNotFoundError):
+        return VerifyResult(str(source), str(destination), 0, "source-missing")
+    error = dst_error or src_error
+    if error is not None:
+        return VerifyResult(str(source), str(destination), 0, "error", str(error))
+    src_print: _Fingerprint = src.result()
+    dst_print: _Fingerprint = dst.result()
+    if src_print.size != dst_print.size:
+        detail = f"size {src_print.size} != {dst_print.size}"
+        return VerifyResult(str(source), str(destination), src_print.size, "mismatch", detail)
+    if src_print.digest != dst_print.digest:
+        return VerifyResult(
+            str(source), str(destination), src_print.size, "mismatch", "content differs"
+        )
+    return VerifyResult(str(source), str(destination), src_print.size, "ok")
+
+
+def format_result(result: VerifyResult, fmt: str = "text") -> str:
+    """Format one report line for ``ReportWriter``."""
+
+    if fmt == "jsonl":
+        data = {
+            "source": result.source,
+            "destination": result.destination,
+            "size": result.size,
+            "status": result.status,
+        }
+        if result.error:
+            data["error"] = result.error
+        return json.dumps(data)
+    line = f"{result.status} {result.source} -> {result.destination}"
+    if result.error:
+        return f"{line}: {result.error}"
+    return line
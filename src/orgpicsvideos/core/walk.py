@@ -0,0 +1,142 @@
+"""Shared directory tree walker used by the scanner, rebuild and cleanup."""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+import os
+from typing import Callable, Iterator
+
+from .cancel import CancelToken
+from .fs import current_fs
+from .trace import TRACER
+
+NameFilter = Callable[[str], bool]
+
+
+class FileEntry:
+    """A regular file found by the walker; ``stat`` is filled when requested."""
+
+    __slots__ = ("name", "path", "stat")
+
+    def __init__(self, name: str, path: str, stat: os.stat_result | None) -> None:
+        self.name = name
+        self.path = path
+        self.stat = stat
+
+
+@dataclass
+class DirListing:
+    """One listed directory.
+
+    ``dirs`` are the subdirectories that will be descended into; directories
+    rejected by ``skip_dir`` are only counted. ``other`` counts symlinks and
+    special files. ``error`` is set when the directory could not be listed.
+    """
+
+    path: str
+    files: list[FileEntry] = field(default_factory=list)
+    dirs: list[str] = field(default_factory=list)
+    skipped_dirs: int = 0
+    other: int = 0
+    error: OSError | None = None
+
+    @property
+    def entry_count(self) -> int:
+        return len(self.files) + len(self.dirs) + self.skipped_dirs + self.other
+
+
+def walk(
+    root: str | os.PathLike[str],
+    skip_dir: NameFilter | None = None,
+    stat_file: bool | NameFilter = False,
+    jobs: int = 1,
+    cancel: CancelToken | None = None,
+    on_enter: Callable[[str], None] | None = None,
+) -> Iterator[DirListing]:
+    """Yield a ``DirListing`` for every directory under ``root``.
+
+    Symlinked directories are not followed. ``stat_file`` selects which files
+    are stat'ed while their directory is open (True for all, or a name filter);
+    that is the only stat a file costs. With ``jobs > 1`` directories are
+    listed by a thread pool and listings arrive in completion order; with one
+    job the order is a deterministic depth-first walk. ``on_enter`` is called
+    (possibly from a worker thread) before each directory is listed. A
+    ``cancel`` token is checked before each listing, which also honours pause.
+    """
+
+    root_path = os.fspath(root)
+
+    def list_one(path: str) -> DirListing:
+        if cancel is not None:
+            cancel.checkpoint()
+        if on_enter:
+            on_enter(path)
+        if TRACER.enabled:
+            with TRACER.span("list", "walk", path):
+                return _list_dir(path, skip_dir, stat_file)
+        return _list_dir(path, skip_dir, stat_file)
+
+    if jobs <= 1:
+        stack = [root_path]
+        while stack:
+            listing = list_one(stack.pop())
+            yield listing
+            stack.extend(listing.dirs)
+        return
+
+    queue = [root_path]
+    running: set[Future[DirListing]] = set()
+    # Keep a few listings queued per worker so threads never idle on a wide tree.
+    limit = jobs * 2
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="walk") as pool:
+        try:
+            while queue or running:
+                while queue and len(running) < limit:
+                    running.add(pool.submit(list_one, queue.pop()))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    listing = future.result()
+                    queue.extend(listing.dirs)
+                    yield listing
+        finally:
+            for future in running:
+                future.cancel()
+
+
+def _list_dir(path: str, skip_dir: NameFilter | None, stat_file: bool | NameFilter) -> DirListing:
+    listing = DirListing(path)
+    prefix = path if path.endswith(os.sep) else path + os.sep
+    try:
+        with current_fs().scandir(path) as it:
+            _classify(it, prefix, listing, skip_dir, stat_file)
+    except OSError as exc:
+        listing.error = exc
+    return listing
+
+
+def _classify(
+    entries: Iterator[os.DirEntry[str]],
+    prefix: str,
+    listing: DirListing,
+    skip_dir: NameFilter | None,
+    stat_file: bool | NameFilter,
+) -> None:
+    for entry in entries:
+        name = entry.name
+        if entry.is_dir(follow_symlinks=False):
+            if skip_dir and skip_dir(name):
+                listing.skipped_dirs += 1
+            else:
+                listing.dirs.append(prefix + name)
+        elif entry.is_file(follow_symlinks=False):
+            stat = None
+            if stat_file is True or (stat_file and stat_file(name)):
+                try:
+                    # DirEntry caches this; on a local fd listing it is one fstatat().
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    stat = None
+            listing.files.append(FileEntry(name, prefix + name, stat))
+        else:
+            listing.other += 1
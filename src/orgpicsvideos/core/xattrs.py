@@ -0,0 +1,118 @@
+"""Extended-attribute stamps that keep derived metadata with organized files."""
+
+from __future__ import annotations
+
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
+import errno
+import os
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from .fs import current_fs
+
+PREFIX = "user.orgpicsvideos."
+CAPTURED = PREFIX + "captured"
+SHA = PREFIX + "sha"
+SRC_MTIME = PREFIX + "src_mtime"
+# Size and mtime of the file when it was stamped; stamps are only trusted while both match.
+KEY = PREFIX + "key"
+
+# The stdlib only exposes xattrs on Linux; elsewhere stamping is a no-op.
+SUPPORTED = hasattr(os, "getxattr")
+
+# Filesystems that rejected a stamp (FAT cards, some network shares) are not retried.
+# EPERM/EACCES are about one file, not the device, so they do not count.
+_UNSUPPORTED_ERRNOS = {errno.ENOTSUP, errno.EOPNOTSUPP, errno.EROFS}
+_unsupported_devices: set[int] = set()
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Stamp:
+    """Metadata stamped on a file; fields that were never written are None."""
+
+    captured: datetime | None = None
+    sha: str | None = None
+    src_mtime_ns: int | None = None
+
+
+def read_stamp(path: Path | str, stat: os.stat_result | None = None) -> Stamp | None:
+    """Return the file's stamp, or None if it has none or changed since it was stamped.
+
+    Unstamped files cost a single failed ``getxattr``.
+    """
+
+    if not SUPPORTED:
+        return None
+    fs = current_fs()
+    try:
+        key = fs.getxattr(path, KEY)
+        if stat is None:
+            stat = fs.stat(path)
+    except OSError:
+        return None
+    if key != _key(stat):
+        return None
+    return Stamp(
+        captured=_get(path, CAPTURED, datetime.fromisoformat),
+        sha=_get(path, SHA, str),
+        src_mtime_ns=_get(path, SRC_MTIME, int),
+    )
+
+
+def write_stamp(path: Path | str, stamp: Stamp, stat: os.stat_result | None = None) -> bool:
+    """Merge ``stamp`` into the file's stamps.
+
+    Stamps left from before the file last changed are dropped first. Returns
+    False, without raising, where extended attributes are unsupported.
+    """
+
+    if not SUPPORTED:
+        return False
+    fs = current_fs()
+    try:
+        if stat is None:
+            stat = fs.stat(path)
+    except OSError:
+        return False
+    if stat.st_dev in _unsupported_devices:
+        return False
+    key = _key(stat)
+    values = {
+        CAPTURED: stamp.captured.isoformat() if stamp.captured else None,
+        SHA: stamp.sha,
+        SRC_MTIME: str(stamp.src_mtime_ns) if stamp.src_mtime_ns is not None else None,
+    }
+    try:
+        try:
+            current = fs.getxattr(path, KEY)
+        except OSError:
+            current = None
+        if current != key:
+            if current is not None:
+                for name in values:
+                    with suppress(OSError):
+                        fs.removexattr(path, name)
+            fs.setxattr(path, KEY, key)
+        for name, value in values.items():
+            if value is not None:
+                fs.setxattr(path, name, value.encode())
+    except OSError as exc:
+        if exc.errno in _UNSUPPORTED_ERRNOS:
+            _unsupported_devices.add(stat.st_dev)
+        return False
+    return True
+
+
+def _key(stat: os.stat_result) -> bytes:
+    return f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+
+
+def _get(path: Path | str, name: str, parse: Callable[[str], T]) -> T | None:
+    try:
+        return parse(current_fs().getxattr(path, name).decode())
+    except (OSError, ValueError):
+        return None
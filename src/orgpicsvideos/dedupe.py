@@ -0,0 +1,122 @@
+"""CLI entrypoint to collapse byte-identical files in a library into links."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import TextIO
+
+from orgpicsvideos.core.dedupe import (
+    LINK_MODES,
+    DedupeSummary,
+    FileSpool,
+    collapse,
+    find_duplicates,
+    format_result,
+    spool_library,
+)
+from orgpicsvideos.core.deleter import REPORT_FORMATS, ReportWriter
+from orgpicsvideos.core.logger import LogWriter, make_log_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Find byte-identical media files under ROOT and replace duplicates with links."
+    )
+    parser.add_argument("root", type=Path, help="Library root to scan")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report duplicates and reclaimable space without changing anything",
+    )
+    parser.add_argument(
+        "--link",
+        choices=LINK_MODES,
+        default="hardlink",
+        help="Replace duplicates with hardlinks or copy-on-write reflinks (default: hardlink)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker threads for walking and processes for hashing (default: CPU count)",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help="Write the per-file report to this file instead of stdout",
+    )
+    parser.add_argument(
+        "--format",
+        choices=REPORT_FORMATS,
+        default="text",
+        help="Report format (default: text)",
+    )
+    parser.add_argument(
+        "--temp-dir",
+        type=Path,
+        help="Directory for the on-disk file list (default: system temp dir)",
+    )
+    args = parser.parse_args()
+
+    root = args.root
+    if not root.exists() or not root.is_dir():
+        raise SystemExit(f"Root is not a directory: {root}")
+    if args.jobs < 1:
+        raise SystemExit("--jobs must be at least 1")
+
+    if args.report:
+        with args.report.open("w", encoding="utf-8") as handle:
+            summary, log_path = _run(args, handle)
+    else:
+        summary, log_path = _run(args, sys.stdout)
+
+    reclaimable = (
+        f"{summary.bytes_reclaimable} bytes "
+        f"({summary.bytes_reclaimable / (1024 * 1024):.1f} MiB)"
+    )
+    if args.dry_run:
+        print(
+            f"Dry-run complete. Files: {summary.files}. Duplicates: {summary.duplicates}. "
+            f"Reclaimable: {reclaimable}."
+        )
+    else:
+        print(
+            f"Linked {summary.linked} duplicates (files: {summary.files}, "
+            f"failed: {summary.failed}). Reclaimed: {reclaimable}. Log: {log_path}"
+        )
+    if summary.failed:
+        raise SystemExit(1)
+
+
+def _run(args: argparse.Namespace, stream: TextIO) -> tuple[DedupeSummary, Path | None]:
+    report = ReportWriter(stream, args.format, formatter=format_result)
+    temp_dir = str(args.temp_dir) if args.temp_dir else None
+    with FileSpool(temp_dir) as spool:
+        spool_library(args.root, spool, jobs=args.jobs)
+        # Dry runs leave the library untouched, stamps included.
+        sets = find_duplicates(spool, jobs=args.jobs, stamp=not args.dry_run)
+        if args.dry_run:
+            summary = collapse(sets, report.add, dry_run=True, link=args.link)
+            log_path = None
+        else:
+            log_path = make_log_path(args.root)
+            with LogWriter(log_path, args.root, args.root) as writer:
+                summary = collapse(sets, report.add, writer.write, link=args.link)
+                writer.write(
+                    "DEDUPE SUMMARY: "
+                    f"files={spool.count} "
+                    f"duplicates={summary.duplicates} "
+                    f"linked={summary.linked} "
+                    f"failed={summary.failed} "
+                    f"reclaimed={summary.bytes_reclaimable}"
+                )
+        summary.files = spool.count
+    report.flush()
+    return summary, log_path
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""Headless CLI entrypoint to scan, plan and copy media without the GUI."""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+from pathlib import Path
+import signal
+import sys
+import time
+from typing import TextIO
+
+from orgpicsvideos.core.cache import MetadataCache, default_cache_path
+from orgpicsvideos.core.cancel import CancelToken, OperationCancelled
+from orgpicsvideos.core.content_index import ContentIndex, default_index_path
+from orgpicsvideos.core.copier import execute_plan
+from orgpicsvideos.core.hashing import DuplicateFinder
+from orgpicsvideos.core.logger import (
+    LogWriter,
+    find_latest_log,
+    format_duration_line,
+    format_resume_summary,
+    format_scan_summary,
+    load_successful_destinations,
+    make_log_path,
+)
+from orgpicsvideos.core.metrics import METRICS, format_metrics_line, format_metrics_report
+from orgpicsvideos.core.plan_table import PlanTable
+from orgpicsvideos.core.planner import build_plan
+from orgpicsvideos.core.progress import JsonProgress
+from orgpicsvideos.core.rebuild import build_sidecar_delete_ops
+from orgpicsvideos.core.scanner import scan_media
+from orgpicsvideos.core.trace import TRACER, start_trace
+from orgpicsvideos.core.types import OperationType
+from orgpicsvideos.core.validator import ValidationError, validate_paths
+
+# Exit status after SIGINT/SIGTERM, as a shell reports an interrupted command.
+EXIT_CANCELLED = 130
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Copy media from SOURCE into a date-organized DEST without the GUI."
+    )
+    parser.add_argument("source", type=Path, help="Source directory to scan")
+    parser.add_argument("destination", type=Path, help="Destination root")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip files logged as copied by the latest log in the destination",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker threads for scanning and copying (default: CPU count)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or update the metadata cache in the destination",
+    )
+    parser.add_argument(
+        "--no-content-check",
+        action="store_true",
+        help="Detect duplicates by name, size and mtime only instead of by content",
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Compare content only within each target folder, not the whole library",
+    )
+    parser.add_argument(
+        "--stamps",
+        action="store_true",
+        help="Stamp copied files with their capture time, source mtime and SHA-256 as xattrs",
+    )
+    parser.add_argument(
+        "--keep-sidecars",
+        action="store_true",
+        help="Do not delete macOS ._ sidecar files in the destination (default is to delete)",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Record per-phase timings and counters; report them and append them to the log",
+    )
+    parser.add_argument(
+        "--progress-fd",
+        type=int,
+        metavar="FD",
+        help="Write JSON progress lines to this file descriptor instead of stdout",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="Minimum seconds between progress lines per phase (default: 1.0)",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        metavar="FILE",
+        help="Record a Chrome trace (chrome://tracing, Perfetto) of the run to FILE",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="With --trace, also write cProfile stats per phase next to FILE",
+    )
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        raise SystemExit("--jobs must be at least 1")
+    if args.profile and not args.trace:
+        raise SystemExit("--profile requires --trace")
+    source, destination = args.source, args.destination
+    try:
+        validate_paths(source, destination)
+    except ValidationError as exc:
+        raise SystemExit(str(exc)) from exc
+
+    if args.progress_fd is None:
+        # Keep stdout machine-readable; the human summary goes to stderr.
+        stream: TextIO = sys.stdout
+        report = sys.stderr
+    else:
+        try:
+            stream = os.fdopen(args.progress_fd, "w", encoding="utf-8", closefd=False)
+        except OSError as exc:
+            raise SystemExit(f"Cannot write progress to fd {args.progress_fd}: {exc}") from exc
+        report = sys.stdout
+    progress = JsonProgress(stream, interval=args.progress_interval)
+    if args.metrics:
+        METRICS.enable()
+    if args.trace:
+        start_trace(args.trace, args.profile)
+
+    cancel = CancelToken()
+    handlers = {
+        signum: signal.signal(signum, lambda *_: cancel.cancel())
+        for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+    cache = None if args.no_cache else MetadataCache(default_cache_path(destination))
+    if cache:
+        cache.open()
+    index = None if args.no_index else ContentIndex(default_index_path(destination))
+    if index:
+        index.open()
+    try:
+        status = _run(args, progress, report, cancel, cache, index)
+    finally:
+        if cache:
+            cache.close()
+        if index:
+            index.close()
+        if args.trace:
+            TRACER.stop()
+            TRACER.save(args.trace)
+            print(f"Trace: {args.trace} (dropped events: {TRACER.dropped})", file=report)
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+        if stream is not sys.stdout:
+            stream.close()
+    if status:
+        raise SystemExit(status)
+
+
+def _run(
+    args: argparse.Namespace,
+    progress: JsonProgress,
+    report: TextIO,
+    cancel: CancelToken,
+    cache: MetadataCache | None,
+    index: ContentIndex | None = None,
+) -> int:
+    source, destination = args.source, args.destination
+    skip_destinations: set[Path] = set()
+    if args.resume:
+        latest = find_latest_log(destination)
+        if latest:
+            skip_destinations = load_successful_destinations(
+                latest, expected_source=source, expected_destination=destination
+            )
+
+    scan_start = time.monotonic()
+    media_files = []
+    scanned_bytes = 0
+    try:
+        if index is not None and not args.no_content_check and not index.populated:
+            # One walk of the library; later imports keep the index current.
+            indexed = index.populate(destination, jobs=args.jobs, cancel=cancel)
+            progress.event("index", files=indexed)
+        for media in scan_media(source, jobs=args.jobs, cache=cache, cancel=cancel):
+            media_files.append(media)
+            scanned_bytes += media.size or 0
+            progress.update("scan", len(media_files), bytes_done=scanned_bytes)
+        duplicates = (
+            None if args.no_content_check else DuplicateFinder(args.jobs, cache, index)
+        )
+        plan = build_plan(
+            media_files,
+            destination,
+            skip_destinations=skip_destinations,
+            cancel=cancel,
+            duplicates=duplicates,
+        )
+    except OperationCancelled:
+        progress.event("cancelled", phase="scan", files=len(media_files))
+        print("Import cancelled during scan; nothing was copied.", file=report)
+        return EXIT_CANCELLED
+    plan.scan_duration_seconds = time.monotonic() - scan_start
+    plan.resume_enabled = args.resume
+    progress.update(
+        "scan", len(media_files), plan.total_found, scanned_bytes, scanned_bytes
+    )
+    progress.event(
+        "plan",
+        found=plan.total_found,
+        to_copy=plan.total_files,
+        skipped_resume=plan.skipped_resume,
+        skipped_duplicates=plan.skipped_duplicates,
+        dirs=plan.total_dirs,
+    )
+
+    sidecar_ops = [] if args.keep_sidecars else build_sidecar_delete_ops(destination)
+    # Prepend delete ops so destination is cleaned before copy; the planned
+    # rows are shared, not copied.
+    operations = PlanTable.concat(sidecar_ops, plan.operations)
+    plan = dataclasses.replace(plan, operations=operations)
+    if not operations:
+        progress.event("summary", copied=0, failed=0, cancelled=False, log=None)
+        print(f"Nothing to copy: found={plan.total_found} skipped={plan.total_skipped}", file=report)
+        return 0
+
+    # Sizes were recorded in the plan from the scan's stat; only copies have one.
+    bytes_total = sum(operations.sizes())
+    copied = 0
+    failed = 0
+    bytes_done = 0
+    completed = 0
+    cancelled = False
+    log_path = make_log_path(destination)
+    with LogWriter(log_path, source, destination) as writer:
+        writer.write(format_scan_summary(plan))
+        writer.write(format_resume_summary(plan))
+        writer.write(format_duration_line("Scan duration", plan.scan_duration_seconds))
+
+        def op_cb(op, success: bool) -> None:  # type: ignore[no-untyped-def]
+            nonlocal copied, failed, bytes_done, completed
+            # Results arrive in plan order, so the running count is the op's index.
+            bytes_done += operations.size(completed)
+            completed += 1
+            if op.op_type == OperationType.COPY:
+                if success:
+                    copied += 1
+                else:
+                    failed += 1
+                progress.update(
+                    "copy", copied + failed, plan.total_files, bytes_done, bytes_total
+                )
+            elif not success:
+                failed += 1
+
+        copy_start = time.monotonic()
+        progress.update("copy", 0, plan.total_files, 0, bytes_total)
+        try:
+            execute_plan(
+                operations,
+                writer.write,
+                op_cb=op_cb,
+                jobs=args.jobs,
+                cancel=cancel,
+                index=index,
+                stamps=args.stamps,
+            )
+        except OperationCancelled:
+            # Every started operation has been logged, so --resume picks up
+            # exactly where this run stopped.
+            cancelled = True
+            remaining = len(operations) - completed
+            writer.write(f"COPY CANCELLED: completed={completed} remaining={remaining}")
+        writer.write(format_duration_line("Copy duration", time.monotonic() - copy_start))
+        if args.metrics:
+            writer.write(format_metrics_line(METRICS.snapshot()))
+
+    progress.event(
+        "summary", copied=copied, failed=failed, cancelled=cancelled, log=str(log_path)
+    )
+    print(
+        ("Import cancelled: " if cancelled else "Import complete: ")
+        + f"found={plan.total_found} "
+        f"copied={copied} "
+        f"failed={failed} "
+        f"skipped={plan.total_skipped} "
+        f"log={log_path}",
+        file=report,
+    )
+    if args.metrics:
+        snapshot = METRICS.snapshot()
+        progress.event("metrics", **snapshot)
+        for line in format_metrics_report(snapshot):
+            print(line, file=report)
+    if cancelled:
+        return EXIT_CANCELLED
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    main()
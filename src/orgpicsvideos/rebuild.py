@@ -3,15 +3,33 @@
 from __future__ import annotations
 
 import argparse
+import os
 from pathlib import Path
+import sys
 
+from orgpicsvideos.core.cache import MetadataCache, default_cache_path
+from orgpicsvideos.core.content_index import ContentIndex, default_index_path
+from orgpicsvideos.core.journal import (
+    JournalError,
+    RebuildJournal,
+    default_journal_dir,
+    read_plan_header,
+)
 from orgpicsvideos.core.logger import make_log_path
-from orgpicsvideos.core.rebuild import rebuild_destination
+from orgpicsvideos.core.metrics import METRICS, format_metrics_report
+from orgpicsvideos.core.progress import ProgressLine
+from orgpicsvideos.core.rebuild import apply_rebuild_plan, rebuild_destination, write_rebuild_plan
+from orgpicsvideos.core.trace import TRACER, start_trace
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Rebuild destination structure in-place.")
-    parser.add_argument("destination", type=Path, help="Destination root to rebuild")
+    parser.add_argument(
+        "destination",
+        type=Path,
+        nargs="?",
+        help="Destination root to rebuild (optional with --apply)",
+    )
     parser.add_argument(
         "--keep-sidecars",
         action="store_true",
@@ -22,19 +40,177 @@ def main() -> None:
         action="store_true",
         help="Delete empty directories after rebuild",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker threads for metadata extraction and moves (default: CPU count)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or update the metadata cache in the destination",
+    )
+    parser.add_argument(
+        "--no-progress",
+        action="store_true",
+        help="Do not print a live progress line to stderr",
+    )
+    parser.add_argument(
+        "--plan-only",
+        type=Path,
+        metavar="PLAN",
+        help="Write the computed plan to PLAN for review and exit without moving files",
+    )
+    parser.add_argument(
+        "--apply",
+        type=Path,
+        metavar="PLAN",
+        help="Execute a plan previously written with --plan-only",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Discard an unfinished rebuild journal and plan from scratch",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Record per-phase timings and counters; print them and append them to the log",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        metavar="FILE",
+        help="Record a Chrome trace (chrome://tracing, Perfetto) of the run to FILE",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="With --trace, also write cProfile stats per phase next to FILE",
+    )
     args = parser.parse_args()
 
+    if args.plan_only and args.apply:
+        raise SystemExit("--plan-only and --apply cannot be combined")
+    if args.jobs < 1:
+        raise SystemExit("--jobs must be at least 1")
+    if args.profile and not args.trace:
+        raise SystemExit("--profile requires --trace")
+    if args.apply:
+        if not args.apply.is_file():
+            raise SystemExit(f"Plan file not found: {args.apply}")
+        try:
+            planned = Path(read_plan_header(args.apply)["destination"])
+        except JournalError as exc:
+            raise SystemExit(str(exc)) from exc
+        if args.destination is None:
+            args.destination = planned
+        elif args.destination.resolve() != planned.resolve():
+            # The moves follow the plan; the journal, cache and log follow the argument.
+            raise SystemExit(
+                f"Plan {args.apply} is for {planned}, not {args.destination}; "
+                "omit DESTINATION or pass the planned one"
+            )
+    if args.destination is None:
+        parser.error("the following arguments are required: destination")
+
     destination = args.destination
     if not destination.exists() or not destination.is_dir():
         raise SystemExit(f"Destination is not a directory: {destination}")
 
-    log_path = make_log_path(destination)
-    summary = rebuild_destination(
-        destination,
-        log_path,
-        delete_sidecars=not args.keep_sidecars,
-        delete_empty_dirs=args.delete_empty_dirs,
-    )
+    if args.metrics:
+        METRICS.enable()
+    if args.trace:
+        start_trace(args.trace, args.profile)
+    bars: dict[str, ProgressLine] = {}
+
+    def progress_cb(phase: str, done: int, total: int | None) -> None:
+        if args.no_progress:
+            return
+        bar = bars.get(phase)
+        if bar is None:
+            for previous in bars.values():
+                previous.finish()
+            bars.clear()
+            bar = bars[phase] = ProgressLine(phase)
+        bar.update(done, total)
+
+    cache = None if args.no_cache else MetadataCache(default_cache_path(destination))
+    journal = RebuildJournal(default_journal_dir(destination))
+    if args.fresh:
+        journal.finish()
+    elif journal.pending() and not args.plan_only:
+        # apply_rebuild_plan refuses a journal left by a different plan.
+        if not args.apply or journal.origin() == str(args.apply.resolve()):
+            print(f"Resuming unfinished rebuild from {journal.directory}")
+    if cache:
+        cache.open()
+    # Only keep an index up to date that an import already built.
+    index_path = default_index_path(destination)
+    index = ContentIndex(index_path) if index_path.exists() and not args.plan_only else None
+    if index:
+        index.open()
+    log_path = None
+    try:
+        if args.plan_only:
+            summary = write_rebuild_plan(
+                destination,
+                args.plan_only,
+                delete_sidecars=not args.keep_sidecars,
+                jobs=args.jobs,
+                cache=cache,
+                progress_cb=progress_cb,
+            )
+        elif args.apply:
+            log_path = make_log_path(destination)
+            summary = apply_rebuild_plan(
+                args.apply,
+                log_path,
+                delete_empty_dirs=args.delete_empty_dirs,
+                jobs=args.jobs,
+                cache=cache,
+                progress_cb=progress_cb,
+                journal=journal,
+                index=index,
+            )
+        else:
+            log_path = make_log_path(destination)
+            summary = rebuild_destination(
+                destination,
+                log_path,
+                delete_sidecars=not args.keep_sidecars,
+                delete_empty_dirs=args.delete_empty_dirs,
+                jobs=args.jobs,
+                cache=cache,
+                progress_cb=progress_cb,
+                journal=journal,
+                index=index,
+            )
+    except JournalError as exc:
+        raise SystemExit(str(exc)) from exc
+    finally:
+        for bar in bars.values():
+            bar.finish()
+        if cache:
+            cache.close()
+        if index:
+            index.close()
+        if args.trace:
+            TRACER.stop()
+            TRACER.save(args.trace)
+            print(f"Trace: {args.trace} (dropped events: {TRACER.dropped})", file=sys.stderr)
+    if args.plan_only:
+        print(
+            "Plan written: "
+            f"total={summary.total_files} "
+            f"moved={summary.moved} "
+            f"skipped_same={summary.skipped_same_path} "
+            f"skipped_duplicates={summary.skipped_duplicates} "
+            f"plan={args.plan_only}"
+        )
+        _print_metrics(args)
+        return
     print(
         "Rebuild complete: "
         f"total={summary.total_files} "
@@ -44,6 +220,13 @@ def main() -> None:
         f"deleted_empty_dirs={summary.deleted_empty_dirs} "
         f"log={log_path}"
     )
+    _print_metrics(args)
+
+
+def _print_metrics(args: argparse.Namespace) -> None:
+    if args.metrics:
+        for line in format_metrics_report(METRICS.snapshot()):
+            print(line, file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import dataclasses
 from pathlib import Path
 
 import sys
@@ -9,25 +10,50 @@ import time
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
+from orgpicsvideos.core.cancel import CancelToken, OperationCancelled
+from orgpicsvideos.core.content_index import ContentIndex, default_index_path
 from orgpicsvideos.core.copier import execute_plan
+from orgpicsvideos.core.hashing import DuplicateFinder
 from orgpicsvideos.core.logger import (
     LogWriter,
     find_latest_log,
+    format_duration_line,
+    format_resume_summary,
+    format_scan_summary,
     load_successful_destinations,
     make_log_path,
 )
 from orgpicsvideos.core.planner import build_plan
 from orgpicsvideos.core.rebuild import build_sidecar_delete_ops
 from orgpicsvideos.core.scanner import scan_media
-from orgpicsvideos.core.types import Plan
+from orgpicsvideos.core.trace import TRACER, start_trace
+from orgpicsvideos.core.types import MediaFile, Plan
 from orgpicsvideos.core.validator import ValidationError, validate_paths
 
+from .existence import ExistenceProbe
+from .log_panel import LogPanel
+from .plan_index import PlanIndex
+from .plan_model import (
+    MODE_EXECUTION,
+    MODE_PLANNED,
+    ROLE_DESTINATION,
+    ROLE_KIND,
+    ROLE_SOURCE,
+    PlanTreeModel,
+)
+from .progress_state import ProgressSnapshot, ProgressState
+from .thumbnails import ThumbnailPane
+
+# How often the GUI applies worker progress (about 30 Hz).
+POLL_INTERVAL_MS = 33
+# Threads hashing files for the duplicate check during a scan.
+HASH_JOBS = 4
+
 
 class ScanWorker(QtCore.QObject):
     finished = QtCore.Signal(object)
     error = QtCore.Signal(str)
-    progress = QtCore.Signal(int, int)
-    current_dir = QtCore.Signal(str)
+    cancelled = QtCore.Signal()
 
     def __init__(
         self,
@@ -36,6 +62,10 @@ class ScanWorker(QtCore.QObject):
         skip_destinations: set[Path] | None = None,
         resume_enabled: bool = False,
         debug_path: Path | None = None,
+        state: ProgressState | None = None,
+        cancel: CancelToken | None = None,
+        compare_content: bool = True,
+        use_index: bool = True,
     ) -> None:
         super().__init__()
         self.source = source
@@ -43,6 +73,10 @@ class ScanWorker(QtCore.QObject):
         self.skip_destinations = skip_destinations or set()
         self.resume_enabled = resume_enabled
         self.debug_path = debug_path
+        self.compare_content = compare_content
+        self.use_index = use_index
+        self.state = state or ProgressState()
+        self.cancel = cancel or CancelToken()
         self._scan_start = 0.0
         self._scan_end = 0.0
 
@@ -52,6 +86,11 @@ class ScanWorker(QtCore.QObject):
             media_files = []
             pics = 0
             videos = 0
+            state = self.state
+
+            def on_dir(message: str) -> None:
+                state.current_dir = message
+
             self._mark_scan_start()
             if self.debug_path:
                 debug_path = self.debug_path
@@ -65,20 +104,16 @@ class ScanWorker(QtCore.QObject):
                         debug_log.flush()
 
                     log_cb("phase=scan_start")
-                    for media in scan_media(self.source, self.current_dir.emit, log_cb):
+                    for media in scan_media(self.source, on_dir, log_cb, cancel=self.cancel):
                         media_files.append(media)
                         if media.media_type.value == "image":
                             pics += 1
                         else:
                             videos += 1
-                        self.progress.emit(pics, videos)
+                        state.found = (pics, videos)
                     log_cb(f"phase=scan_end pics={pics} videos={videos}")
                     log_cb("phase=plan_start")
-                plan = build_plan(
-                    media_files,
-                    self.destination,
-                    skip_destinations=self.skip_destinations,
-                )
+                plan = self._build_plan(media_files)
                 with debug_path.open("a", encoding="utf-8") as debug_log:
                     debug_log.write(
                         "phase=plan_end "
@@ -89,25 +124,47 @@ class ScanWorker(QtCore.QObject):
                     )
             else:
                 # Fast path when debug logging is disabled.
-                for media in scan_media(self.source, self.current_dir.emit):
+                for media in scan_media(self.source, on_dir, cancel=self.cancel):
                     media_files.append(media)
                     if media.media_type.value == "image":
                         pics += 1
                     else:
                         videos += 1
-                    self.progress.emit(pics, videos)
-                plan = build_plan(
-                    media_files,
-                    self.destination,
-                    skip_destinations=self.skip_destinations,
-                )
+                    state.found = (pics, videos)
+                plan = self._build_plan(media_files)
             self._mark_scan_end()
             plan.scan_duration_seconds = self._scan_duration_seconds
             plan.resume_enabled = self.resume_enabled
             self.finished.emit(plan)
+        except OperationCancelled:
+            self.cancelled.emit()
         except Exception as exc:  # noqa: BLE001
             self.error.emit(str(exc))
 
+    def _build_plan(self, media_files: list[MediaFile]) -> Plan:
+        duplicates = None
+        index = None
+        if self.compare_content:
+            # Scanning must not create the destination; a new one has nothing to index.
+            if self.use_index and self.destination.is_dir():
+                index = ContentIndex(default_index_path(self.destination))
+                index.open()
+            duplicates = DuplicateFinder(jobs=HASH_JOBS, index=index)
+        try:
+            if index is not None and not index.populated:
+                self.state.current_dir = f"Indexing {self.destination}"
+                index.populate(self.destination, jobs=HASH_JOBS, cancel=self.cancel)
+            return build_plan(
+                media_files,
+                self.destination,
+                skip_destinations=self.skip_destinations,
+                cancel=self.cancel,
+                duplicates=duplicates,
+            )
+        finally:
+            if index is not None:
+                index.close()
+
     @property
     def _scan_duration_seconds(self) -> float:
         return max(0.0, self._scan_end - self._scan_start)
@@ -124,12 +181,9 @@ class ScanWorker(QtCore.QObject):
 
 
 class CopyWorker(QtCore.QObject):
-    progress = QtCore.Signal(int, int)
-    log = QtCore.Signal(str)
     finished = QtCore.Signal()
     error = QtCore.Signal(str)
-    counts = QtCore.Signal(int, int)
-    op_status = QtCore.Signal(str, str, bool)
+    cancelled = QtCore.Signal()
 
     def __init__(
         self,
@@ -137,21 +191,27 @@ class CopyWorker(QtCore.QObject):
         source: Path,
         destination: Path,
         debug_path: Path | None = None,
+        state: ProgressState | None = None,
+        cancel: CancelToken | None = None,
+        use_index: bool = True,
     ) -> None:
         super().__init__()
         self.plan = plan
         self.source = source
         self.destination = destination
         self.debug_path = debug_path
+        self.use_index = use_index
+        self.state = state or ProgressState()
+        self.cancel = cancel or CancelToken()
 
     @QtCore.Slot()
     def run(self) -> None:
         try:
             log_path = make_log_path(self.destination)
             with LogWriter(log_path, self.source, self.destination) as writer:
-                writer.write(_format_scan_summary(self.plan))
-                writer.write(_format_resume_summary(self.plan))
-                writer.write(_format_duration_line("Scan duration", self.plan.scan_duration_seconds))
+                writer.write(format_scan_summary(self.plan))
+                writer.write(format_resume_summary(self.plan))
+                writer.write(format_duration_line("Scan duration", self.plan.scan_duration_seconds))
 
                 debug_handle = None
                 if self.debug_path:
@@ -163,40 +223,70 @@ class CopyWorker(QtCore.QObject):
                 copy_start = time.monotonic()
                 pics_copied = 0
                 videos_copied = 0
+                op_index = 0
+                state = self.state
 
                 def log_cb(line: str) -> None:
                     writer.write(line)
-                    self.log.emit(line)
+                    state.add_log(line)
                     if debug_handle:
                         debug_handle.write(f"log {line}\n")
                         debug_handle.flush()
 
                 def progress_cb(done: int, total: int) -> None:
-                    self.progress.emit(done, total)
+                    state.progress = (done, total)
 
                 def op_cb(op, success: bool) -> None:  # type: ignore[no-untyped-def]
-                    nonlocal pics_copied, videos_copied
+                    nonlocal pics_copied, videos_copied, op_index
                     if debug_handle:
                         debug_handle.write(
                             f"op {op.op_type.value} success={success} dest={op.destination}\n"
                         )
                         debug_handle.flush()
-                    self.op_status.emit(op.op_type.value, str(op.destination), success)
+                    # Results arrive in plan order, so a running index identifies the op.
+                    state.add_op_result(op_index, success)
+                    op_index += 1
                     if op.op_type.value == "copy" and success:
                         if op.media_type and op.media_type.value == "image":
                             pics_copied += 1
                         elif op.media_type and op.media_type.value == "video":
                             videos_copied += 1
-                        self.counts.emit(pics_copied, videos_copied)
-
-                execute_plan(self.plan.operations, log_cb, progress_cb, op_cb)
+                        state.copied = (pics_copied, videos_copied)
+
+                cancelled = False
+                index = None
+                if self.use_index:
+                    index = ContentIndex(default_index_path(self.destination))
+                    index.open()
+                try:
+                    execute_plan(
+                        self.plan.operations,
+                        log_cb,
+                        progress_cb,
+                        op_cb,
+                        cancel=self.cancel,
+                        index=index,
+                    )
+                except OperationCancelled:
+                    # Every started operation has been logged, so a resume
+                    # scan picks up exactly where this run stopped.
+                    cancelled = True
+                    remaining = len(self.plan.operations) - op_index
+                    log_cb(f"COPY CANCELLED: completed={op_index} remaining={remaining}")
+                finally:
+                    if index is not None:
+                        index.close()
                 copy_duration = time.monotonic() - copy_start
-                writer.write(_format_duration_line("Copy duration", copy_duration))
+                writer.write(format_duration_line("Copy duration", copy_duration))
                 if debug_handle:
-                    debug_handle.write("copy_phase_end\n")
+                    phase = "copy_phase_cancelled" if cancelled else "copy_phase_end"
+                    debug_handle.write(f"{phase}\n")
                     debug_handle.flush()
                     debug_handle.close()
-            self.finished.emit()
+            if cancelled:
+                self.cancelled.emit()
+            else:
+                self.finished.emit()
         except Exception as exc:  # noqa: BLE001
             self.error.emit(str(exc))
 
@@ -211,8 +301,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self._scan_worker: ScanWorker | None = None
         self._copy_thread: QtCore.QThread | None = None
         self._copy_worker: CopyWorker | None = None
+        self._cancel_token: CancelToken | None = None
         self._current_debug_path: Path | None = None
+        self._current_trace_path: Path | None = None
         self._last_destination: Path | None = None
+        self._progress_state: ProgressState | None = None
+        self._applied: ProgressSnapshot | None = None
+        self._progress_timer = QtCore.QTimer(self)
+        self._progress_timer.setInterval(POLL_INTERVAL_MS)
+        self._progress_timer.timeout.connect(self._poll_progress)
 
         self.source_edit = QtWidgets.QLineEdit()
         self.source_edit.setReadOnly(True)
@@ -224,10 +321,20 @@ class MainWindow(QtWidgets.QMainWindow):
         self.scan_btn = QtWidgets.QPushButton("Scan")
         self.copy_btn = QtWidgets.QPushButton("Copy")
         self.copy_btn.setEnabled(False)
+        self.pause_btn = QtWidgets.QPushButton("Pause")
+        self.pause_btn.setEnabled(False)
+        self.cancel_btn = QtWidgets.QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
         self.resume_check = QtWidgets.QCheckBox("Resume from last run")
         self.resume_check.setChecked(False)
         self.debug_check = QtWidgets.QCheckBox("Enable debug log")
         self.debug_check.setChecked(False)
+        self.trace_check = QtWidgets.QCheckBox("Record trace")
+        self.trace_check.setChecked(False)
+        self.content_check = QtWidgets.QCheckBox("Compare file contents")
+        self.content_check.setChecked(True)
+        self.index_check = QtWidgets.QCheckBox("Index whole library")
+        self.index_check.setChecked(True)
         self.keep_sidecars_check = QtWidgets.QCheckBox("Keep macOS ._ sidecar files")
         self.keep_sidecars_check.setChecked(False)
         if sys.platform == "win32":
@@ -243,27 +350,25 @@ class MainWindow(QtWidgets.QMainWindow):
         self.legend_label = QtWidgets.QLabel(
             "Legend: Black = existing, Blue = new, Gray = skipped. Labels show status."
         )
-        self.structure_view = QtWidgets.QTreeWidget()
-        self.structure_view.setHeaderLabels(["Planned Structure"])
-        self.structure_view.setColumnCount(1)
-        self.structure_view.itemExpanded.connect(self._on_tree_expanded)
-        self.structure_view.itemDoubleClicked.connect(self._on_item_double_clicked)
+        self.structure_view = self._make_tree_view()
+        self.structure_view.expanded.connect(self._on_tree_expanded)
+        self._existence_probe = ExistenceProbe(parent=self)
+        self._existence_probe.results.connect(self._on_existence_results)
         self.exec_legend_label = QtWidgets.QLabel(
             "Execution Legend: Purple = pending, Orange = partial, Green = success, Red = failed, Black = existing"
         )
-        self.execution_view = QtWidgets.QTreeWidget()
-        self.execution_view.setHeaderLabels(["Execution Status"])
-        self.execution_view.setColumnCount(1)
-        self.execution_view.itemDoubleClicked.connect(self._on_item_double_clicked)
-        self._execution_node_map: dict[Path, QtWidgets.QTreeWidgetItem] = {}
-        self._execution_dir_totals: dict[Path, int] = {}
-        self._execution_dir_done: dict[Path, int] = {}
-        self._execution_dir_failed: set[Path] = set()
+        self.execution_view = self._make_tree_view()
+        self._plan_index: PlanIndex | None = None
+        self.structure_model: PlanTreeModel | None = None
+        self.execution_model: PlanTreeModel | None = None
+        # Operations prepended to the plan at copy time (sidecar deletes).
+        self._op_offset = 0
+        self.thumbnail_pane = ThumbnailPane()
+        self.thumbnail_pane.setMinimumHeight(120)
         self.progress = QtWidgets.QProgressBar()
         self.progress.setValue(0)
 
-        self.log_view = QtWidgets.QTextEdit()
-        self.log_view.setReadOnly(True)
+        self.log_view = LogPanel()
 
         form = QtWidgets.QFormLayout()
         form.addRow("Source", self._row(self.source_edit, self.source_btn))
@@ -272,8 +377,13 @@ class MainWindow(QtWidgets.QMainWindow):
         controls = QtWidgets.QHBoxLayout()
         controls.addWidget(self.scan_btn)
         controls.addWidget(self.copy_btn)
+        controls.addWidget(self.pause_btn)
+        controls.addWidget(self.cancel_btn)
         controls.addWidget(self.resume_check)
         controls.addWidget(self.debug_check)
+        controls.addWidget(self.trace_check)
+        controls.addWidget(self.content_check)
+        controls.addWidget(self.index_check)
         controls.addWidget(self.keep_sidecars_check)
         controls.addStretch(1)
 
@@ -286,7 +396,10 @@ class MainWindow(QtWidgets.QMainWindow):
         layout.addWidget(self.found_label)
         layout.addWidget(self.copied_label)
         layout.addWidget(self.legend_label)
-        layout.addWidget(self.structure_view)
+        trees = QtWidgets.QSplitter(QtCore.Qt.Vertical)
+        trees.addWidget(self.structure_view)
+        trees.addWidget(self.thumbnail_pane)
+        layout.addWidget(trees)
         layout.addWidget(self.exec_legend_label)
         layout.addWidget(self.execution_view)
         layout.addWidget(self.progress)
@@ -300,6 +413,20 @@ class MainWindow(QtWidgets.QMainWindow):
         self.dest_btn.clicked.connect(self.select_destination)
         self.scan_btn.clicked.connect(self.scan)
         self.copy_btn.clicked.connect(self.copy)
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        self.cancel_btn.clicked.connect(self.cancel)
+
+    def _make_tree_view(self) -> QtWidgets.QTreeView:
+        view = QtWidgets.QTreeView()
+        view.setHeaderHidden(True)
+        view.setUniformRowHeights(True)
+        view.doubleClicked.connect(self._on_item_double_clicked)
+        return view
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        self.thumbnail_pane.loader.shutdown()
+        self._existence_probe.shutdown()
+        super().closeEvent(event)
 
     def _row(self, field: QtWidgets.QLineEdit, button: QtWidgets.QPushButton) -> QtWidgets.QWidget:
         row = QtWidgets.QWidget()
@@ -358,6 +485,10 @@ class MainWindow(QtWidgets.QMainWindow):
             self._set_debug_path(None)
             self._current_debug_path = None
 
+        self._current_trace_path = None
+        if self.trace_check.isChecked():
+            self._start_trace(destination)
+
         skip_destinations = self._load_resume_destinations(source, destination)
         if self.debug_check.isChecked():
             self._append_debug(f"phase=resume_loaded skipped={len(skip_destinations)}")
@@ -367,6 +498,10 @@ class MainWindow(QtWidgets.QMainWindow):
             skip_destinations=skip_destinations,
             resume_enabled=self.resume_check.isChecked(),
             debug_path=debug_path,
+            state=self._start_polling(),
+            cancel=self._new_cancel_token(),
+            compare_content=self.content_check.isChecked(),
+            use_index=self.index_check.isChecked(),
         )
         thread = QtCore.QThread(self)
         self._scan_thread = thread
@@ -375,17 +510,17 @@ class MainWindow(QtWidgets.QMainWindow):
         thread.started.connect(worker.run)
         worker.finished.connect(self._scan_finished)
         worker.error.connect(self._worker_error)
-        worker.progress.connect(self._scan_progress)
-        worker.current_dir.connect(self._scan_current_dir)
-        worker.finished.connect(thread.quit)
-        worker.error.connect(thread.quit)
-        worker.finished.connect(worker.deleteLater)
-        worker.error.connect(worker.deleteLater)
+        worker.cancelled.connect(self._scan_cancelled)
+        for signal in (worker.finished, worker.error, worker.cancelled):
+            signal.connect(thread.quit)
+            signal.connect(worker.deleteLater)
         thread.finished.connect(thread.deleteLater)
         thread.finished.connect(self._clear_scan_refs)
         thread.start()
 
     def _scan_finished(self, plan: object) -> None:
+        self._stop_polling()
+        self._save_trace()
         self.plan = plan  # type: ignore[assignment]
         assert isinstance(self.plan, Plan)
         self.copy_btn.setEnabled(self.plan.total_files > 0)
@@ -433,76 +568,146 @@ class MainWindow(QtWidgets.QMainWindow):
 
         if self.debug_check.isChecked():
             self._append_debug("phase=copy_requested")
+        if self.trace_check.isChecked():
+            if self._current_trace_path is None:
+                self._start_trace(destination)
+            else:
+                # Scan and copy share one timeline.
+                TRACER.resume()
         debug_path = self._current_debug_path if self.debug_check.isChecked() else None
         plan = self.plan
+        self._op_offset = 0
         if not self.keep_sidecars_check.isChecked():
             sidecar_ops = build_sidecar_delete_ops(destination)
             if sidecar_ops:
                 # Prepend delete ops so destination is cleaned before copy.
-                plan = Plan(
-                    operations=sidecar_ops + plan.operations,
-                    directories=plan.directories,
-                    skipped_files=plan.skipped_files,
-                    total_files=plan.total_files,
-                    total_dirs=plan.total_dirs,
-                    total_images=plan.total_images,
-                    total_videos=plan.total_videos,
-                    total_found=plan.total_found,
-                    total_skipped=plan.total_skipped,
-                    skipped_resume=plan.skipped_resume,
-                    skipped_duplicates=plan.skipped_duplicates,
-                    scan_duration_seconds=plan.scan_duration_seconds,
-                    resume_enabled=plan.resume_enabled,
-                )
-        worker = CopyWorker(plan, source, destination, debug_path=debug_path)
+                self._op_offset = len(sidecar_ops)
+                plan = dataclasses.replace(plan, operations=sidecar_ops + plan.operations)
+        worker = CopyWorker(
+            plan,
+            source,
+            destination,
+            debug_path=debug_path,
+            state=self._start_polling(),
+            cancel=self._new_cancel_token(),
+            use_index=self.index_check.isChecked(),
+        )
         thread = QtCore.QThread(self)
         self._copy_thread = thread
         self._copy_worker = worker
         worker.moveToThread(thread)
         thread.started.connect(worker.run)
-        worker.progress.connect(self._copy_progress)
-        worker.counts.connect(self._copy_counts)
-        worker.op_status.connect(self._on_op_status)
-        worker.log.connect(self._append_log)
         worker.finished.connect(self._copy_finished)
         worker.error.connect(self._worker_error)
-        worker.finished.connect(thread.quit)
-        worker.error.connect(thread.quit)
-        worker.finished.connect(worker.deleteLater)
-        worker.error.connect(worker.deleteLater)
+        worker.cancelled.connect(self._copy_cancelled)
+        for signal in (worker.finished, worker.error, worker.cancelled):
+            signal.connect(thread.quit)
+            signal.connect(worker.deleteLater)
         thread.finished.connect(thread.deleteLater)
         thread.finished.connect(self._clear_copy_refs)
         thread.start()
 
-    def _copy_progress(self, done: int, total: int) -> None:
-        self.progress.setRange(0, total)
-        self.progress.setValue(done)
+    def _new_cancel_token(self) -> CancelToken:
+        self._cancel_token = CancelToken()
+        self.pause_btn.setText("Pause")
+        return self._cancel_token
 
-    def _copy_counts(self, pics: int, videos: int) -> None:
-        self._set_copied_counts(pics, videos)
+    def cancel(self) -> None:
+        if self._cancel_token is None:
+            return
+        self._cancel_token.cancel()
+        self.pause_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(False)
+        self.stats_label.setText("Cancelling...")
+
+    def toggle_pause(self) -> None:
+        token = self._cancel_token
+        if token is None:
+            return
+        if token.paused:
+            token.resume()
+            self.pause_btn.setText("Pause")
+            self.stats_label.setText("Resumed.")
+        else:
+            token.pause()
+            self.pause_btn.setText("Resume")
+            self.stats_label.setText("Paused.")
+
+    def _scan_cancelled(self) -> None:
+        self._stop_polling()
+        self._save_trace()
+        self._set_busy(False, "Scan cancelled.")
+        self._set_scan_dir("Current Dir - (idle)")
+
+    def _copy_cancelled(self) -> None:
+        self._stop_polling()
+        self._save_trace()
+        # The log lists every finished operation; resume skips them next time.
+        self.resume_check.setChecked(True)
+        self._set_busy(False, "Copy cancelled. Scan again with resume to continue.")
+        self._set_scan_dir("Current Dir - (idle)")
+        if not self.debug_check.isChecked():
+            self._current_debug_path = None
+
+    def _start_polling(self) -> ProgressState:
+        state = ProgressState()
+        self._progress_state = state
+        self._applied = None
+        self._progress_timer.start()
+        return state
+
+    def _stop_polling(self) -> None:
+        # Workers publish before signalling completion, so one last poll
+        # applies everything they reported.
+        self._progress_timer.stop()
+        self._poll_progress()
+        self._progress_state = None
+
+    def _poll_progress(self) -> None:
+        if self._progress_state is None:
+            return
+        with TRACER.span("poll", "ui"):
+            self._apply_progress(self._progress_state.drain())
+
+    def _apply_progress(self, snapshot: ProgressSnapshot) -> None:
+        applied = self._applied
+        if snapshot.found is not None and (applied is None or snapshot.found != applied.found):
+            self._set_found_counts(*snapshot.found)
+        if snapshot.copied is not None and (applied is None or snapshot.copied != applied.copied):
+            self._set_copied_counts(*snapshot.copied)
+        if snapshot.progress is not None and (
+            applied is None or snapshot.progress != applied.progress
+        ):
+            done, total = snapshot.progress
+            self.progress.setRange(0, total)
+            self.progress.setValue(done)
+        if snapshot.current_dir is not None and (
+            applied is None or snapshot.current_dir != applied.current_dir
+        ):
+            self._set_scan_dir(snapshot.current_dir)
+        if snapshot.log_lines:
+            self.log_view.append_lines(snapshot.log_lines)
+        if snapshot.op_results:
+            self._apply_op_results(snapshot.op_results)
+        self._applied = snapshot
 
     def _copy_finished(self) -> None:
+        self._stop_polling()
+        self._save_trace()
         self._set_busy(False, "Copy complete.")
         self._set_scan_dir("Current Dir - (idle)")
         if not self.debug_check.isChecked():
             self._current_debug_path = None
 
     def _worker_error(self, message: str) -> None:
+        self._stop_polling()
+        self._save_trace()
         self._set_busy(False, "Error")
         self._set_scan_dir("Current Dir - (idle)")
         if not self.debug_check.isChecked():
             self._current_debug_path = None
         self._error(message)
 
-    def _append_log(self, line: str) -> None:
-        self.log_view.append(line)
-
-    def _scan_progress(self, pics: int, videos: int) -> None:
-        self._set_found_counts(pics, videos)
-
-    def _scan_current_dir(self, message: str) -> None:
-        self._set_scan_dir(message)
-
     def _set_busy(self, busy: bool, status: str) -> None:
         self.scan_btn.setEnabled(not busy)
         self.copy_btn.setEnabled(not busy and self.plan is not None and self.plan.total_files > 0)
@@ -510,7 +715,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self.dest_btn.setEnabled(not busy)
         self.resume_check.setEnabled(not busy)
         self.debug_check.setEnabled(not busy)
+        self.trace_check.setEnabled(not busy)
+        self.content_check.setEnabled(not busy)
+        self.index_check.setEnabled(not busy)
         self.keep_sidecars_check.setEnabled(not busy)
+        self.pause_btn.setEnabled(busy)
+        self.cancel_btn.setEnabled(busy)
+        if not busy:
+            self._cancel_token = None
+            self.pause_btn.setText("Pause")
         if busy:
             self.progress.setRange(0, 0)
         self.stats_label.setText(status)
@@ -545,6 +758,23 @@ class MainWindow(QtWidgets.QMainWindow):
         stamp = QtCore.QDateTime.currentDateTime().toString("yyyyMMdd_HHmmss")
         return destination / f"debug_{stamp}.log"
 
+    def _start_trace(self, destination: Path) -> None:
+        stamp = QtCore.QDateTime.currentDateTime().toString("yyyyMMdd_HHmmss")
+        self._current_trace_path = destination / f"trace_{stamp}.json"
+        start_trace(self._current_trace_path)
+
+    def _save_trace(self) -> None:
+        # Saved after each phase; a copy resumes the scan's trace and rewrites the file.
+        if self._current_trace_path is None or not TRACER.enabled:
+            return
+        TRACER.stop()
+        try:
+            TRACER.save(self._current_trace_path)
+        except OSError:
+            # Like the debug log, a failed trace must not affect the run.
+            return
+        self.log_view.append_lines([f"Trace written: {self._current_trace_path}"])
+
     def _append_debug(self, message: str) -> None:
         if not self._current_debug_path:
             return
@@ -555,298 +785,87 @@ class MainWindow(QtWidgets.QMainWindow):
             # Debug log failures should not affect normal operation.
             return
 
-    def _on_op_status(self, op_type: str, dest: str, success: bool) -> None:
-        path = Path(dest)
-        item = self._execution_node_map.get(path)
-        if op_type == "mkdir":
-            self._update_dir_status(path, success)
-            return
-        if not item:
+    def _apply_op_results(self, results: list[tuple[int, bool]]) -> None:
+        if self.execution_model is None:
             return
-        if item.data(0, QtCore.Qt.UserRole + 1) is True:
-            return
-        # Only update items that are actually planned for execution.
-        status = "success" if success else "failed"
-        base_name = item.text(0).split(" (", 1)[0]
-        item.setText(0, f"{base_name} ({status})")
-        color = QtGui.QColor("#1f9d4c") if success else QtGui.QColor("#d33")
-        item.setForeground(0, QtGui.QBrush(color))
-        item.setToolTip(0, str(path))
-        if op_type == "copy":
-            self._update_dir_progress(path.parent, success)
+        for index, success in results:
+            index -= self._op_offset
+            if index >= 0:
+                self.execution_model.set_operation_status(index, success)
+        self.execution_model.flush_status()
 
     def _populate_structure_tree(self, plan: Plan, destination_root: Path | None) -> None:
         # Planned structure tree is a static preview: existing/new/skip status.
-        self.structure_view.clear()
-        if not destination_root:
-            return
-        root_item = QtWidgets.QTreeWidgetItem([str(destination_root)])
-        root_item.setData(0, QtCore.Qt.UserRole, "dir")
-        root_item.setToolTip(0, str(destination_root))
-        root_item.setIcon(0, self._folder_icon())
-        self.structure_view.addTopLevelItem(root_item)
-
-        node_map: dict[tuple[str, ...], QtWidgets.QTreeWidgetItem] = {(): root_item}
-        for planned_dir in plan.directories:
-            try:
-                relative = planned_dir.path.relative_to(destination_root)
-            except ValueError:
-                relative = planned_dir.path
-            parts = tuple(relative.parts)
-            for idx in range(1, len(parts) + 1):
-                key = parts[:idx]
-                if key in node_map:
-                    continue
-                parent_key = parts[: idx - 1]
-                parent = node_map[parent_key]
-                base_name = parts[idx - 1]
-                node = QtWidgets.QTreeWidgetItem([base_name])
-                parent.addChild(node)
-                node_map[key] = node
-                full_path = destination_root.joinpath(*key)
-                node.setData(0, QtCore.Qt.UserRole, "dir")
-                node.setToolTip(0, str(full_path))
-                self._apply_dir_style(node, full_path)
-            leaf = node_map[parts]
-            leaf.setToolTip(0, str(planned_dir.path))
-
-        for op in plan.operations:
-            if op.op_type.value != "copy" or not op.source:
-                continue
-            try:
-                relative_dir = op.destination.parent.relative_to(destination_root)
-            except ValueError:
-                relative_dir = op.destination.parent
-            key = tuple(relative_dir.parts)
-            parent = node_map.get(key)
-            if not parent:
-                continue
-            file_item = QtWidgets.QTreeWidgetItem([f"{op.destination.name} (copy)"])
-            file_item.setToolTip(0, str(op.destination))
-            file_item.setData(0, QtCore.Qt.UserRole, "file")
-            file_item.setData(0, QtCore.Qt.UserRole + 2, str(op.source))
-            file_item.setData(0, QtCore.Qt.UserRole + 3, str(op.destination))
-            file_item.setForeground(0, QtGui.QBrush(QtGui.QColor("#2b6cff")))
-            file_item.setIcon(0, self._file_icon())
-            parent.addChild(file_item)
-
-        for skipped in plan.skipped_files:
-            try:
-                relative_dir = skipped.destination.parent.relative_to(destination_root)
-            except ValueError:
-                relative_dir = skipped.destination.parent
-            key = tuple(relative_dir.parts)
-            parent = node_map.get(key)
-            if not parent:
-                continue
-            label = f"{skipped.destination.name} (skipped: {skipped.reason.value})"
-            file_item = QtWidgets.QTreeWidgetItem([label])
-            file_item.setToolTip(0, str(skipped.destination))
-            file_item.setData(0, QtCore.Qt.UserRole, "skipped")
-            file_item.setData(0, QtCore.Qt.UserRole + 2, str(skipped.source))
-            file_item.setData(0, QtCore.Qt.UserRole + 3, str(skipped.destination))
-            file_item.setForeground(0, QtGui.QBrush(QtGui.QColor("#777")))
-            file_item.setIcon(0, self._file_icon())
-            parent.addChild(file_item)
-
-        root_item.setExpanded(True)
-
-    def _apply_dir_style(self, item: QtWidgets.QTreeWidgetItem, path: Path) -> None:
-        exists = path.exists()
-        base_name = item.text(0).split(" (", 1)[0]
-        status = "existing" if exists else "new"
-        item.setText(0, f"{base_name} ({status})")
-        color = QtGui.QColor("#000") if exists else QtGui.QColor("#2b6cff")
-        item.setForeground(0, QtGui.QBrush(color))
-        item.setIcon(0, self._folder_icon())
-
-    def _on_tree_expanded(self, item: QtWidgets.QTreeWidgetItem) -> None:
-        if item.data(0, QtCore.Qt.UserRole) != "dir":
-            return
-        if item.parent() is None:
-            return
-        tooltip = item.toolTip(0)
-        if tooltip:
-            self._apply_dir_style(item, Path(tooltip))
-        for idx in range(item.childCount()):
-            child = item.child(idx)
-            if child.data(0, QtCore.Qt.UserRole) == "dir":
-                tooltip = child.toolTip(0)
-                if tooltip:
-                    self._apply_dir_style(child, Path(tooltip))
-
-    def _folder_icon(self) -> QtGui.QIcon:
-        return QtWidgets.QApplication.style().standardIcon(QtWidgets.QStyle.SP_DirIcon)
-
-    def _file_icon(self) -> QtGui.QIcon:
-        return QtWidgets.QApplication.style().standardIcon(QtWidgets.QStyle.SP_FileIcon)
+        self.structure_model = self._set_tree_model(
+            self.structure_view, plan, destination_root, MODE_PLANNED
+        )
 
     def _populate_execution_tree(self, plan: Plan, destination_root: Path | None) -> None:
         # Execution tree mirrors planned work and updates live as operations finish.
-        self.execution_view.clear()
-        self._execution_node_map.clear()
-        self._execution_dir_totals.clear()
-        self._execution_dir_done.clear()
-        self._execution_dir_failed.clear()
-        if not destination_root:
-            return
+        self.execution_model = self._set_tree_model(
+            self.execution_view, plan, destination_root, MODE_EXECUTION
+        )
 
-        root_item = QtWidgets.QTreeWidgetItem([str(destination_root)])
-        root_item.setToolTip(0, str(destination_root))
-        root_item.setIcon(0, self._folder_icon())
-        self.execution_view.addTopLevelItem(root_item)
-
-        node_map: dict[tuple[str, ...], QtWidgets.QTreeWidgetItem] = {(): root_item}
-        copy_sources: dict[Path, Path] = {}
-        for op in plan.operations:
-            if op.op_type.value == "copy" and op.source:
-                copy_sources[op.destination] = op.source
-                self._increment_dir_totals(op.destination.parent, destination_root)
-        for planned_dir in plan.directories:
-            try:
-                relative = planned_dir.path.relative_to(destination_root)
-            except ValueError:
-                relative = planned_dir.path
-            parts = tuple(relative.parts)
-            for idx in range(1, len(parts) + 1):
-                key = parts[:idx]
-                if key in node_map:
-                    continue
-                parent_key = parts[: idx - 1]
-                parent = node_map[parent_key]
-                node = QtWidgets.QTreeWidgetItem([parts[idx - 1]])
-                parent.addChild(node)
-                node_map[key] = node
-                full_path = destination_root.joinpath(*key)
-                node.setData(0, QtCore.Qt.UserRole, "dir")
-                node.setToolTip(0, str(full_path))
-                if self._execution_dir_totals.get(full_path, 0) == 0 and full_path.exists():
-                    status = "existing"
-                else:
-                    status = "pending"
-                self._set_execution_status(node, full_path, status, is_dir=True)
-
-        for op in plan.operations:
-            if op.op_type.value == "mkdir":
-                continue
-
-            if op.op_type.value != "copy" or not op.source:
-                continue
-            try:
-                relative_dir = op.destination.parent.relative_to(destination_root)
-            except ValueError:
-                relative_dir = op.destination.parent
-            key = tuple(relative_dir.parts)
-            parent = node_map.get(key)
-            if not parent:
-                continue
-            file_item = QtWidgets.QTreeWidgetItem([op.destination.name])
-            parent.addChild(file_item)
-            file_item.setData(0, QtCore.Qt.UserRole, "file")
-            file_item.setData(0, QtCore.Qt.UserRole + 2, str(op.source))
-            file_item.setData(0, QtCore.Qt.UserRole + 3, str(op.destination))
-            self._set_execution_status(file_item, op.destination, "pending", is_dir=False)
-
-        root_item.setExpanded(True)
-
-    def _set_execution_status(
+    def _set_tree_model(
         self,
-        item: QtWidgets.QTreeWidgetItem,
-        path: Path,
-        status: str,
-        is_dir: bool,
-    ) -> None:
-        # Execution tree status mapping:
-        # pending (purple), partial (orange), success (green), failed (red), existing (black).
-        base_name = item.text(0).split(" (", 1)[0]
-        item.setText(0, f"{base_name} ({status})")
-        item.setToolTip(0, str(path))
-        if status == "pending":
-            color = QtGui.QColor("#7a3df0")
-        elif status == "partial":
-            color = QtGui.QColor("#f08c2e")
-        elif status == "success":
-            color = QtGui.QColor("#1f9d4c")
-        elif status == "existing":
-            color = QtGui.QColor("#000")
-            item.setData(0, QtCore.Qt.UserRole + 1, True)
-        else:
-            color = QtGui.QColor("#d33")
-        item.setForeground(0, QtGui.QBrush(color))
-        item.setIcon(0, self._folder_icon() if is_dir else self._file_icon())
-        self._execution_node_map[path] = item
-
-    def _increment_dir_totals(self, path: Path, root: Path) -> None:
-        current = path
-        while True:
-            self._execution_dir_totals[current] = self._execution_dir_totals.get(current, 0) + 1
-            if current == root:
-                break
-            current = current.parent
-            try:
-                current.relative_to(root)
-            except ValueError:
-                break
-
-    def _update_dir_progress(self, path: Path, success: bool) -> None:
-        if not self._last_destination:
-            return
-        current = path
-        while True:
-            if success:
-                self._execution_dir_done[current] = self._execution_dir_done.get(current, 0) + 1
-            else:
-                self._execution_dir_failed.add(current)
-            self._refresh_dir_status(current)
-            if current == self._last_destination:
-                break
-            current = current.parent
-            try:
-                current.relative_to(self._last_destination)
-            except ValueError:
-                break
-
-    def _refresh_dir_status(self, path: Path) -> None:
-        item = self._execution_node_map.get(path)
-        if not item or item.data(0, QtCore.Qt.UserRole + 1) is True:
+        view: QtWidgets.QTreeView,
+        plan: Plan,
+        destination_root: Path | None,
+        mode: str,
+    ) -> PlanTreeModel | None:
+        previous = view.model()
+        model = None
+        if destination_root:
+            model = PlanTreeModel(self._plan_index_for(plan, destination_root), mode, parent=self)
+        view.setModel(model)
+        if previous is not None:
+            previous.deleteLater()
+        view.selectionModel().selectionChanged.connect(
+            lambda *_: self._on_tree_selection(view)
+        )
+        if model is not None:
+            view.expand(model.index(0, 0))
+        return model
+
+    def _plan_index_for(self, plan: Plan, destination_root: Path) -> PlanIndex:
+        # Both trees show the same plan; build the index once.
+        index = self._plan_index
+        if index is None or index.plan is not plan or index.root != destination_root:
+            index = PlanIndex(plan, destination_root)
+            self._plan_index = index
+        return index
+
+    def _on_tree_expanded(self, index: QtCore.QModelIndex) -> None:
+        if self.structure_model is None or not index.parent().isValid():
             return
-        total = self._execution_dir_totals.get(path, 0)
-        done = self._execution_dir_done.get(path, 0)
-        failed = path in self._execution_dir_failed
-        if total == 0 and path.exists():
-            status = "existing"
-        elif failed:
-            status = "failed"
-        elif done == 0:
-            status = "pending"
-        elif done < total:
-            status = "partial"
-        else:
-            status = "success"
-        self._set_execution_status(item, path, status, is_dir=True)
+        # Re-check existence off the GUI thread; results restyle the folders.
+        self._existence_probe.request(self.structure_model.child_dir_paths(index))
 
-    def _update_dir_status(self, path: Path, success: bool) -> None:
-        if not self._last_destination:
+    def _on_existence_results(self, results: dict[Path, bool]) -> None:
+        if self.structure_model is not None:
+            self.structure_model.update_existence(results)
+
+    def _on_tree_selection(self, view: QtWidgets.QTreeView) -> None:
+        # Preview selected files; a selected folder previews the files directly in it.
+        model = view.model()
+        if not isinstance(model, PlanTreeModel):
             return
-        current = path
-        while True:
-            if not success:
-                self._execution_dir_failed.add(current)
-            self._refresh_dir_status(current)
-            if current == self._last_destination:
-                break
-            current = current.parent
-            try:
-                current.relative_to(self._last_destination)
-            except ValueError:
-                break
-
-    def _on_item_double_clicked(self, item: QtWidgets.QTreeWidgetItem) -> None:
-        role = item.data(0, QtCore.Qt.UserRole)
+        paths: list[Path] = []
+        for index in view.selectionModel().selectedIndexes():
+            if index.data(ROLE_KIND) == "dir":
+                paths.extend(model.file_sources(index))
+            else:
+                source = index.data(ROLE_SOURCE)
+                if source:
+                    paths.append(Path(source))
+        self.thumbnail_pane.set_paths(paths)
+
+    def _on_item_double_clicked(self, index: QtCore.QModelIndex) -> None:
+        role = index.data(ROLE_KIND)
         if role not in {"file", "skipped"}:
             return
-        source_text = item.data(0, QtCore.Qt.UserRole + 2)
-        dest_text = item.data(0, QtCore.Qt.UserRole + 3)
+        source_text = index.data(ROLE_SOURCE)
+        dest_text = index.data(ROLE_DESTINATION)
         open_path = None
         if dest_text:
             dest = Path(dest_text)
@@ -856,22 +875,6 @@ class MainWindow(QtWidgets.QMainWindow):
             open_path = Path(source_text)
         if open_path and open_path.exists():
             QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(str(open_path)))
-    def _update_dir_status(self, path: Path, success: bool) -> None:
-        if not self._last_destination:
-            return
-        status = "success" if success else "failed"
-        current = path
-        while True:
-            item = self._execution_node_map.get(current)
-            if item and item.data(0, QtCore.Qt.UserRole + 1) is not True:
-                self._set_execution_status(item, current, status, is_dir=True)
-            if current == self._last_destination:
-                break
-            try:
-                current = current.parent
-                current.relative_to(self._last_destination)
-            except ValueError:
-                break
 
     def _load_resume_destinations(self, source: Path, destination: Path) -> set[Path]:
         if not self.resume_check.isChecked():
@@ -898,32 +901,3 @@ def run() -> None:
     window.show()
     app.exec()
 
-
-def _format_scan_summary(plan: Plan) -> str:
-    return (
-        "SCAN SUMMARY: "
-        f"found={plan.total_found} "
-        f"images={plan.total_images} "
-        f"videos={plan.total_videos} "
-        f"to_copy={plan.total_files} "
-        f"skipped={plan.total_skipped} "
-        f"dirs={plan.total_dirs}"
-    )
-
-
-def _format_resume_summary(plan: Plan) -> str:
-    enabled = "yes" if plan.resume_enabled else "no"
-    return (
-        "RESUME: "
-        f"enabled={enabled} "
-        f"skipped_resume={plan.skipped_resume} "
-        f"skipped_duplicates={plan.skipped_duplicates}"
-    )
-
-
-def _format_duration_line(label: str, seconds: float) -> str:
-    total_seconds = int(round(seconds))
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
-    return f"{label}: {hours:02d}:{minutes:02d}:{secs:02d}"
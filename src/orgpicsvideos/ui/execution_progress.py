@@ -0,0 +1,86 @@
+"""Incremental per-directory status for the execution tree."""
+
+from __future__ import annotations
+
+from array import array
+
+from orgpicsvideos.core.plan_table import PlanTable
+from orgpicsvideos.core.types import OperationType
+
+from .plan_index import PlanIndex
+
+FILE_PENDING = 0
+FILE_SUCCESS = 1
+FILE_FAILED = 2
+
+FILE_STATUS_NAMES = ("pending", "success", "failed")
+
+
+class ExecutionProgress:
+    """Integer counters updated per operation and read once per UI tick.
+
+    ``record`` touches only the precomputed ancestor ids of the affected
+    directory and marks them dirty; statuses are derived from the counters
+    when the view asks for them, without touching the filesystem.
+    """
+
+    def __init__(self, index: PlanIndex) -> None:
+        self.index = index
+        self.total = index.copy_totals()
+        self.done = array("l", [0]) * index.dir_count
+        self.failed = array("l", [0]) * index.dir_count
+        self.file_status = bytearray(index.file_total)
+        self._dirty_dirs: set[int] = set()
+        self._dirty_files: list[int] = []
+
+    def record(self, op_index: int, success: bool) -> None:
+        """Record the result of ``plan.operations[op_index]``."""
+
+        index = self.index
+        operations = index.plan.operations
+        # Runs on the GUI thread per result; a PlanTable answers from its columns.
+        if isinstance(operations, PlanTable):
+            op_type = operations.op_type(op_index)
+        else:
+            op_type = operations[op_index].op_type
+        if op_type == OperationType.MKDIR:
+            dir_id = index.dir_id(operations[op_index].destination)
+            if dir_id is not None and not success:
+                self._bump(dir_id, done=0, failed=1)
+            return
+        row = index.op_rows[op_index]
+        if row < 0 or self.file_status[row] != FILE_PENDING:
+            return
+        self.file_status[row] = FILE_SUCCESS if success else FILE_FAILED
+        self._dirty_files.append(row)
+        self._bump(index.file_dir[row], done=1 if success else 0, failed=0 if success else 1)
+
+    def _bump(self, dir_id: int, done: int, failed: int) -> None:
+        for ancestor in self.index.dir_ancestors[dir_id]:
+            self.done[ancestor] += done
+            self.failed[ancestor] += failed
+            self._dirty_dirs.add(ancestor)
+
+    def take_dirty(self) -> tuple[set[int], list[int]]:
+        """Return and reset the directories and file rows changed since the last call."""
+
+        dirs, files = self._dirty_dirs, self._dirty_files
+        self._dirty_dirs = set()
+        self._dirty_files = []
+        return dirs, files
+
+    def dir_status(self, dir_id: int) -> str:
+        total = self.total[dir_id]
+        if total == 0 and self.index.dir_exists[dir_id]:
+            return "existing"
+        if self.failed[dir_id]:
+            return "failed"
+        done = self.done[dir_id]
+        if done == 0:
+            return "pending"
+        if done < total:
+            return "partial"
+        return "success"
+
+    def file_status_name(self, row: int) -> str:
+        return FILE_STATUS_NAMES[self.file_status[row]]
@@ -0,0 +1,86 @@
+"""Off-thread directory existence checks for the planned tree."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+import time
+from typing import Iterable
+
+from PySide6 import QtCore
+
+
+class ExistenceProbe(QtCore.QObject):
+    """Check directory existence on a background thread and cache the answers.
+
+    ``results`` delivers ``{path: exists}`` on the GUI thread. Answers younger
+    than ``max_age`` seconds are served from the cache without a new probe, so
+    expanding and collapsing a folder does not hit a slow destination again.
+    """
+
+    results = QtCore.Signal(object)
+    _failed = QtCore.Signal(object)
+
+    def __init__(self, max_age: float = 10.0, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.max_age = max_age
+        self._cache: dict[Path, tuple[bool, float]] = {}
+        self._pending: set[Path] = set()
+        self._pool: ThreadPoolExecutor | None = None
+        self.results.connect(self._store)
+        self._failed.connect(self._forget)
+
+    def request(self, paths: Iterable[Path]) -> None:
+        now = time.monotonic()
+        cached: dict[Path, bool] = {}
+        missing: list[Path] = []
+        for path in paths:
+            entry = self._cache.get(path)
+            if entry is not None and now - entry[1] < self.max_age:
+                cached[path] = entry[0]
+            elif path not in self._pending:
+                missing.append(path)
+        if cached:
+            self.results.emit(cached)
+        if missing:
+            self._pending.update(missing)
+            future = self._executor().submit(_probe, missing)
+            future.add_done_callback(lambda done, paths=missing: self._on_done(paths, done))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="exists")
+        return self._pool
+
+    def _on_done(self, paths: list[Path], future: Future[dict[Path, bool]]) -> None:
+        # Runs on the pool thread; the queued signal hops to the GUI thread.
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            # Unknown is not "missing": forget the request so it is probed again.
+            self._failed.emit(paths)
+            return
+        self.results.emit(future.result())
+
+    @QtCore.Slot(object)
+    def _store(self, results: dict[Path, bool]) -> None:
+        now = time.monotonic()
+        for path, exists in results.items():
+            self._cache[path] = (exists, now)
+            self._pending.discard(path)
+
+    @QtCore.Slot(object)
+    def _forget(self, paths: list[Path]) -> None:
+        self._pending.difference_update(paths)
+
+
+def _probe(paths: list[Path]) -> dict[Path, bool]:
+    return {path: path.is_dir() for path in paths}
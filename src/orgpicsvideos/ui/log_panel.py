@@ -0,0 +1,73 @@
+"""Bounded log panel for the GUI."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable
+
+from PySide6 import QtGui, QtWidgets
+
+DEFAULT_CAPACITY = 10_000
+
+
+def is_failure(line: str) -> bool:
+    return "[FAIL]" in line
+
+
+class LogPanel(QtWidgets.QWidget):
+    """Show the most recent log lines, optionally only failures.
+
+    Lines are kept in a fixed-size ring buffer and the text widget is capped
+    at the same number of blocks, so memory and append cost stay flat however
+    long the run is. The complete log is on disk via ``LogWriter``.
+    """
+
+    def __init__(
+        self, capacity: int = DEFAULT_CAPACITY, parent: QtWidgets.QWidget | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.capacity = capacity
+        self._lines: deque[str] = deque(maxlen=capacity)
+
+        self.view = QtWidgets.QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setMaximumBlockCount(capacity)
+        self.view.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.fail_only_check = QtWidgets.QCheckBox("Show failures only")
+        self.fail_only_check.toggled.connect(self._rebuild)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.fail_only_check)
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+
+    def append_lines(self, lines: Iterable[str]) -> None:
+        """Append a batch of lines with a single widget update."""
+
+        batch = list(lines)
+        if not batch:
+            return
+        self._lines.extend(batch)
+        if self.fail_only_check.isChecked():
+            batch = [line for line in batch if is_failure(line)]
+            if not batch:
+                return
+        # Only the tail can survive the block limit; skip formatting the rest.
+        self.view.appendPlainText("\n".join(batch[-self.capacity :]))
+
+    def clear(self) -> None:
+        self._lines.clear()
+        self.view.clear()
+
+    def lines(self) -> list[str]:
+        """Return the buffered lines, oldest first."""
+
+        return list(self._lines)
+
+    def _rebuild(self) -> None:
+        lines = self._lines
+        if self.fail_only_check.isChecked():
+            lines = [line for line in lines if is_failure(line)]  # type: ignore[assignment]
+        self.view.setPlainText("\n".join(lines))
+        self.view.moveCursor(QtGui.QTextCursor.End)
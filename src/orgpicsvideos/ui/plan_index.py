@@ -0,0 +1,184 @@
+"""Compact, Qt-free index of a plan for the tree views."""
+
+from __future__ import annotations
+
+from array import array
+import os
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from orgpicsvideos.core.plan_table import PlanTable
+from orgpicsvideos.core.types import OperationType, Plan, PlannedOperation
+
+FILE_COPY = 0
+FILE_SKIPPED = 1
+
+
+class PlanIndex:
+    """Directory nodes plus a flat, directory-grouped array of file rows.
+
+    Directories are few and stored as small Python lists. Files are stored
+    only as integers: each row references an entry of ``plan.operations``
+    (copies) or ``plan.skipped_files`` (skips), and rows of one directory are
+    contiguous, so a directory's files are the range
+    ``file_start[d] : file_start[d] + file_count[d]``. Within that range the
+    ``copy_count[d]`` copies come first, followed by the skipped files.
+    """
+
+    def __init__(self, plan: Plan, root: Path) -> None:
+        self.plan = plan
+        self.root = root
+        self.dir_paths: list[Path] = [root]
+        self.dir_names: list[str] = [str(root)]
+        self.dir_parent = array("l", [-1])
+        self.dir_row = array("l", [0])
+        self.dir_children: list[list[int]] = [[]]
+        # Each directory's id followed by its ancestors' ids up to the root.
+        self.dir_ancestors: list[tuple[int, ...]] = [(0,)]
+        # Existence as recorded by the planner for each planned directory and
+        # its ancestors, so the views never probe the filesystem themselves.
+        self.dir_exists = bytearray(1)
+        # Keyed by string: hashing strings is far cheaper than hashing Paths.
+        self._dir_ids: dict[str, int] = {str(root): 0}
+
+        for planned_dir in plan.directories:
+            dir_id = self._ensure_dir(planned_dir.path)
+            chain = self.dir_ancestors[dir_id]
+            depth = len(chain) - 1 if planned_dir.exists else planned_dir.existing_depth
+            # chain runs leaf -> root; the root and ``depth`` levels below it exist.
+            for ancestor in chain[len(chain) - 1 - depth :]:
+                self.dir_exists[ancestor] = 1
+        self._sort_children()
+
+        # First pass: directory of every displayed file, in plan order.
+        row_dirs = array("l")
+        kinds = bytearray()
+        refs = array("l")
+        for ref, (op_type, parent) in enumerate(_op_dirs(plan.operations)):
+            if op_type != OperationType.COPY:
+                continue
+            dir_id = self._dir_ids.get(parent)
+            if dir_id is None:
+                continue
+            row_dirs.append(dir_id)
+            kinds.append(FILE_COPY)
+            refs.append(ref)
+        for ref, skipped in enumerate(plan.skipped_files):
+            dir_id = self._dir_ids.get(os.path.dirname(str(skipped.destination)))
+            if dir_id is None:
+                continue
+            row_dirs.append(dir_id)
+            kinds.append(FILE_SKIPPED)
+            refs.append(ref)
+
+        # Counting sort keeps plan order within each directory in O(n).
+        dir_total = len(self.dir_paths)
+        self.file_count = array("l", [0]) * dir_total
+        self.copy_count = array("l", [0]) * dir_total
+        for position, dir_id in enumerate(row_dirs):
+            self.file_count[dir_id] += 1
+            if kinds[position] == FILE_COPY:
+                self.copy_count[dir_id] += 1
+        self.file_start = array("l", [0]) * dir_total
+        offset = 0
+        for dir_id in range(dir_total):
+            self.file_start[dir_id] = offset
+            offset += self.file_count[dir_id]
+        cursor = array("l", self.file_start)
+        self.file_dir = array("l", [0]) * len(refs)
+        self.file_kind = bytearray(len(refs))
+        self.file_ref = array("l", [0]) * len(refs)
+        # Operation index -> file row, so status updates are O(1).
+        self.op_rows = array("l", [-1]) * len(plan.operations)
+        for position, dir_id in enumerate(row_dirs):
+            row = cursor[dir_id]
+            cursor[dir_id] += 1
+            kind = kinds[position]
+            self.file_dir[row] = dir_id
+            self.file_kind[row] = kind
+            self.file_ref[row] = refs[position]
+            if kind == FILE_COPY:
+                self.op_rows[refs[position]] = row
+
+    @property
+    def dir_count(self) -> int:
+        return len(self.dir_paths)
+
+    @property
+    def file_total(self) -> int:
+        return len(self.file_ref)
+
+    def dir_id(self, path: Path) -> int | None:
+        return self._dir_ids.get(str(path))
+
+    def file_name(self, row: int) -> str:
+        return self.file_destination(row).name
+
+    def file_destination(self, row: int) -> Path:
+        ref = self.file_ref[row]
+        if self.file_kind[row] == FILE_COPY:
+            return self.plan.operations[ref].destination
+        return self.plan.skipped_files[ref].destination
+
+    def file_source(self, row: int) -> Path | None:
+        ref = self.file_ref[row]
+        if self.file_kind[row] == FILE_COPY:
+            return self.plan.operations[ref].source
+        return self.plan.skipped_files[ref].source
+
+    def skip_reason(self, row: int) -> str:
+        return self.plan.skipped_files[self.file_ref[row]].reason.value
+
+    def copy_totals(self) -> array:
+        """Return the number of planned copies below each directory."""
+
+        totals = array("l", self.copy_count)
+        # Parents are always created before their children.
+        for dir_id in range(self.dir_count - 1, 0, -1):
+            totals[self.dir_parent[dir_id]] += totals[dir_id]
+        return totals
+
+    def ancestors(self, dir_id: int) -> tuple[int, ...]:
+        """Return dir_id and its ancestors up to the root."""
+
+        return self.dir_ancestors[dir_id]
+
+    def _ensure_dir(self, path: Path) -> int:
+        dir_id = self._dir_ids.get(str(path))
+        if dir_id is not None:
+            return dir_id
+        try:
+            parts = path.relative_to(self.root).parts
+        except ValueError:
+            parts = path.parts
+        parent = 0
+        current = self.root
+        for part in parts:
+            current = current / part
+            dir_id = self._dir_ids.get(str(current))
+            if dir_id is None:
+                dir_id = len(self.dir_paths)
+                self._dir_ids[str(current)] = dir_id
+                self.dir_paths.append(current)
+                self.dir_names.append(part)
+                self.dir_parent.append(parent)
+                self.dir_row.append(0)
+                self.dir_children.append([])
+                self.dir_children[parent].append(dir_id)
+                self.dir_ancestors.append((dir_id,) + self.dir_ancestors[parent])
+                self.dir_exists.append(0)
+            parent = dir_id
+        return parent
+
+    def _sort_children(self) -> None:
+        for children in self.dir_children:
+            children.sort(key=self.dir_names.__getitem__)
+            for row, child in enumerate(children):
+                self.dir_row[child] = row
+
+
+def _op_dirs(operations: Sequence[PlannedOperation]) -> Iterator[tuple[OperationType, str]]:
+    # A PlanTable answers from its columns without building Path objects.
+    if isinstance(operations, PlanTable):
+        return zip(operations.op_types(), operations.destination_dirs())
+    return ((op.op_type, os.path.dirname(str(op.destination))) for op in operations)
@@ -0,0 +1,279 @@
+"""Lazy item models for the planned-structure and execution trees."""
+
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from .execution_progress import ExecutionProgress
+from .plan_index import FILE_COPY, PlanIndex
+
+MODE_PLANNED = "planned"
+MODE_EXECUTION = "execution"
+
+ROLE_KIND = QtCore.Qt.UserRole
+ROLE_EXISTING = QtCore.Qt.UserRole + 1
+ROLE_SOURCE = QtCore.Qt.UserRole + 2
+ROLE_DESTINATION = QtCore.Qt.UserRole + 3
+
+_STATUS_COLORS = {
+    # Execution tree status mapping:
+    # pending (purple), partial (orange), success (green), failed (red), existing (black).
+    "pending": "#7a3df0",
+    "partial": "#f08c2e",
+    "success": "#1f9d4c",
+    "failed": "#d33",
+    "existing": "#000",
+    # Planned tree: existing dirs black, new dirs and copies blue, skips gray.
+    "new": "#2b6cff",
+    "copy": "#2b6cff",
+    "skipped": "#777",
+}
+
+
+class PlanTreeModel(QtCore.QAbstractItemModel):
+    """Single-column tree over a ``PlanIndex``.
+
+    Nothing is created per file: a node's internal id encodes either a
+    directory (``dir_id * 2``) or a file row (``row * 2 + 1``). Child
+    directories are always present; a directory's files are exposed in
+    batches through ``fetchMore`` as the view asks for them. The execution
+    tree lists only the copies, the planned tree also lists skipped files.
+    """
+
+    def __init__(
+        self,
+        index: PlanIndex,
+        mode: str = MODE_PLANNED,
+        batch_size: int = 1000,
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.plan_index = index
+        self.mode = mode
+        self.batch_size = batch_size
+        self._loaded = array("l", [0]) * index.dir_count
+        self._dir_exists: dict[int, bool] = {}
+        style = QtWidgets.QApplication.style()
+        self._folder_icon = style.standardIcon(QtWidgets.QStyle.SP_DirIcon)
+        self._file_icon = style.standardIcon(QtWidgets.QStyle.SP_FileIcon)
+        self._brushes = {
+            status: QtGui.QBrush(QtGui.QColor(color)) for status, color in _STATUS_COLORS.items()
+        }
+        self.progress = ExecutionProgress(index) if mode == MODE_EXECUTION else None
+        self._file_limit = index.copy_count if mode == MODE_EXECUTION else index.file_count
+
+    # Structure
+
+    def index(
+        self, row: int, column: int, parent: QtCore.QModelIndex = QtCore.QModelIndex()
+    ) -> QtCore.QModelIndex:
+        if column != 0 or row < 0:
+            return QtCore.QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, 0, 0) if row == 0 else QtCore.QModelIndex()
+        node = parent.internalId()
+        if node & 1:
+            return QtCore.QModelIndex()
+        dir_id = node >> 1
+        children = self.plan_index.dir_children[dir_id]
+        if row < len(children):
+            return self.createIndex(row, 0, children[row] << 1)
+        file_offset = row - len(children)
+        if file_offset >= self._loaded[dir_id]:
+            return QtCore.QModelIndex()
+        file_row = self.plan_index.file_start[dir_id] + file_offset
+        return self.createIndex(row, 0, (file_row << 1) | 1)
+
+    def parent(self, child: QtCore.QModelIndex) -> QtCore.QModelIndex:  # type: ignore[override]
+        if not child.isValid():
+            return QtCore.QModelIndex()
+        node = child.internalId()
+        if node & 1:
+            dir_id = self.plan_index.file_dir[node >> 1]
+        else:
+            dir_id = self.plan_index.dir_parent[node >> 1]
+            if dir_id < 0:
+                return QtCore.QModelIndex()
+        return self._dir_model_index(dir_id)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if not parent.isValid():
+            return 1
+        node = parent.internalId()
+        if node & 1:
+            return 0
+        dir_id = node >> 1
+        return len(self.plan_index.dir_children[dir_id]) + self._loaded[dir_id]
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        if not parent.isValid():
+            return True
+        node = parent.internalId()
+        if node & 1:
+            return False
+        dir_id = node >> 1
+        return bool(self.plan_index.dir_children[dir_id]) or self._file_limit[dir_id] > 0
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        if not parent.isValid() or parent.internalId() & 1:
+            return False
+        dir_id = parent.internalId() >> 1
+        return self._loaded[dir_id] < self._file_limit[dir_id]
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        if not self.canFetchMore(parent):
+            return
+        dir_id = parent.internalId() >> 1
+        loaded = self._loaded[dir_id]
+        count = min(self.batch_size, self._file_limit[dir_id] - loaded)
+        first = len(self.plan_index.dir_children[dir_id]) + loaded
+        self.beginInsertRows(parent, first, first + count - 1)
+        self._loaded[dir_id] = loaded + count
+        self.endInsertRows()
+
+    # Data
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):  # type: ignore[no-untyped-def]
+        if not index.isValid():
+            return None
+        node = index.internalId()
+        if node & 1:
+            return self._file_data(node >> 1, role)
+        return self._dir_data(node >> 1, role)
+
+    def _dir_data(self, dir_id: int, role: int):  # type: ignore[no-untyped-def]
+        path = self.plan_index.dir_paths[dir_id]
+        if role == QtCore.Qt.DecorationRole:
+            return self._folder_icon
+        if role == QtCore.Qt.ToolTipRole:
+            return str(path)
+        if role == ROLE_KIND:
+            return "dir"
+        if dir_id == 0:
+            # The destination root is shown as a plain path without status.
+            return str(path) if role == QtCore.Qt.DisplayRole else None
+        status = self.dir_status(dir_id)
+        if role == QtCore.Qt.DisplayRole:
+            return f"{self.plan_index.dir_names[dir_id]} ({status})"
+        if role == QtCore.Qt.ForegroundRole:
+            return self._brushes[status]
+        if role == ROLE_EXISTING:
+            return status == "existing"
+        return None
+
+    def _file_data(self, row: int, role: int):  # type: ignore[no-untyped-def]
+        index = self.plan_index
+        if role == QtCore.Qt.DecorationRole:
+            return self._file_icon
+        if role in (QtCore.Qt.ToolTipRole, ROLE_DESTINATION):
+            return str(index.file_destination(row))
+        if role == ROLE_SOURCE:
+            source = index.file_source(row)
+            return str(source) if source else None
+        if role == ROLE_KIND:
+            return "file" if index.file_kind[row] == FILE_COPY else "skipped"
+        if self.progress is not None:
+            status = label = self.progress.file_status_name(row)
+        elif index.file_kind[row] == FILE_COPY:
+            status = label = "copy"
+        else:
+            status = "skipped"
+            label = f"skipped: {index.skip_reason(row)}"
+        if role == QtCore.Qt.DisplayRole:
+            return f"{index.file_name(row)} ({label})"
+        if role == QtCore.Qt.ForegroundRole:
+            return self._brushes[status]
+        return None
+
+    def dir_status(self, dir_id: int) -> str:
+        if self.progress is not None:
+            return self.progress.dir_status(dir_id)
+        return "existing" if self._exists(dir_id) else "new"
+
+    def _exists(self, dir_id: int) -> bool:
+        # Planner answer, unless a background probe has reported since.
+        exists = self._dir_exists.get(dir_id)
+        if exists is None:
+            return bool(self.plan_index.dir_exists[dir_id])
+        return exists
+
+    # Updates
+
+    def child_dir_paths(self, parent: QtCore.QModelIndex) -> list[Path]:
+        """Return an expanded directory's path and those of its child directories."""
+
+        if not parent.isValid() or parent.internalId() & 1:
+            return []
+        dir_id = parent.internalId() >> 1
+        paths = self.plan_index.dir_paths
+        return [paths[dir_id]] + [paths[child] for child in self.plan_index.dir_children[dir_id]]
+
+    def file_sources(self, parent: QtCore.QModelIndex) -> list[Path]:
+        """Return the source paths of the files listed directly under a directory."""
+
+        if not parent.isValid() or parent.internalId() & 1:
+            return []
+        dir_id = parent.internalId() >> 1
+        index = self.plan_index
+        start = index.file_start[dir_id]
+        sources = (index.file_source(row) for row in range(start, start + self._file_limit[dir_id]))
+        return [source for source in sources if source is not None]
+
+    def update_existence(self, results: dict[Path, bool]) -> None:
+        """Apply probe results, repainting only directories whose status changed."""
+
+        for path, exists in results.items():
+            dir_id = self.plan_index.dir_id(path)
+            if dir_id is None or self._exists(dir_id) == exists:
+                continue
+            self._dir_exists[dir_id] = exists
+            model_index = self._dir_model_index(dir_id)
+            self.dataChanged.emit(model_index, model_index)
+
+    def set_operation_status(self, op_index: int, success: bool) -> None:
+        """Record the result of ``plan.operations[op_index]``; shown on the next flush."""
+
+        if self.progress is not None:
+            self.progress.record(op_index, success)
+
+    def flush_status(self) -> None:
+        """Repaint the rows whose status changed since the last flush."""
+
+        if self.progress is None:
+            return
+        dirs, files = self.progress.take_dirty()
+        for dir_id in dirs:
+            model_index = self._dir_model_index(dir_id)
+            self.dataChanged.emit(model_index, model_index)
+        # One signal per directory covering its changed, already loaded rows.
+        index = self.plan_index
+        spans: dict[int, tuple[int, int]] = {}
+        for row in files:
+            dir_id = index.file_dir[row]
+            if row - index.file_start[dir_id] >= self._loaded[dir_id]:
+                continue
+            low, high = spans.get(dir_id, (row, row))
+            spans[dir_id] = (min(low, row), max(high, row))
+        for dir_id, (low, high) in spans.items():
+            offset = len(index.dir_children[dir_id]) - index.file_start[dir_id]
+            self.dataChanged.emit(
+                self.createIndex(low + offset, 0, (low << 1) | 1),
+                self.createIndex(high + offset, 0, (high << 1) | 1),
+            )
+
+    def dir_index(self, path: Path) -> QtCore.QModelIndex:
+        """Return the model index of a planned directory, or an invalid index."""
+
+        dir_id = self.plan_index.dir_id(path)
+        if dir_id is None:
+            return QtCore.QModelIndex()
+        return self._dir_model_index(dir_id)
+
+    def _dir_model_index(self, dir_id: int) -> QtCore.QModelIndex:
+        return self.createIndex(self.plan_index.dir_row[dir_id], 0, dir_id << 1)
@@ -0,0 +1,55 @@
+"""Progress shared between a worker thread and the GUI."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ProgressSnapshot:
+    found: tuple[int, int] | None
+    copied: tuple[int, int] | None
+    progress: tuple[int, int] | None
+    current_dir: str | None
+    log_lines: list[str] = field(default_factory=list)
+    op_results: list[tuple[int, bool]] = field(default_factory=list)
+
+
+class ProgressState:
+    """Counters and event queues published by a worker, polled by the GUI.
+
+    The worker only rebinds attributes to new immutable values and appends to
+    deques, both atomic under the GIL, so publishing never blocks and costs no
+    Qt event. The GUI calls ``drain`` on a timer and applies changes in bulk.
+    """
+
+    def __init__(self) -> None:
+        # None means "not published yet"; the GUI leaves that widget alone.
+        self.found: tuple[int, int] | None = None  # (pics, videos) found by the scan
+        self.copied: tuple[int, int] | None = None  # (pics, videos) copied
+        self.progress: tuple[int, int] | None = None  # (done, total) operations
+        self.current_dir: str | None = None
+        self._log_lines: deque[str] = deque()
+        self._op_results: deque[tuple[int, bool]] = deque()
+
+    def add_log(self, line: str) -> None:
+        self._log_lines.append(line)
+
+    def add_op_result(self, index: int, success: bool) -> None:
+        self._op_results.append((index, success))
+
+    def drain(self) -> ProgressSnapshot:
+        return ProgressSnapshot(
+            found=self.found,
+            copied=self.copied,
+            progress=self.progress,
+            current_dir=self.current_dir,
+            log_lines=_drain(self._log_lines),
+            op_results=_drain(self._op_results),
+        )
+
+
+def _drain(queue: deque) -> list:  # type: ignore[type-arg]
+    # Pop only what is there now; the worker may keep appending meanwhile.
+    return [queue.popleft() for _ in range(len(queue))]
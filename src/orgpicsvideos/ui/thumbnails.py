@@ -0,0 +1,200 @@
+"""Thumbnail pane for previewing planned and skipped files."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+import multiprocessing
+import os
+from pathlib import Path
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from orgpicsvideos.core.thumbnails import (
+    DEFAULT_CACHE_BYTES,
+    THUMBNAIL_SIZE,
+    default_thumbnail_dir,
+    load_thumbnail,
+)
+
+# Decoded pixmaps kept in memory; the on-disk cache holds the rest.
+_PIXMAP_LIMIT = 512
+
+
+class ThumbnailLoader(QtCore.QObject):
+    """Generate thumbnails in a process pool and keep recent pixmaps in memory."""
+
+    loaded = QtCore.Signal(str)
+    _finished = QtCore.Signal(str, object)
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        workers: int | None = None,
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.cache_dir = cache_dir or default_thumbnail_dir()
+        self.max_bytes = max_bytes
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._pool: ProcessPoolExecutor | None = None
+        self._pending: dict[str, Future[bytes | None]] = {}
+        self._pixmaps: OrderedDict[str, QtGui.QPixmap | None] = OrderedDict()
+        self._finished.connect(self._store)
+
+    def pixmap(self, path: str) -> QtGui.QPixmap | None:
+        pixmap = self._pixmaps.get(path)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(path)
+        return pixmap
+
+    def request(self, paths: list[str]) -> None:
+        """Queue thumbnails for ``paths``, most urgent first; stale requests are dropped."""
+
+        wanted = set(paths)
+        for path, future in list(self._pending.items()):
+            if path not in wanted and future.cancel():
+                del self._pending[path]
+        for path in paths:
+            if path in self._pixmaps or path in self._pending:
+                continue
+            future = self._executor().submit(
+                load_thumbnail, path, str(self.cache_dir), self.max_bytes, THUMBNAIL_SIZE
+            )
+            self._pending[path] = future
+            future.add_done_callback(lambda done, path=path: self._on_done(path, done))
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned workers do not inherit the Qt state of the GUI process.
+            context = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._pool
+
+    def _on_done(self, path: str, future: Future[bytes | None]) -> None:
+        # Runs on an executor thread; the signal is queued to the GUI thread.
+        if future.cancelled():
+            return
+        try:
+            data = future.result()
+        except Exception:  # noqa: BLE001
+            data = None
+        self._finished.emit(path, data)
+
+    @QtCore.Slot(str, object)
+    def _store(self, path: str, data: bytes | None) -> None:
+        self._pending.pop(path, None)
+        pixmap = None
+        if data:
+            pixmap = QtGui.QPixmap()
+            if not pixmap.loadFromData(data):
+                pixmap = None
+        self._pixmaps[path] = pixmap
+        while len(self._pixmaps) > _PIXMAP_LIMIT:
+            self._pixmaps.popitem(last=False)
+        self.loaded.emit(path)
+
+
+class ThumbnailListModel(QtCore.QAbstractListModel):
+    def __init__(self, loader: ThumbnailLoader, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.loader = loader
+        self._paths: list[str] = []
+        self._rows: dict[str, int] = {}
+        style = QtWidgets.QApplication.style()
+        self._placeholder = style.standardIcon(QtWidgets.QStyle.SP_FileIcon)
+        loader.loaded.connect(self._on_loaded)
+
+    def set_paths(self, paths: list[Path]) -> None:
+        self.beginResetModel()
+        self._paths = [str(path) for path in paths]
+        self._rows = {path: row for row, path in enumerate(self._paths)}
+        self.endResetModel()
+
+    def path(self, row: int) -> str:
+        return self._paths[row]
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):  # type: ignore[no-untyped-def]
+        if not index.isValid():
+            return None
+        path = self._paths[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return os.path.basename(path)
+        if role == QtCore.Qt.ToolTipRole:
+            return path
+        if role == QtCore.Qt.DecorationRole:
+            return self.loader.pixmap(path) or self._placeholder
+        return None
+
+    def _on_loaded(self, path: str) -> None:
+        row = self._rows.get(path)
+        if row is not None:
+            model_index = self.index(row)
+            self.dataChanged.emit(model_index, model_index, [QtCore.Qt.DecorationRole])
+
+
+class ThumbnailPane(QtWidgets.QListView):
+    """Grid of previews that loads thumbnails for the visible rows and one screen ahead."""
+
+    def __init__(
+        self, loader: ThumbnailLoader | None = None, parent: QtWidgets.QWidget | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.loader = loader or ThumbnailLoader(parent=self)
+        self.thumbnail_model = ThumbnailListModel(self.loader, self)
+        self.setModel(self.thumbnail_model)
+        self.setViewMode(QtWidgets.QListView.IconMode)
+        self.setResizeMode(QtWidgets.QListView.Adjust)
+        self.setUniformItemSizes(True)
+        self.setIconSize(QtCore.QSize(*THUMBNAIL_SIZE))
+        self.setGridSize(QtCore.QSize(THUMBNAIL_SIZE[0] + 24, THUMBNAIL_SIZE[1] + 32))
+        self.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        # Scrolling restarts a short timer so a fast fling requests only where it stops.
+        self._prefetch_timer = QtCore.QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(50)
+        self._prefetch_timer.timeout.connect(self.prefetch_visible)
+        self.verticalScrollBar().valueChanged.connect(self._prefetch_timer.start)
+
+    def set_paths(self, paths: list[Path]) -> None:
+        self.thumbnail_model.set_paths(paths)
+        self.scrollToTop()
+        self._prefetch_timer.start()
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        super().resizeEvent(event)
+        self._prefetch_timer.start()
+
+    def visible_rows(self) -> range:
+        count = self.thumbnail_model.rowCount()
+        if count == 0:
+            return range(0)
+        # indexAt() misses in the margins around each icon, so work from the
+        # grid cells instead: rows of ``columns`` items, each a grid cell tall.
+        grid = self.gridSize()
+        rect = self.viewport().rect()
+        columns = max(1, rect.width() // max(1, grid.width()))
+        top = self.verticalOffset()
+        first_line = top // max(1, grid.height())
+        last_line = (top + rect.height() - 1) // max(1, grid.height())
+        start = min(count, first_line * columns)
+        end = min(count, (last_line + 1) * columns)
+        return range(start, end)
+
+    def prefetch_visible(self) -> None:
+        visible = self.visible_rows()
+        if not visible:
+            return
+        ahead = len(visible)
+        count = self.thumbnail_model.rowCount()
+        rows = list(visible) + list(range(visible.stop, min(count, visible.stop + ahead)))
+        self.loader.request([self.thumbnail_model.path(row) for row in rows])
@@ -0,0 +1,186 @@
+"""CLI entrypoint to check that logged copies match their sources byte for byte."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+from orgpicsvideos.core.cache import MetadataCache, default_cache_path
+from orgpicsvideos.core.content_index import ContentIndex, default_index_path
+from orgpicsvideos.core.deleter import REPORT_FORMATS, ReportWriter
+from orgpicsvideos.core.logger import find_latest_log, iter_successful_copies, read_log_header
+from orgpicsvideos.core.progress import ProgressLine
+from orgpicsvideos.core.verify import VerifyResult, VerifySummary, format_result, verify_copies
+
+
+def parse_sample(text: str) -> float:
+    """Parse ``N%`` (or a bare N) into a fraction in (0, 1]."""
+
+    value = text[:-1] if text.endswith("%") else text
+    try:
+        percent = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid sample: {text}") from None
+    if not 0 < percent <= 100:
+        raise argparse.ArgumentTypeError("sample must be greater than 0% and at most 100%")
+    return percent / 100
+
+
+def sample_pairs(
+    pairs: Iterable[tuple[Path, Path]], fraction: float, seed: int | None = None
+) -> Iterator[tuple[Path, Path]]:
+    """Keep each pair with probability ``fraction`` without buffering the log."""
+
+    if fraction >= 1:
+        yield from pairs
+        return
+    rng = random.Random(seed)
+    for pair in pairs:
+        if rng.random() < fraction:
+            yield pair
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Verify that every successful copy in an import log matches its source."
+    )
+    parser.add_argument(
+        "log",
+        type=Path,
+        help="Import log file, or a destination root to use its latest log",
+    )
+    parser.add_argument(
+        "--sample",
+        type=parse_sample,
+        default=1.0,
+        metavar="N%",
+        help="Check a random N%% of the logged copies (default: all)",
+    )
+    parser.add_argument("--seed", type=int, help="Random seed for --sample")
+    parser.add_argument(
+        "--jobs-per-device",
+        type=int,
+        default=2,
+        help="Concurrent readers per source or destination device (default: 2)",
+    )
+    parser.add_argument(
+        "--rehash",
+        action="store_true",
+        help="Hash every file even when an unchanged digest is already stored",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help="Write the per-file report to this file instead of stdout",
+    )
+    parser.add_argument(
+        "--format",
+        choices=REPORT_FORMATS,
+        default="text",
+        help="Report format (default: text)",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Report every checked pair, not only problems",
+    )
+    parser.add_argument(
+        "--no-progress",
+        action="store_true",
+        help="Do not print a progress line to stderr",
+    )
+    args = parser.parse_args()
+
+    log_path = args.log
+    if log_path.is_dir():
+        latest = find_latest_log(log_path)
+        if latest is None:
+            raise SystemExit(f"No log found in {log_path}")
+        log_path = latest
+    header = read_log_header(log_path)
+    if header is None:
+        raise SystemExit(f"Not an import log: {log_path}")
+    if args.jobs_per_device < 1:
+        raise SystemExit("--jobs-per-device must be at least 1")
+    destination = header[1]
+
+    # Reuse digests stored by earlier imports and dedupe runs; never create the stores.
+    cache_path = default_cache_path(destination)
+    cache = MetadataCache(cache_path) if cache_path.exists() else None
+    index_path = default_index_path(destination)
+    index = ContentIndex(index_path) if index_path.exists() else None
+    for store in (cache, index):
+        if store:
+            store.open()
+    try:
+        if args.report:
+            with args.report.open("w", encoding="utf-8") as handle:
+                summary = _run(args, log_path, handle, cache, index)
+        else:
+            summary = _run(args, log_path, sys.stdout, cache, index)
+    finally:
+        for store in (cache, index):
+            if store:
+                store.close()
+
+    mib = summary.bytes_hashed / (1024 * 1024)
+    seconds = max(summary.seconds, 1e-9)
+    print(
+        "Verify complete: "
+        f"checked={summary.checked} "
+        f"ok={summary.ok} "
+        f"mismatched={summary.mismatched} "
+        f"missing={summary.missing} "
+        f"source_missing={summary.source_missing} "
+        f"errors={summary.errors} "
+        f"reused_digests={summary.reused} "
+        f"read={mib:.1f}MiB "
+        f"rate={mib / seconds:.1f}MiB/s "
+        f"files_per_s={summary.checked / seconds:.1f} "
+        f"log={log_path}"
+    )
+    if summary.problems:
+        raise SystemExit(1)
+
+
+def _run(
+    args: argparse.Namespace,
+    log_path: Path,
+    stream: TextIO,
+    cache: MetadataCache | None,
+    index: ContentIndex | None,
+) -> VerifySummary:
+    report = ReportWriter(stream, args.format, formatter=format_result)
+    bar = None if args.no_progress else ProgressLine("Verify")
+    checked = 0
+
+    def on_result(result: VerifyResult) -> None:
+        nonlocal checked
+        checked += 1
+        if bar:
+            bar.update(checked)
+        if args.all or result.status != "ok":
+            report.add(result)
+
+    pairs = sample_pairs(iter_successful_copies(log_path), args.sample, args.seed)
+    try:
+        summary = verify_copies(
+            pairs,
+            per_device=args.jobs_per_device,
+            source_store=cache,
+            destination_store=index or cache,
+            rehash=args.rehash,
+            on_result=on_result,
+        )
+    finally:
+        if bar:
+            bar.finish()
+        report.flush()
+    return summary
+
+
+if __name__ == "__main__":
+    main()
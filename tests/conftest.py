@@ -1,4 +1,18 @@
+from __future__ import annotations
+
 import os
+from typing import Any, Callable
+
+import pytest
+
+from benchmarks.iocount import count_io
 
 # Ensure Qt can initialize in headless test environments.
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture
+def io_counter() -> Callable[[], Any]:
+    """Return a context manager that counts filesystem calls made inside it."""
+
+    return count_io
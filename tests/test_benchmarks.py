@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.__main__ import compare, measure
+from benchmarks.corpus import ensure_corpus, jpeg_bytes, mp4_bytes
+from benchmarks.scenarios import SCENARIOS, Workspace
+from orgpicsvideos.core.scanner import scan_media
+from orgpicsvideos.core.utils import get_creation_time
+
+
+def test_corpus_files_carry_capture_dates(tmp_path: Path) -> None:
+    captured = datetime(2019, 6, 1, 8, 30, 0)
+    photo = tmp_path / "IMG.JPG"
+    photo.write_bytes(jpeg_bytes(captured, 1))
+    video = tmp_path / "MVI.MP4"
+    video.write_bytes(mp4_bytes(captured, 1))
+
+    assert get_creation_time(photo) == captured
+    assert get_creation_time(video) == captured
+
+
+def test_corpus_is_deterministic_and_scannable(tmp_path: Path) -> None:
+    first = ensure_corpus(tmp_path / "a", 1200, seed=3)
+    second = ensure_corpus(tmp_path / "b", 1200, seed=3)
+
+    assert first == second
+    assert first.images + first.videos == 1200
+    assert first.duplicates and first.sidecars and first.junk
+    files_a = sorted(p.relative_to(tmp_path / "a") for p in (tmp_path / "a").rglob("*"))
+    files_b = sorted(p.relative_to(tmp_path / "b") for p in (tmp_path / "b").rglob("*"))
+    assert files_a == files_b
+    media = list(scan_media(tmp_path / "a"))
+    assert len(media) == 1200
+
+
+def test_scenarios_run_and_compare_against_a_baseline(tmp_path: Path) -> None:
+    ensure_corpus(tmp_path / "corpus", 50)
+    workspace = Workspace(tmp_path / "corpus", tmp_path / "scratch", jobs=2)
+    scenarios = {
+        name: measure(setup, workspace, repeat=1, memory=name == "execute")
+        for name, setup in SCENARIOS.items()
+    }
+    assert scenarios["execute"]["peak_mb"] >= 0
+    assert all(result["wall_s"] > 0 for result in scenarios.values())
+    assert scenarios["scan"]["calls"]["scandir"] > 0
+    assert 0 < scenarios["scan"]["calls"]["stat"] <= 2 * 50
+    assert scenarios["scan_cached"]["calls"]["open"] < scenarios["scan"]["calls"]["open"]
+
+    current = {"sizes": {"50": {"scenarios": scenarios}}}
+    slower = {name: dict(result, wall_s=result["wall_s"] * 2) for name, result in scenarios.items()}
+    lines, regressions = compare(current, current, tolerance=0.15)
+    assert regressions == 0 and len(lines) == 1 + 4 * len(SCENARIOS) + 1
+    _, regressions = compare({"sizes": {"50": {"scenarios": slower}}}, current, tolerance=0.15)
+    assert regressions == len(SCENARIOS)
+
+    probing = dict(scenarios["scan"], calls=dict(scenarios["scan"]["calls"], stat=10_000))
+    lines, regressions = compare({"sizes": {"50": {"scenarios": {"scan": probing}}}}, current, 0.15)
+    assert regressions == 1 and any("stat" in line and "REGRESSION" in line for line in lines)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from datetime import datetime
+import os
+from pathlib import Path
+
+import pytest
+from PySide6 import QtWidgets
+
+from orgpicsvideos.core.cancel import CancelToken, OperationCancelled
+from orgpicsvideos.core.logger import find_latest_log, load_successful_destinations
+from orgpicsvideos.core.planner import build_plan
+from orgpicsvideos.core.scanner import scan_media
+from orgpicsvideos.core.types import MediaFile, MediaType
+from orgpicsvideos.ui.app import CopyWorker
+from orgpicsvideos.ui.progress_state import ProgressState
+
+
+def _get_or_create_app() -> QtWidgets.QApplication:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication([])
+    return app
+
+
+class _CancelAfterCopies(ProgressState):
+    def __init__(self, token: CancelToken, copies: int) -> None:
+        super().__init__()
+        self.token = token
+        self.copies = copies
+
+    def add_log(self, line: str) -> None:
+        super().add_log(line)
+        if line.startswith("copy "):
+            self.copies -= 1
+            if self.copies == 0:
+                self.token.cancel()
+
+
+def test_scan_and_plan_stop_when_cancelled(tmp_path: Path) -> None:
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "photo.jpg").write_bytes(b"x")
+    token = CancelToken()
+    token.cancel()
+
+    with pytest.raises(OperationCancelled):
+        list(scan_media(tmp_path, cancel=token))
+
+    media = (
+        MediaFile(path=tmp_path / f"{idx}.jpg", created_at=datetime(2002, 9, 27), media_type=MediaType.IMAGE)
+        for idx in range(1000)
+    )
+    with pytest.raises(OperationCancelled):
+        build_plan(media, tmp_path / "dest", cancel=token)
+
+
+def test_cancelled_copy_leaves_resumable_log(tmp_path: Path) -> None:
+    _get_or_create_app()
+    src = tmp_path / "src"
+    src.mkdir()
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    media = []
+    for idx in range(6):
+        path = src / f"{idx}.jpg"
+        path.write_bytes(b"x")
+        media.append(MediaFile(path=path, created_at=datetime(2002, 9, 27), media_type=MediaType.IMAGE))
+    plan = build_plan(media, dest)
+
+    token = CancelToken()
+    worker = CopyWorker(plan, src, dest, state=_CancelAfterCopies(token, 2), cancel=token)
+    outcomes: list[str] = []
+    worker.cancelled.connect(lambda: outcomes.append("cancelled"))
+    worker.finished.connect(lambda: outcomes.append("finished"))
+    worker.run()
+
+    assert outcomes == ["cancelled"]
+    log_path = find_latest_log(dest)
+    text = log_path.read_text(encoding="utf-8")
+    assert "COPY CANCELLED: completed=3 remaining=4" in text  # one mkdir + two copies
+    done = load_successful_destinations(log_path, expected_source=src, expected_destination=dest)
+    assert len(done) == 2
+
+    resumed = build_plan(media, dest, skip_destinations=done)
+    assert resumed.total_files == 4
+    assert resumed.skipped_resume == 2
@@ -44,7 +44,42 @@ def test_cleanup_delete(tmp_path: Path, capsys) -> None:
     finally:
         sys.argv = argv
 
-    out = capsys.readouterr().out
-    assert "deleted" in out
+    captured = capsys.readouterr()
+    assert "deleted" in captured.out
+    # The summary stays out of the report on stdout.
+    assert "Deleted 1 files" in captured.err and "Deleted" not in captured.out
     assert not small.exists()
     assert big.exists()
+
+
+def test_cleanup_jsonl_report_matches_dry_run(tmp_path: Path, capsys) -> None:
+    import json
+    import sys
+
+    root = tmp_path / "root"
+    for idx in range(3):
+        sub = root / f"d{idx}"
+        sub.mkdir(parents=True)
+        (sub / "tiny.png").write_bytes(b"x" * (idx + 1))
+        (sub / "big.jpg").write_bytes(b"x" * 5000)
+
+    def run(report: Path, *extra: str) -> list[dict]:
+        argv = sys.argv
+        sys.argv = ["cleanup", str(root), "--report", str(report), "--format", "jsonl", "--jobs", "2", *extra]
+        try:
+            cleanup_main()
+        finally:
+            sys.argv = argv
+        lines = report.read_text(encoding="utf-8").splitlines()
+        return sorted((json.loads(line) for line in lines), key=lambda item: item["path"])
+
+    planned = run(tmp_path / "dry.jsonl", "--dry-run")
+    deleted = run(tmp_path / "real.jsonl")
+
+    assert [item["path"] for item in planned] == [item["path"] for item in deleted]
+    assert {item["status"] for item in planned} == {"dry-run"}
+    assert {item["status"] for item in deleted} == {"deleted"}
+    out = capsys.readouterr().out
+    assert "Reclaimed: 6 bytes" in out
+    assert not any(root.rglob("tiny.png"))
+    assert len(list(root.rglob("big.jpg"))) == 3
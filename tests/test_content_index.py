@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+from orgpicsvideos.core.content_index import ContentIndex, default_index_path
+from orgpicsvideos.core.copier import execute_plan
+from orgpicsvideos.core.hashing import PARTIAL, DuplicateFinder, FileRef
+from orgpicsvideos.core.planner import build_plan
+from orgpicsvideos.core.types import (
+    MediaFile,
+    MediaType,
+    OperationType,
+    PlannedOperation,
+    SkipReason,
+)
+from orgpicsvideos.ui.app import ScanWorker
+
+
+def _media(path: Path) -> MediaFile:
+    stat = path.stat()
+    return MediaFile(
+        path, datetime(2020, 3, 5), MediaType.IMAGE, size=stat.st_size, mtime_ns=stat.st_mtime_ns
+    )
+
+
+def test_populate_indexes_media_and_skips_state_dir(tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    filed = dest / "2019" / "dec" / "pics"
+    filed.mkdir(parents=True)
+    (filed / "IMG_0001.JPG").write_bytes(b"photo")
+    (filed / "._IMG_0001.JPG").write_bytes(b"sidecar")
+    (filed / "notes.txt").write_text("not media")
+
+    with ContentIndex(default_index_path(dest)) as index:
+        assert not index.populated
+        assert index.populate(dest) == 1
+        assert index.populated
+        assert index.with_sizes([5]) == [
+            FileRef(filed / "IMG_0001.JPG", 5, (filed / "IMG_0001.JPG").stat().st_mtime_ns)
+        ]
+
+
+def test_execute_plan_keeps_index_in_step(tmp_path: Path) -> None:
+    source = tmp_path / "src.JPG"
+    source.write_bytes(b"photo")
+    dest = tmp_path / "dest"
+    copied = dest / "a" / "IMG.JPG"
+    moved = dest / "b" / "IMG.JPG"
+
+    with ContentIndex(default_index_path(dest)) as index:
+        execute_plan(
+            [
+                PlannedOperation(OperationType.MKDIR, None, copied.parent),
+                PlannedOperation(OperationType.COPY, source, copied, MediaType.IMAGE),
+            ],
+            lambda _: None,
+            index=index,
+        )
+        ref = index.with_sizes([5])[0]
+        assert ref.path == copied
+        index.put_digest(copied, PARTIAL, ref.size, ref.mtime_ns, "digest")
+
+        execute_plan(
+            [
+                PlannedOperation(OperationType.MKDIR, None, moved.parent),
+                PlannedOperation(OperationType.MOVE, copied, moved, MediaType.IMAGE),
+            ],
+            lambda _: None,
+            index=index,
+        )
+        # Moves keep their digests.
+        assert [ref.path for ref in index.with_sizes([5])] == [moved]
+        assert index.get_digest(moved, PARTIAL, ref.size, ref.mtime_ns) == "digest"
+
+        delete = PlannedOperation(OperationType.DELETE, None, moved)
+        execute_plan([delete], lambda _: None, index=index)
+        assert index.count() == 0
+
+
+def test_build_plan_finds_content_filed_under_another_month(tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    elsewhere = dest / "2019" / "dec" / "pics"
+    elsewhere.mkdir(parents=True)
+    (elsewhere / "IMG_0001.JPG").write_bytes(b"photo one")
+    source = tmp_path / "src"
+    source.mkdir()
+    again = source / "IMG_0001.JPG"
+    again.write_bytes(b"photo one")
+    fresh = source / "IMG_0002.JPG"
+    fresh.write_bytes(b"photo two")
+    media = [_media(again), _media(fresh)]
+
+    # Without the index only the target folder (2020/mar) is compared.
+    plan = build_plan(media, dest, duplicates=DuplicateFinder())
+    assert plan.skipped_duplicates == 0
+
+    with ContentIndex(default_index_path(dest)) as index:
+        index.populate(dest)
+        plan = build_plan(media, dest, duplicates=DuplicateFinder(index=index))
+
+    assert [(s.source, s.reason) for s in plan.skipped_files] == [
+        (again, SkipReason.CONTENT_DUPLICATE)
+    ]
+    copies = [op.source for op in plan.operations if op.op_type == OperationType.COPY]
+    assert copies == [fresh]
+
+
+def test_deleted_library_file_does_not_block_reimport(tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    source = tmp_path / "src"
+    source.mkdir()
+    a = source / "a.JPG"
+    a.write_bytes(b"photo aaa")
+    b = source / "b.JPG"
+    b.write_bytes(b"photo bbb")
+
+    with ContentIndex(default_index_path(dest)) as index:
+        for path in (a, b):
+            plan = build_plan([_media(path)], dest, duplicates=DuplicateFinder(index=index))
+            execute_plan(plan.operations, lambda _: None, index=index)
+        filed = dest / "2020" / "mar" / "pics"
+        # Hash both library files so their digests are stored in the index.
+        plan = build_plan([_media(a)], dest, duplicates=DuplicateFinder(index=index))
+        assert plan.skipped_duplicates == 1
+        (filed / "a.JPG").unlink()
+
+        again = tmp_path / "again.JPG"
+        again.write_bytes(a.read_bytes())
+        plan = build_plan([_media(again)], dest, duplicates=DuplicateFinder(index=index))
+
+        assert plan.skipped_duplicates == 0
+        assert [op.source for op in plan.operations if op.op_type == OperationType.COPY] == [
+            again
+        ]
+        assert [ref.path for ref in index.with_sizes([9])] == [filed / "b.JPG"]
+
+
+def test_gui_scan_leaves_new_or_unindexed_destinations_alone(tmp_path: Path) -> None:
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "IMG_0001.JPG").write_bytes(b"photo")
+    plans = []
+
+    missing = tmp_path / "new-dest"
+    worker = ScanWorker(source, missing)
+    worker.finished.connect(plans.append)
+    worker.run()
+    assert not missing.exists()
+
+    existing = tmp_path / "dest"
+    existing.mkdir()
+    worker = ScanWorker(source, existing, use_index=False)
+    worker.finished.connect(plans.append)
+    worker.run()
+    assert not default_index_path(existing).exists()
+
+    assert [plan.total_files for plan in plans] == [1, 1]
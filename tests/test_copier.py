@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 from pathlib import Path
+import threading
+import time
 
+import pytest
+
+from orgpicsvideos.core.cancel import CancelToken, OperationCancelled
 from orgpicsvideos.core.copier import execute_plan
 from orgpicsvideos.core.types import OperationType, PlannedOperation
 
@@ -24,3 +29,67 @@ def test_execute_plan_creates_and_copies(tmp_path: Path) -> None:
     assert dest_file.exists()
     assert any("mkdir" in line for line in logs)
     assert any("copy" in line for line in logs)
+
+
+def test_execute_plan_parallel_runs_every_operation(tmp_path: Path) -> None:
+    dest_dir = tmp_path / "dest"
+    ops = [PlannedOperation(op_type=OperationType.MKDIR, source=None, destination=dest_dir)]
+    for idx in range(20):
+        src = tmp_path / f"src{idx}.jpg"
+        src.write_bytes(str(idx).encode())
+        ops.append(PlannedOperation(op_type=OperationType.COPY, source=src, destination=dest_dir / src.name))
+
+    logs: list[str] = []
+    progress: list[int] = []
+    execute_plan(ops, logs.append, lambda done, total: progress.append(done), jobs=4)
+
+    assert len(logs) == len(ops)
+    assert logs[0].startswith("mkdir")
+    assert progress == list(range(1, len(ops) + 1))
+    assert all((dest_dir / f"src{idx}.jpg").exists() for idx in range(20))
+
+
+def test_execute_plan_cancel_logs_every_started_operation(tmp_path: Path) -> None:
+    dest_dir = tmp_path / "dest"
+    dest_dir.mkdir()
+    ops = []
+    for idx in range(50):
+        src = tmp_path / f"{idx}.jpg"
+        src.write_bytes(b"x")
+        ops.append(PlannedOperation(op_type=OperationType.COPY, source=src, destination=dest_dir / src.name))
+
+    token = CancelToken()
+    logs: list[str] = []
+
+    def op_cb(op: PlannedOperation, success: bool) -> None:
+        if len(logs) == 10:
+            token.cancel()
+
+    with pytest.raises(OperationCancelled):
+        execute_plan(ops, logs.append, op_cb=op_cb, jobs=4, cancel=token)
+
+    copied = sorted(path.name for path in dest_dir.iterdir())
+    # Everything that ran was reported, and nothing ran unreported.
+    assert len(logs) == len(copied)
+    assert len(logs) < len(ops)
+    assert all(line.endswith("[SUCCESS]") for line in logs)
+
+
+def test_execute_plan_pause_blocks_until_resumed(tmp_path: Path) -> None:
+    src = tmp_path / "a.jpg"
+    src.write_bytes(b"x")
+    ops = [
+        PlannedOperation(op_type=OperationType.COPY, source=src, destination=tmp_path / "out" / f"{idx}.jpg")
+        for idx in range(3)
+    ]
+    token = CancelToken()
+    token.pause()
+    logs: list[str] = []
+    worker = threading.Thread(target=execute_plan, args=(ops, logs.append), kwargs={"cancel": token})
+    worker.start()
+    time.sleep(0.2)
+    assert logs == []
+
+    token.resume()
+    worker.join(timeout=5)
+    assert len(logs) == 3
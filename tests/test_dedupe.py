@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import sys
+
+import pytest
+
+from orgpicsvideos.core.dedupe import FileSpool, find_duplicates, replace_with_link, spool_library
+from orgpicsvideos.dedupe import main as dedupe_main
+
+
+def _library(root: Path) -> dict[str, Path]:
+    jan = root / "2020" / "jan" / "pics"
+    mar = root / "2020" / "mar" / "pics"
+    jan.mkdir(parents=True)
+    mar.mkdir(parents=True)
+    paths = {
+        "original": jan / "IMG_0001.JPG",
+        "suffixed": jan / "IMG_0001_1.JPG",
+        "elsewhere": mar / "IMG_0001.JPG",
+        "different": jan / "IMG_0002.JPG",
+        "notes": jan / "notes.txt",
+    }
+    data = b"x" * 200_000
+    for key in ("original", "suffixed", "elsewhere"):
+        paths[key].write_bytes(data)
+    # Same size, head and tail; only the full hash tells it apart.
+    paths["different"].write_bytes(data[:100_000] + b"y" + data[100_001:])
+    paths["notes"].write_bytes(data)
+    return paths
+
+
+def _run(*args: str) -> None:
+    argv = sys.argv
+    sys.argv = ["dedupe", *args]
+    try:
+        dedupe_main()
+    finally:
+        sys.argv = argv
+
+
+def test_dedupe_dry_run_reports_without_changes(tmp_path: Path, capsys) -> None:
+    root = tmp_path / "lib"
+    paths = _library(root)
+    report = tmp_path / "report.jsonl"
+
+    _run(str(root), "--dry-run", "--format", "jsonl", "--report", str(report), "--jobs", "1")
+
+    lines = [json.loads(line) for line in report.read_text(encoding="utf-8").splitlines()]
+    assert sorted(item["path"] for item in lines) == sorted(
+        [str(paths["elsewhere"]), str(paths["suffixed"])]
+    )
+    assert {item["original"] for item in lines} == {str(paths["original"])}
+    assert {item["status"] for item in lines} == {"dry-run"}
+    assert "Reclaimable: 400000 bytes" in capsys.readouterr().out
+    assert not os.path.samefile(paths["original"], paths["suffixed"])
+    assert not list(root.glob("*.log"))
+
+
+def test_dedupe_links_duplicates_in_process_pool(tmp_path: Path, capsys) -> None:
+    root = tmp_path / "lib"
+    paths = _library(root)
+
+    _run(str(root), "--jobs", "2")
+
+    assert os.path.samefile(paths["original"], paths["suffixed"])
+    assert os.path.samefile(paths["original"], paths["elsewhere"])
+    assert not os.path.samefile(paths["original"], paths["different"])
+    assert not os.path.samefile(paths["original"], paths["notes"])
+    assert "Linked 2 duplicates" in capsys.readouterr().out
+    log_text = next(root.glob("*.log")).read_text(encoding="utf-8")
+    assert f"link {paths['suffixed']} -> {paths['original']} [SUCCESS]" in log_text
+
+    # Already linked files are one inode, so a second run finds nothing.
+    with FileSpool() as spool:
+        spool_library(root, spool)
+        assert list(find_duplicates(spool)) == []
+
+
+def test_replace_with_link_refuses_changed_files(tmp_path: Path) -> None:
+    root = tmp_path / "lib"
+    paths = _library(root)
+    with FileSpool() as spool:
+        spool_library(root, spool)
+        dup_set = next(iter(find_duplicates(spool)))
+    kept, duplicate = dup_set.inodes[0], dup_set.inodes[1]
+    target = Path(duplicate.paths[0])
+    target.write_bytes(b"z" * dup_set.size)
+    os.utime(target, ns=(0, duplicate.mtime_ns + 1_000_000_000))
+
+    with pytest.raises(OSError, match="changed since it was hashed"):
+        replace_with_link(kept.paths[0], kept, str(target), duplicate, dup_set.size)
+    assert target.read_bytes() == b"z" * dup_set.size
+    assert not any(name.endswith(f"dedupe-{os.getpid()}") for name in os.listdir(target.parent))
+    assert paths["original"].exists()
@@ -8,6 +8,8 @@ from PySide6 import QtWidgets
 from orgpicsvideos.core.planner import build_plan
 from orgpicsvideos.core.types import MediaFile, MediaType
 from orgpicsvideos.ui.app import MainWindow
+from orgpicsvideos.ui.execution_progress import ExecutionProgress
+from orgpicsvideos.ui.plan_index import PlanIndex
 
 
 def _get_or_create_app() -> QtWidgets.QApplication:
@@ -41,8 +43,46 @@ def test_execution_partial_status(tmp_path: Path) -> None:
 
     # Simulate one copy success.
     dest_file = dest / "2002" / "sep" / "pics" / "a.jpg"
-    window._on_op_status("copy", str(dest_file), True)
+    op_index = next(idx for idx, op in enumerate(plan.operations) if op.destination == dest_file)
+    window._apply_op_results([(op_index, True)])
 
     # Parent directory should be marked partial.
-    dir_item = window._execution_node_map[dest / "2002" / "sep" / "pics"]
-    assert "(partial)" in dir_item.text(0)
+    model = window.execution_model
+    dir_index = model.dir_index(dest / "2002" / "sep" / "pics")
+    assert "(partial)" in dir_index.data()
+
+
+def test_execution_progress_marks_only_dirty_ancestors(tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    (dest / "2002" / "sep" / "pics").mkdir(parents=True)
+    src = tmp_path / "src"
+    media = [
+        MediaFile(path=src / "a.jpg", created_at=datetime(2002, 9, 27), media_type=MediaType.IMAGE),
+        MediaFile(path=src / "b.mp4", created_at=datetime(2003, 1, 2), media_type=MediaType.VIDEO),
+    ]
+    plan = build_plan(media, dest)
+    index = PlanIndex(plan, dest)
+    progress = ExecutionProgress(index)
+
+    pics = index.dir_id(dest / "2002" / "sep" / "pics")
+    videos = index.dir_id(dest / "2003" / "jan" / "videos")
+    # Existence comes from the plan, not from probing the filesystem.
+    assert index.dir_exists[pics] == 1
+    assert index.dir_exists[index.dir_id(dest / "2002")] == 1
+    assert index.dir_exists[videos] == 0
+
+    copy_index = next(
+        idx
+        for idx, op in enumerate(plan.operations)
+        if op.op_type.value == "copy" and op.destination.parent == dest / "2002" / "sep" / "pics"
+    )
+    progress.record(copy_index, False)
+    dirs, files = progress.take_dirty()
+    assert dirs == set(index.ancestors(pics))
+    assert videos not in dirs
+    assert len(files) == 1
+    assert progress.dir_status(pics) == "failed"
+    assert progress.dir_status(0) == "failed"
+    assert progress.dir_status(videos) == "pending"
+    assert progress.take_dirty() == (set(), [])
+
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+import time
+
+from benchmarks.corpus import ensure_corpus
+from orgpicsvideos.core.copier import execute_plan
+from orgpicsvideos.core.fs import LocalFS, ThrottledFS, current_fs, use_fs
+from orgpicsvideos.core.planner import build_plan
+from orgpicsvideos.core.rebuild import rebuild_destination
+from orgpicsvideos.core.scanner import scan_media
+
+
+def test_core_calls_go_through_the_active_filesystem(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    ensure_corpus(source, 40)
+    expected = sorted((m.path, m.created_at) for m in scan_media(source))
+    library = tmp_path / "library"
+    ensure_corpus(library, 20, seed=1)
+
+    fs = ThrottledFS()
+    with use_fs(fs):
+        media = list(scan_media(source, jobs=2))
+        plan = build_plan(media, tmp_path / "dest")
+        execute_plan(plan.operations, lambda line: None, jobs=2)
+        summary = rebuild_destination(library, tmp_path / "rebuild.log")
+    assert isinstance(current_fs(), LocalFS) and current_fs() is not fs
+
+    assert sorted((m.path, m.created_at) for m in media) == expected
+    assert fs.calls["scandir"] >= 2
+    assert fs.calls["stat"] >= 40
+    assert fs.calls["open"] >= 40 + 20
+    assert fs.calls["copy"] == 40
+    # Stamp probes are filesystem calls too, so a slow link pays for them.
+    assert fs.calls["getxattr"] >= 40
+    assert fs.calls["mkdir"] >= plan.total_dirs
+    assert fs.calls["rename"] == summary.moved == 20
+    assert sum(1 for path in (tmp_path / "dest").rglob("*") if path.is_file()) == 40
+
+
+def test_latency_rewards_parallel_scans(tmp_path: Path) -> None:
+    ensure_corpus(tmp_path, 60)
+    list(scan_media(tmp_path))  # import the extractors before timing
+
+    timings = {}
+    for jobs in (1, 8):
+        with use_fs(ThrottledFS(latency=0.005, listing_stats=True)):
+            start = time.perf_counter()
+            assert len(list(scan_media(tmp_path, jobs=jobs))) == 60
+            timings[jobs] = time.perf_counter() - start
+
+    assert timings[1] >= 60 * 0.005
+    assert timings[8] < timings[1] / 2
+
+
+def test_bandwidth_cap_is_shared_by_reads_and_copies(tmp_path: Path) -> None:
+    source = tmp_path / "big.bin"
+    source.write_bytes(b"\0" * 100 * 1024)
+    fs = ThrottledFS(bandwidth=1024 * 1024)
+
+    start = time.perf_counter()
+    with fs.open(source) as handle:
+        assert len(handle.read()) == 100 * 1024
+    fs.copy(source, tmp_path / "copy.bin")
+    elapsed = time.perf_counter() - start
+
+    assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+    assert elapsed >= 0.19
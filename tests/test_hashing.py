@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import datetime
+import os
+from pathlib import Path
+
+from orgpicsvideos.core.cache import MetadataCache
+from orgpicsvideos.core.hashing import PARTIAL_BYTES, DuplicateFinder, FileRef
+from orgpicsvideos.core.planner import build_plan
+from orgpicsvideos.core.types import MediaFile, MediaType, SkipReason
+
+
+def _ref(path: Path) -> FileRef:
+    stat = path.stat()
+    return FileRef(path, stat.st_size, stat.st_mtime_ns)
+
+
+def _media(path: Path) -> MediaFile:
+    stat = path.stat()
+    return MediaFile(
+        path, datetime(2020, 1, 5), MediaType.IMAGE, size=stat.st_size, mtime_ns=stat.st_mtime_ns
+    )
+
+
+def test_finder_stages_hashing_by_size_then_partial_then_full(tmp_path: Path) -> None:
+    big = b"a" * (3 * PARTIAL_BYTES)
+    # Same size, same head and tail: only the full hash tells these apart.
+    middle = bytearray(big)
+    middle[len(big) // 2] = ord("b")
+    files = {
+        "orig.jpg": big,
+        "renamed (1).jpg": big,
+        "middle.jpg": bytes(middle),
+        "lonely.jpg": b"x" * 10,
+    }
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+
+    finder = DuplicateFinder(jobs=2)
+    names = ("renamed (1).jpg", "middle.jpg", "lonely.jpg")
+    candidates = [("g", _ref(tmp_path / name)) for name in names]
+    matches = finder.find(candidates, known=[("g", _ref(tmp_path / "orig.jpg"))])
+
+    assert matches == {0: tmp_path / "orig.jpg"}
+    # Three same-size files get a partial and a full hash; the lonely file is never read.
+    assert finder.bytes_hashed == 3 * 2 * PARTIAL_BYTES + 3 * len(big)
+
+
+def test_finder_reuses_cached_digests(tmp_path: Path) -> None:
+    for name in ("a.jpg", "b.jpg"):
+        (tmp_path / name).write_bytes(b"same content")
+    refs = [("g", _ref(tmp_path / name)) for name in ("a.jpg", "b.jpg")]
+
+    with MetadataCache(tmp_path / "cache.sqlite") as cache:
+        assert DuplicateFinder(cache=cache).find(refs) == {1: tmp_path / "a.jpg"}
+        finder = DuplicateFinder(cache=cache)
+        assert finder.find(refs) == {1: tmp_path / "a.jpg"}
+        assert finder.bytes_hashed == 0
+
+
+def test_build_plan_skips_content_duplicates(tmp_path: Path) -> None:
+    source = tmp_path / "src"
+    source.mkdir()
+    dest = tmp_path / "dest"
+    target = dest / "2020" / "jan" / "pics"
+    target.mkdir(parents=True)
+    (target / "IMG_0001.JPG").write_bytes(b"photo one")
+    (target / "IMG_0002.JPG").write_bytes(b"photo two")
+
+    renamed = source / "IMG_0001 (1).JPG"
+    renamed.write_bytes(b"photo one")
+    # Same name and size as an existing file, different content.
+    different = source / "IMG_0002.JPG"
+    different.write_bytes(b"photo 2!!")
+    existing_stat = (target / "IMG_0002.JPG").stat()
+    os.utime(different, ns=(existing_stat.st_atime_ns, existing_stat.st_mtime_ns))
+    twin_dir = source / "twin"
+    twin_dir.mkdir()
+    first = source / "new.JPG"
+    first.write_bytes(b"brand new")
+    twin = twin_dir / "copy of new.JPG"
+    twin.write_bytes(b"brand new")
+
+    media = [_media(path) for path in (renamed, different, first, twin)]
+    plan = build_plan(media, dest, duplicates=DuplicateFinder())
+
+    skipped = {s.source: s.reason for s in plan.skipped_files}
+    assert skipped == {
+        renamed: SkipReason.CONTENT_DUPLICATE,
+        twin: SkipReason.CONTENT_DUPLICATE,
+    }
+    copies = sorted(op.destination.name for op in plan.operations if op.op_type.value == "copy")
+    assert copies == ["IMG_0002_1.JPG", "new.JPG"]
+    assert plan.skipped_duplicates == 2
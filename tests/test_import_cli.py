@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+from orgpicsvideos.core.logger import find_latest_log
+from orgpicsvideos.importer import main as import_main
+
+
+def _run_import(*args: str) -> None:
+    argv = sys.argv
+    sys.argv = ["orgpicsvideos-import", *args]
+    try:
+        import_main()
+    finally:
+        sys.argv = argv
+
+
+def _make_source(tmp_path: Path) -> Path:
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.jpg").write_bytes(b"a" * 100)
+    (source / "b.jpg").write_bytes(b"b" * 300)
+    (source / "c.mp4").write_bytes(b"c" * 600)
+    return source
+
+
+def test_import_copies_and_reports_json_progress(tmp_path: Path, capsys) -> None:
+    source = _make_source(tmp_path)
+    dest = tmp_path / "dest"
+
+    _run_import(str(source), str(dest), "--jobs", "2", "--progress-interval", "0")
+
+    captured = capsys.readouterr()
+    records = [json.loads(line) for line in captured.out.splitlines()]
+    copy = [r for r in records if r["event"] == "progress" and r["phase"] == "copy"]
+    assert copy[-1]["files"] == copy[-1]["files_total"] == 3
+    assert copy[-1]["bytes"] == copy[-1]["bytes_total"] == 1000
+    assert copy[-1]["eta"] == 0
+    summary = records[-1]
+    assert summary["event"] == "summary"
+    assert summary["copied"] == 3 and summary["failed"] == 0
+    assert "Import complete: found=3 copied=3" in captured.err
+    copied = sorted(p.name for p in dest.glob("*/*/*/*") if p.is_file())
+    assert copied == ["a.jpg", "b.jpg", "c.mp4"]
+
+
+def test_import_resume_writes_progress_to_fd(tmp_path: Path, capsys) -> None:
+    source = _make_source(tmp_path)
+    dest = tmp_path / "dest"
+    _run_import(str(source), str(dest), "--jobs", "1")
+    capsys.readouterr()
+    first_log = find_latest_log(dest)
+    assert first_log is not None
+    (source / "d.jpg").write_bytes(b"d" * 50)
+    # Log names have one-second resolution; keep the second run's log newer.
+    os.utime(first_log, (0, 0))
+    first_log.rename(first_log.with_name("00000000_000000.log"))
+
+    read_fd, write_fd = os.pipe()
+    try:
+        _run_import(str(source), str(dest), "--resume", "--progress-fd", str(write_fd))
+    finally:
+        os.close(write_fd)
+    with os.fdopen(read_fd, encoding="utf-8") as handle:
+        records = [json.loads(line) for line in handle]
+
+    captured = capsys.readouterr()
+    assert captured.out.startswith("Import complete: found=4 copied=1")
+    plan = next(r for r in records if r["event"] == "plan")
+    assert plan["to_copy"] == 1 and plan["skipped_resume"] == 3
+    latest = find_latest_log(dest)
+    assert latest is not None
+    assert "RESUME: enabled=yes skipped_resume=3" in latest.read_text(encoding="utf-8")
+
+
+def test_import_never_imports_qt(tmp_path: Path) -> None:
+    source = _make_source(tmp_path)
+    dest = tmp_path / "dest"
+    code = (
+        "import sys\n"
+        "from orgpicsvideos.importer import main\n"
+        f"sys.argv = ['orgpicsvideos-import', {str(source)!r}, {str(dest)!r}]\n"
+        "main()\n"
+        "assert not [m for m in sys.modules if m.startswith('PySide6')], 'Qt imported'\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.splitlines()[-1])["event"] == "summary"
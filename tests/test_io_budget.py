@@ -0,0 +1,142 @@
+"""Filesystem-call budgets for the hot paths.
+
+Counts come from ``benchmarks.iocount`` (the ``io_counter`` fixture) and
+are deterministic for a given corpus, so a change that adds a probe per file
+fails here instead of only showing up as a slower benchmark.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+import shutil
+
+import pytest
+
+from benchmarks.corpus import ensure_corpus
+from orgpicsvideos.cleanup import iter_batches
+from orgpicsvideos.core.copier import execute_plan
+from orgpicsvideos.core.deleter import delete_batches
+from orgpicsvideos.core.metrics import METRICS
+from orgpicsvideos.core.planner import build_plan
+from orgpicsvideos.core.rebuild import rebuild_destination
+from orgpicsvideos.core.scanner import scan_media
+from orgpicsvideos.core.types import MediaFile, MediaType, OperationType
+
+FILES = 600
+PAYLOAD_KB = 64
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    root = tmp_path_factory.mktemp("io-budget") / "corpus"
+    ensure_corpus(root, FILES, seed=7, payload_kb=PAYLOAD_KB)
+    # Import the extractors outside any counted block; their imports stat a lot.
+    list(scan_media(root))
+    return root
+
+
+@pytest.fixture
+def media(corpus: Path) -> list[MediaFile]:
+    return list(scan_media(corpus))
+
+
+def _dirs(root: Path) -> int:
+    return sum(1 for path in root.rglob("*") if path.is_dir()) + 1
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_scan_stats_each_file_once_and_reads_only_headers(io_counter, corpus, jobs) -> None:
+    dirs = _dirs(corpus)
+    with io_counter() as io:
+        found = list(scan_media(corpus, jobs=jobs))
+
+    assert len(found) == FILES
+    assert io.stats <= FILES
+    assert io["scandir"] <= dirs
+    assert io["open"] <= FILES + dirs
+    assert io["read_bytes"] < FILES * 4096
+    # One stamp probe per uncached file, even in a library that was never stamped.
+    assert io["xattr"] <= FILES
+
+
+def test_plan_into_empty_destination_does_not_stat(io_counter, media, tmp_path) -> None:
+    with io_counter() as io:
+        plan = build_plan(media, tmp_path / "dest")
+
+    assert plan.total_files == FILES
+    assert io.stats == 0
+    assert io["scandir"] <= 2 * plan.total_dirs
+
+
+def test_replan_and_copy_stay_linear(io_counter, corpus, media, tmp_path) -> None:
+    destination = tmp_path / "dest"
+    plan = build_plan(media, destination)
+    copies = sum(op.op_type == OperationType.COPY for op in plan.operations)
+    with io_counter() as io:
+        execute_plan(plan.operations, lambda line: None)
+    # shutil's own samefile/stat/copystat checks; none are per-op mkdirs.
+    assert io.stats <= 5 * copies
+    assert io["mkdir"] <= 3 * plan.total_dirs
+
+    with io_counter() as io:
+        replan = build_plan(list(scan_media(corpus)), destination)
+    assert replan.total_files == 0
+    assert io.stats <= 2 * FILES
+
+
+def test_colliding_names_probe_each_suffix_once(io_counter, tmp_path) -> None:
+    taken = datetime(2020, 5, 17, 12, 0, 0)
+    media = [
+        MediaFile(tmp_path / f"card{index}" / "IMG_0001.JPG", taken, MediaType.IMAGE, 10, index)
+        for index in range(200)
+    ]
+    METRICS.enable()
+    try:
+        with io_counter() as io:
+            plan = build_plan(media, tmp_path / "dest")
+        counters = METRICS.snapshot()["counters"]
+    finally:
+        METRICS.disable()
+        METRICS.reset()
+
+    assert len({op.destination for op in plan.operations if op.destination}) == 201
+    assert counters["plan.unique_path.probes"] <= 2 * len(media)
+    assert io.stats == 0
+
+
+@pytest.mark.parametrize("organized", [False, True])
+def test_rebuild_stats_per_directory_not_per_file(
+    io_counter, corpus, media, tmp_path, organized
+) -> None:
+    library = tmp_path / "library"
+    if organized:
+        plan = build_plan(media, library)
+        execute_plan(plan.operations, lambda line: None)
+    else:
+        shutil.copytree(corpus, library)
+    log_path = tmp_path / "rebuild.log"
+
+    with io_counter() as io:
+        summary = rebuild_destination(library, log_path, jobs=2)
+
+    assert summary.total_files == FILES
+    assert io["entry_stat"] <= FILES
+    assert io["stat"] <= FILES // 10 + _dirs(library)
+    assert io["rename"] == summary.moved
+    if organized:
+        assert summary.moved == 0
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_cleanup_stats_each_file_once(io_counter, tmp_path, jobs) -> None:
+    root = tmp_path / "cleanup"
+    ensure_corpus(root, 200, seed=1)
+    files = sum(1 for path in root.rglob("*") if path.is_file())
+
+    with io_counter() as io:
+        summary = delete_batches(iter_batches(root, 1024, jobs), jobs=jobs)
+
+    assert summary.deleted > 0
+    assert io.stats <= files
+    assert io["unlink"] == summary.deleted
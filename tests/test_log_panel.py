@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import os
+
+from PySide6 import QtWidgets
+
+from orgpicsvideos.ui.log_panel import LogPanel
+
+
+def _get_or_create_app() -> QtWidgets.QApplication:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication([])
+    return app
+
+
+def test_log_panel_keeps_only_recent_lines() -> None:
+    _get_or_create_app()
+    panel = LogPanel(capacity=5)
+
+    panel.append_lines(f"copy a{idx} -> b{idx} [SUCCESS]" for idx in range(8))
+    panel.append_lines(["copy x -> y [FAIL] reason=disk full"])
+
+    assert len(panel.lines()) == 5
+    assert panel.lines()[-1].endswith("reason=disk full")
+    assert panel.view.document().blockCount() == 5
+
+
+def test_log_panel_failure_filter() -> None:
+    _get_or_create_app()
+    panel = LogPanel(capacity=100)
+    panel.append_lines(["copy a -> b [SUCCESS]", "copy c -> d [FAIL] reason=x"])
+
+    panel.fail_only_check.setChecked(True)
+    assert panel.view.toPlainText() == "copy c -> d [FAIL] reason=x"
+
+    panel.append_lines(["copy e -> f [SUCCESS]", "copy g -> h [FAIL] reason=y"])
+    assert panel.view.toPlainText().splitlines() == [
+        "copy c -> d [FAIL] reason=x",
+        "copy g -> h [FAIL] reason=y",
+    ]
+
+    panel.fail_only_check.setChecked(False)
+    assert len(panel.view.toPlainText().splitlines()) == 4
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from pathlib import Path
+
+from orgpicsvideos.core import scanner
+from orgpicsvideos.core.cache import MetadataCache
+from orgpicsvideos.core.logger import make_log_path
+from orgpicsvideos.core.rebuild import rebuild_destination
+from orgpicsvideos.core.types import MediaType
+
+
+def test_cache_skips_extraction_for_unchanged_files(monkeypatch, tmp_path: Path) -> None:
+    (tmp_path / "a.jpg").write_bytes(b"abc")
+    (tmp_path / "b.mp4").write_bytes(b"def")
+    calls: list[Path] = []
+
+    def fake_creation_time(
+        path: Path, media_type: MediaType | None = None, stat: os.stat_result | None = None
+    ) -> datetime:
+        calls.append(path)
+        return datetime(2002, 9, 27)
+
+    monkeypatch.setattr(scanner, "get_creation_time", fake_creation_time)
+    with MetadataCache(tmp_path / "cache.sqlite") as cache:
+        first = list(scanner.scan_media(tmp_path, jobs=2, cache=cache))
+        second = list(scanner.scan_media(tmp_path, jobs=2, cache=cache))
+
+        assert len(calls) == 2
+        assert {m.created_at for m in second} == {datetime(2002, 9, 27)}
+        assert sorted(m.path for m in first) == sorted(m.path for m in second)
+
+        # A changed mtime invalidates the entry.
+        os.utime(tmp_path / "a.jpg", (0, 0))
+        list(scanner.scan_media(tmp_path, cache=cache))
+        assert len(calls) == 3
+
+
+def test_parallel_rebuild_rekeys_cache(tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    mtime = datetime(2002, 9, 27, 10, 0, 0).timestamp()
+    for name in ("a.jpg", "b.jpg", "c.mp4"):
+        path = dest / name
+        path.write_bytes(name.encode())
+        os.utime(path, (mtime, mtime))
+
+    with MetadataCache(tmp_path / "cache.sqlite") as cache:
+        summary = rebuild_destination(dest, make_log_path(dest), jobs=4, cache=cache)
+        assert summary.moved == 3
+        moved = dest / "2002" / "sep" / "pics" / "a.jpg"
+        assert moved.exists()
+        stat = moved.stat()
+        assert cache.get(moved, stat.st_size, stat.st_mtime_ns) is not None
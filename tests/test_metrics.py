@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+import time
+
+import pytest
+
+from orgpicsvideos.core.logger import find_latest_log
+from orgpicsvideos.core.metrics import METRICS, Metrics, format_metrics_report, timed
+from orgpicsvideos.core.scanner import scan_media
+from orgpicsvideos.importer import main as import_main
+
+
+@pytest.fixture(autouse=True)
+def _disable_metrics():
+    yield
+    METRICS.disable()
+    METRICS.reset()
+
+
+def test_metrics_are_noop_until_enabled_and_derive_rates() -> None:
+    metrics = Metrics()
+    metrics.incr("scan.stat")
+    with metrics.timer("scan"):
+        pass
+    assert metrics.snapshot() == {"counters": {}, "histograms": {}, "rates": {}}
+
+    metrics.enable()
+    metrics.incr("exec.copy.bytes", 3 * 1024 * 1024)
+    metrics.incr("exec.copy.bytes", 1024 * 1024)
+    metrics.observe("exec", 2.0)
+    metrics.observe("exec", 2.0)
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"exec.copy.bytes": 4 * 1024 * 1024}
+    assert snapshot["histograms"]["exec"] == {
+        "count": 2,
+        "sum": 4.0,
+        "mean": 2.0,
+        "min": 2.0,
+        "max": 2.0,
+    }
+    assert snapshot["rates"] == {"exec.copy.mb_per_s": 1.0}
+    assert "  exec.copy.mb_per_s: 1.0 MB/s" in format_metrics_report(snapshot)
+
+
+def test_timed_functions_record_only_while_enabled() -> None:
+    @timed("plan")
+    def plan(value: int) -> int:
+        return value * 2
+
+    assert plan(2) == 4
+    assert METRICS.snapshot()["histograms"] == {}
+    METRICS.enable()
+    assert plan(3) == 6
+    assert METRICS.snapshot()["histograms"]["plan"]["count"] == 1
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_scan_timer_leaves_out_the_consumer(tmp_path: Path, jobs: int) -> None:
+    for index in range(5):
+        (tmp_path / f"IMG_{index}.JPG").write_bytes(b"x")
+    METRICS.enable()
+
+    for _ in scan_media(tmp_path, jobs=jobs):
+        time.sleep(0.05)
+
+    scan = METRICS.snapshot()["histograms"]["scan"]
+    assert scan["count"] == 1
+    assert scan["sum"] < 5 * 0.05
+
+
+def test_import_with_metrics_appends_them_to_the_log(tmp_path: Path, capsys) -> None:
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.jpg").write_bytes(b"a" * 100)
+    (source / "b.mp4").write_bytes(b"b" * 300)
+    dest = tmp_path / "dest"
+
+    argv = sys.argv
+    sys.argv = ["orgpicsvideos-import", str(source), str(dest), "--jobs", "2", "--metrics"]
+    try:
+        import_main()
+    finally:
+        sys.argv = argv
+
+    log_path = find_latest_log(dest)
+    assert log_path is not None
+    last = log_path.read_text(encoding="utf-8").splitlines()[-1]
+    assert last.startswith("METRICS: ")
+    snapshot = json.loads(last[len("METRICS: ") :])
+    assert snapshot["counters"]["scan.files"] == 2
+    assert snapshot["counters"]["exec.copy.ok"] == 2
+    assert snapshot["counters"]["exec.copy.bytes"] == 400
+    assert {"scan", "plan", "exec", "exec.copy", "log.write"} <= snapshot["histograms"].keys()
+    assert "exec.copy.mb_per_s" in snapshot["rates"]
+    err = capsys.readouterr().err
+    assert "Performance:" in err
+    assert "MB/s" in err
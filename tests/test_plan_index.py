@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+from orgpicsvideos.core.planner import build_plan
+from orgpicsvideos.core.types import MediaFile, MediaType
+from orgpicsvideos.ui.plan_index import FILE_COPY, FILE_SKIPPED, PlanIndex
+
+
+def test_plan_index_groups_files_by_directory(tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    src = tmp_path / "src"
+    media = [
+        MediaFile(path=src / "a.jpg", created_at=datetime(2002, 9, 27), media_type=MediaType.IMAGE),
+        MediaFile(path=src / "v.mp4", created_at=datetime(2002, 9, 27), media_type=MediaType.VIDEO),
+        MediaFile(path=src / "b.jpg", created_at=datetime(2003, 1, 2), media_type=MediaType.IMAGE),
+    ]
+    skip = {dest / "2002" / "sep" / "pics" / "a.jpg"}
+    plan = build_plan(media, dest, skip_destinations=skip)
+
+    index = PlanIndex(plan, dest)
+
+    assert index.dir_names[0] == str(dest)
+    assert [index.dir_names[d] for d in index.dir_children[0]] == ["2002", "2003"]
+
+    pics = index.dir_id(dest / "2002" / "sep" / "pics")
+    assert pics is not None
+    assert index.file_count[pics] == 1
+    assert index.copy_count[pics] == 0
+    row = index.file_start[pics]
+    assert index.file_kind[row] == FILE_SKIPPED
+    assert index.skip_reason(row) == "resume"
+
+    vids = index.dir_id(dest / "2002" / "sep" / "videos")
+    row = index.file_start[vids]
+    assert index.file_kind[row] == FILE_COPY
+    assert index.file_source(row) == src / "v.mp4"
+
+    for op_index, op in enumerate(plan.operations):
+        if op.op_type.value == "copy":
+            assert index.file_destination(index.op_rows[op_index]) == op.destination
+
+    totals = index.copy_totals()
+    assert totals[0] == 2
+    assert index.ancestors(vids)[-1] == 0
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+from orgpicsvideos.core.plan_table import PlanRow, PlanTable
+from orgpicsvideos.core.planner import build_plan
+from orgpicsvideos.core.types import MediaFile, MediaType, OperationType, PlannedOperation
+
+
+def _ops() -> list[PlannedOperation]:
+    return [
+        PlannedOperation(OperationType.MKDIR, None, Path("/dest/2020/jan/pics")),
+        PlannedOperation(
+            OperationType.COPY,
+            Path("/src/a/IMG_1.JPG"),
+            Path("/dest/2020/jan/pics/IMG_1.JPG"),
+            MediaType.IMAGE,
+        ),
+        PlannedOperation(
+            OperationType.COPY,
+            Path("/src/b/IMG_1.JPG"),
+            Path("/dest/2020/jan/pics/IMG_1_1.JPG"),
+            MediaType.IMAGE,
+        ),
+        PlannedOperation(OperationType.DELETE, None, Path("/dest/._IMG_1.JPG")),
+    ]
+
+
+def test_plan_table_round_trips_operations() -> None:
+    ops = _ops()
+    table = PlanTable(ops)
+
+    assert len(table) == len(ops)
+    assert list(table) == ops
+    assert table[-1] == ops[-1]
+    assert table[1:3] == ops[1:3]
+    assert list(table.op_types()) == [op.op_type for op in ops]
+    assert list(table.destination_dirs()) == [str(op.destination.parent) for op in ops]
+
+
+def test_rows_are_lazy_views_over_interned_names() -> None:
+    ops = _ops()
+    table = PlanTable(ops)
+
+    # "pics", "IMG_1.JPG", "IMG_1_1.JPG" and "._IMG_1.JPG"; the repeated basename is shared.
+    assert len(table._segments[0].names) == 4
+    row = table[2]
+    assert isinstance(row, PlanRow)
+    assert row.op_type == OperationType.COPY and table.op_type(2) == OperationType.COPY
+    assert row._source is None and row._destination is None
+    assert row == ops[2] and ops[2] == row and hash(row) == hash(ops[2])
+    assert row.source is row.source
+    assert row.operation() == ops[2] and type(row.operation()) is PlannedOperation
+
+
+def test_concat_shares_segments_and_keeps_them_immutable() -> None:
+    ops = _ops()
+    table = PlanTable(ops[1:])
+    prefix = [ops[0]]
+
+    combined = prefix + table
+    assert isinstance(combined, PlanTable)
+    assert list(combined) == ops
+    assert combined._segments[-1] is table._segments[0]
+
+    # Appending to either side must not leak rows into the other.
+    table.append(OperationType.MKDIR, Path("/dest/2021"))
+    combined.append(OperationType.MKDIR, Path("/dest/2022"))
+    assert len(table) == len(ops)
+    assert len(combined) == len(ops) + 1
+    assert table[-1].destination == Path("/dest/2021")
+    assert combined[-1].destination == Path("/dest/2022")
+    assert list(combined)[: len(ops)] == ops
+
+
+def test_build_plan_records_sizes_in_table(tmp_path: Path) -> None:
+    source = tmp_path / "src"
+    source.mkdir()
+    media = []
+    for index, size in enumerate((10, 20)):
+        path = source / f"IMG_{index}.JPG"
+        path.write_bytes(b"x" * size)
+        stat = path.stat()
+        media.append(
+            MediaFile(
+                path, datetime(2020, 1, 5), MediaType.IMAGE, size=size, mtime_ns=stat.st_mtime_ns
+            )
+        )
+
+    plan = build_plan(media, tmp_path / "dest")
+
+    table = plan.operations
+    assert isinstance(table, PlanTable)
+    assert [table.op_type(i) for i in range(len(table))] == [
+        OperationType.MKDIR,
+        OperationType.COPY,
+        OperationType.COPY,
+    ]
+    assert list(table.sizes()) == [0, 10, 20]
+    assert table.mtime_ns(1) == media[0].mtime_ns
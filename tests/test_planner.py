@@ -51,3 +51,28 @@ def test_build_plan_skips_duplicate(tmp_path: Path) -> None:
     plan = build_plan([media], dest)
     assert plan.total_files == 0
     assert plan.skipped_duplicates == 1
+
+
+def test_build_plan_records_directory_existence(tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    (dest / "2002" / "sep").mkdir(parents=True)
+    (dest / "2003" / "jan" / "pics").mkdir(parents=True)
+    (dest / "2003" / "jan" / "pics" / "b.jpg").write_bytes(b"other")
+    files = [
+        MediaFile(path=tmp_path / "a.jpg", created_at=datetime(2002, 9, 27), media_type=MediaType.IMAGE),
+        MediaFile(path=tmp_path / "b.jpg", created_at=datetime(2003, 1, 2), media_type=MediaType.IMAGE),
+    ]
+    (tmp_path / "b.jpg").write_bytes(b"new")
+
+    plan = build_plan(files, dest)
+    by_path = {planned.path: planned for planned in plan.directories}
+
+    new_pics = by_path[dest / "2002" / "sep" / "pics"]
+    assert not new_pics.exists
+    assert new_pics.existing_depth == 2
+    existing_pics = by_path[dest / "2003" / "jan" / "pics"]
+    assert existing_pics.exists
+    assert existing_pics.existing_depth == 3
+    # Name collisions are resolved from the same directory listing.
+    copies = [op.destination.name for op in plan.operations if op.op_type.value == "copy"]
+    assert "b_1.jpg" in copies
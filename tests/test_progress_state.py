@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from orgpicsvideos.ui.progress_state import ProgressState
+
+
+def test_progress_state_drains_queued_events_once() -> None:
+    state = ProgressState()
+    snapshot = state.drain()
+    assert snapshot.found is None
+    assert snapshot.log_lines == []
+
+    state.found = (3, 1)
+    state.add_log("copy a -> b [SUCCESS]")
+    state.add_log("copy c -> d [FAIL] reason=x")
+    state.add_op_result(0, True)
+    state.add_op_result(1, False)
+
+    snapshot = state.drain()
+    assert snapshot.found == (3, 1)
+    assert snapshot.log_lines == ["copy a -> b [SUCCESS]", "copy c -> d [FAIL] reason=x"]
+    assert snapshot.op_results == [(0, True), (1, False)]
+
+    snapshot = state.drain()
+    assert snapshot.found == (3, 1)
+    assert snapshot.log_lines == []
+    assert snapshot.op_results == []
@@ -47,3 +47,34 @@ def test_rebuild_delete_empty_dirs(tmp_path: Path) -> None:
     log_path = make_log_path(dest)
     summary = rebuild_destination(dest, log_path, delete_empty_dirs=True)
     assert summary.deleted_empty_dirs >= 1
+
+
+def test_rebuild_prunes_emptied_dirs_without_rewalking(monkeypatch, tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    old_dir = dest / "old" / "nested"
+    old_dir.mkdir(parents=True)
+    photo = old_dir / "photo.jpg"
+    photo.write_bytes(b"abc")
+    mtime = datetime(2002, 9, 27, 10, 0, 0).timestamp()
+    os.utime(photo, (mtime, mtime))
+    (old_dir / ".DS_Store").write_bytes(b"junk")
+    (old_dir / "._photo.jpg").write_bytes(b"junk")
+    keep_dir = dest / "docs"
+    keep_dir.mkdir()
+    (keep_dir / "notes.txt").write_text("keep", encoding="utf-8")
+
+    from orgpicsvideos.core import rebuild as rebuild_module
+    from orgpicsvideos.core.logger import make_log_path
+
+    def no_walk(*args, **kwargs):  # noqa: ANN002, ANN003
+        raise AssertionError("pruning must not re-walk the tree")
+
+    monkeypatch.setattr(rebuild_module.os, "walk", no_walk)
+    monkeypatch.setattr(Path, "rglob", no_walk)
+
+    summary = rebuild_module.rebuild_destination(dest, make_log_path(dest), delete_empty_dirs=True)
+    assert summary.moved == 1
+    assert summary.deleted_empty_dirs == 2
+    assert not (dest / "old").exists()
+    assert (keep_dir / "notes.txt").exists()
+    assert (dest / "2002" / "sep" / "pics" / "photo.jpg").exists()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from orgpicsvideos.core.journal import JournalError, RebuildJournal, read_plan
+from orgpicsvideos.core.logger import make_log_path
+from orgpicsvideos.core.rebuild import (
+    apply_rebuild_plan,
+    build_rebuild_operations,
+    rebuild_destination,
+    write_rebuild_plan,
+)
+from orgpicsvideos.core.types import OperationType
+from orgpicsvideos.rebuild import main as rebuild_main
+
+
+def _make_library(dest: Path, names: list[str]) -> None:
+    dest.mkdir()
+    mtime = datetime(2002, 9, 27, 10, 0, 0).timestamp()
+    for name in names:
+        path = dest / name
+        path.write_bytes(name.encode())
+        os.utime(path, (mtime, mtime))
+
+
+def test_plan_only_then_apply(tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    _make_library(dest, ["a.jpg", "b.mp4"])
+    plan_path = tmp_path / "plan.jsonl"
+
+    summary = write_rebuild_plan(dest, plan_path)
+    assert summary.moved == 2
+    assert (dest / "a.jpg").exists()
+    root, ops, _header = read_plan(plan_path)
+    assert root == dest
+    assert sum(op.op_type == OperationType.MOVE for op in ops) == 2
+
+    journal = RebuildJournal(tmp_path / "journal")
+    apply_rebuild_plan(plan_path, make_log_path(dest), journal=journal)
+    assert (dest / "2002" / "sep" / "pics" / "a.jpg").exists()
+    assert (dest / "2002" / "sep" / "videos" / "b.mp4").exists()
+    assert not journal.pending()
+
+
+def test_interrupted_rebuild_resumes_from_journal(monkeypatch, tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    _make_library(dest, ["a.jpg", "b.jpg", "c.jpg"])
+    journal = RebuildJournal(tmp_path / "journal")
+    ops, summary = build_rebuild_operations(dest)
+    journal.begin(dest, ops, {"moved": summary.moved, "total_files": summary.total_files})
+
+    # Simulate a crash after one move was applied but before the cursor was flushed.
+    first_move = next(op for op in ops if op.op_type == OperationType.MOVE)
+    first_move.destination.parent.mkdir(parents=True)
+    shutil.move(first_move.source, first_move.destination)
+
+    from orgpicsvideos.core import rebuild as rebuild_module
+
+    def fail_scan(*args, **kwargs):  # noqa: ANN002, ANN003
+        raise AssertionError("resume must not replan")
+
+    monkeypatch.setattr(rebuild_module, "scan_media", fail_scan)
+    log_path = make_log_path(dest)
+    rebuild_destination(dest, log_path, journal=journal)
+
+    pics = dest / "2002" / "sep" / "pics"
+    assert sorted(p.name for p in pics.iterdir()) == ["a.jpg", "b.jpg", "c.jpg"]
+    assert "already_applied=1" in log_path.read_text(encoding="utf-8")
+    assert not journal.pending()
+
+
+def test_resume_from_another_working_directory(monkeypatch, tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    _make_library(dest, ["a.jpg", "b.jpg"])
+    journal = RebuildJournal(tmp_path / "journal")
+    monkeypatch.chdir(tmp_path)
+
+    from orgpicsvideos.core import rebuild as rebuild_module
+
+    def interrupt(*args, **kwargs):  # noqa: ANN002, ANN003
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patch:
+        patch.setattr(rebuild_module, "execute_plan", interrupt)
+        try:
+            rebuild_destination(Path("dest"), tmp_path / "first.log", journal=journal)
+        except KeyboardInterrupt:
+            pass
+    assert journal.pending()
+
+    monkeypatch.chdir(dest)
+    rebuild_destination(dest, tmp_path / "second.log", journal=journal)
+    pics = dest / "2002" / "sep" / "pics"
+    assert sorted(p.name for p in pics.iterdir()) == ["a.jpg", "b.jpg"]
+
+
+def test_apply_refuses_to_overwrite_another_pending_journal(tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    _make_library(dest, ["a.jpg"])
+    journal = RebuildJournal(tmp_path / "journal")
+    ops, summary = build_rebuild_operations(dest)
+    journal.begin(dest, ops, {"moved": summary.moved})
+    plan_path = tmp_path / "plan.jsonl"
+    write_rebuild_plan(dest, plan_path)
+
+    with pytest.raises(JournalError, match="--fresh"):
+        apply_rebuild_plan(plan_path, make_log_path(dest), journal=journal)
+    assert journal.pending() and journal.origin() is None
+    assert (dest / "a.jpg").exists()
+
+
+def test_apply_cli_rejects_another_destination(monkeypatch, tmp_path: Path) -> None:
+    planned = tmp_path / "planned"
+    _make_library(planned, ["a.jpg"])
+    other = tmp_path / "other"
+    other.mkdir()
+    plan_path = tmp_path / "plan.jsonl"
+    monkeypatch.setattr(sys, "argv", ["rebuild", str(planned), "--plan-only", str(plan_path)])
+    rebuild_main()
+
+    monkeypatch.setattr(
+        sys, "argv", ["rebuild", str(other), "--apply", str(plan_path), "--no-progress"]
+    )
+    with pytest.raises(SystemExit, match="not .*other"):
+        rebuild_main()
+    assert (planned / "a.jpg").exists()
+    assert list(other.iterdir()) == []
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+# Import-time budget per console script, in milliseconds. Budgets are several
+# times the measured cost so the test catches a heavy import, not a slow runner.
+ENTRY_POINTS = {
+    "orgpicsvideos.importer": 400,
+    "orgpicsvideos.rebuild": 400,
+    "orgpicsvideos.cleanup": 400,
+    "orgpicsvideos.dedupe": 400,
+    "orgpicsvideos.verify": 400,
+    "orgpicsvideos.__main__": 2000,
+}
+
+# Media decoders load on first use; the GUI additionally needs Qt.
+FORBIDDEN = {
+    "orgpicsvideos.importer": ("PIL", "hachoir", "PySide6"),
+    "orgpicsvideos.rebuild": ("PIL", "hachoir", "PySide6"),
+    "orgpicsvideos.cleanup": ("PIL", "hachoir", "PySide6"),
+    "orgpicsvideos.dedupe": ("PIL", "hachoir", "PySide6"),
+    "orgpicsvideos.verify": ("PIL", "hachoir", "PySide6"),
+    "orgpicsvideos.__main__": ("hachoir",),
+}
+
+
+def _import_profile(module: str) -> tuple[int, set[str]]:
+    """Return the cumulative import time (us) of ``module`` and all modules it loaded."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    cumulative = 0
+    loaded: set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, total, name = line[len("import time:") :].split("|", 2)
+        if not total.strip().isdigit():
+            continue
+        loaded.add(name.strip())
+        if name.strip() == module:
+            cumulative = int(total)
+    return cumulative, loaded
+
+
+@pytest.mark.parametrize("module", sorted(ENTRY_POINTS))
+def test_entry_point_import_budget(module: str) -> None:
+    cumulative, loaded = _import_profile(module)
+    assert cumulative > 0
+    for prefix in FORBIDDEN[module]:
+        heavy = sorted(name for name in loaded if name.split(".")[0] == prefix)
+        assert not heavy, f"{module} imports {heavy[:3]}"
+    assert cumulative / 1000 < ENTRY_POINTS[module], f"{module} took {cumulative / 1000:.0f} ms"
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from io import BytesIO
+import os
+from pathlib import Path
+import struct
+import time
+
+from PIL import Image
+from PySide6 import QtWidgets
+
+from orgpicsvideos.core.thumbnails import ThumbnailCache, load_thumbnail, make_thumbnail
+from orgpicsvideos.ui.thumbnails import ThumbnailLoader, ThumbnailPane
+
+
+def _get_or_create_app() -> QtWidgets.QApplication:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication([])
+    return app
+
+
+def _exif_with_thumbnail(thumbnail: bytes) -> bytes:
+    # Minimal little-endian TIFF: empty IFD0 followed by IFD1 pointing at the JPEG.
+    ifd0 = struct.pack("<HI", 0, 14)
+    data_offset = 14 + 2 + 2 * 12 + 4
+    ifd1 = (
+        struct.pack("<H", 2)
+        + struct.pack("<HHII", 0x0201, 4, 1, data_offset)
+        + struct.pack("<HHII", 0x0202, 4, 1, len(thumbnail))
+        + struct.pack("<I", 0)
+    )
+    return b"Exif\x00\x00" + b"II*\x00" + struct.pack("<I", 8) + ifd0 + ifd1 + thumbnail
+
+
+def _jpeg(size: tuple[int, int], color: tuple[int, int, int]) -> bytes:
+    output = BytesIO()
+    Image.new("RGB", size, color).save(output, "JPEG")
+    return output.getvalue()
+
+
+def test_make_thumbnail_prefers_embedded_exif_thumbnail(tmp_path: Path) -> None:
+    embedded = _jpeg((8, 6), (0, 255, 0))
+    photo = tmp_path / "photo.jpg"
+    Image.new("RGB", (400, 300), (255, 0, 0)).save(photo, "JPEG", exif=_exif_with_thumbnail(embedded))
+
+    assert make_thumbnail(photo) == embedded
+
+
+def test_make_thumbnail_downscales_without_exif(tmp_path: Path) -> None:
+    photo = tmp_path / "photo.jpg"
+    photo.write_bytes(_jpeg((1200, 800), (0, 0, 255)))
+
+    data = make_thumbnail(photo, (160, 160))
+    with Image.open(BytesIO(data)) as thumb:
+        assert max(thumb.size) <= 160
+    assert make_thumbnail(tmp_path / "clip.mp4") is None
+
+
+def test_thumbnail_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ThumbnailCache(tmp_path / "cache", max_bytes=2500)
+    files = []
+    for idx in range(3):
+        path = tmp_path / f"{idx}.bin"
+        path.write_bytes(bytes([idx]) * (idx + 1))
+        files.append(path.stat())
+
+    cache.put(files[0], b"a" * 1000)
+    cache.put(files[1], b"b" * 1000)
+    # Touch the first entry so the second one becomes the oldest.
+    past = time.time() - 60
+    os.utime(cache._entry_path(files[1]), (past, past))
+    assert cache.get(files[0]) == b"a" * 1000
+    cache.put(files[2], b"c" * 1000)
+
+    assert cache.get(files[1]) is None
+    assert cache.get(files[0]) is not None
+    assert cache.get(files[2]) is not None
+
+
+def test_load_thumbnail_uses_cache(tmp_path: Path) -> None:
+    photo = tmp_path / "photo.jpg"
+    photo.write_bytes(_jpeg((640, 480), (10, 20, 30)))
+    cache_dir = tmp_path / "cache"
+
+    first = load_thumbnail(str(photo), str(cache_dir))
+    assert first is not None
+    assert len(list(cache_dir.glob("*.jpg"))) == 1
+    assert load_thumbnail(str(photo), str(cache_dir)) == first
+
+
+def test_thumbnail_loader_runs_in_process_pool(tmp_path: Path) -> None:
+    app = _get_or_create_app()
+    photo = tmp_path / "photo.jpg"
+    photo.write_bytes(_jpeg((640, 480), (10, 20, 30)))
+
+    loader = ThumbnailLoader(cache_dir=tmp_path / "cache", workers=1)
+    loaded: list[str] = []
+    loader.loaded.connect(loaded.append)
+    try:
+        loader.request([str(photo)])
+        deadline = time.monotonic() + 30
+        while not loaded and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.02)
+    finally:
+        loader.shutdown()
+
+    assert loaded == [str(photo)]
+    pixmap = loader.pixmap(str(photo))
+    assert pixmap is not None and not pixmap.isNull()
+
+
+class _RecordingLoader(ThumbnailLoader):
+    def __init__(self) -> None:
+        super().__init__()
+        self.requested: list[str] = []
+
+    def request(self, paths: list[str]) -> None:
+        self.requested = paths
+
+
+def test_pane_prefetches_about_two_screens(tmp_path: Path) -> None:
+    app = _get_or_create_app()
+    loader = _RecordingLoader()
+    pane = ThumbnailPane(loader)
+    pane.resize(800, 600)
+    pane.show()
+    pane.set_paths([tmp_path / f"IMG_{index:04d}.jpg" for index in range(5000)])
+    app.processEvents()
+
+    viewport = pane.viewport().rect()
+    model = pane.thumbnail_model
+    for offset in (0, 400, 1003):
+        pane.verticalScrollBar().setValue(offset)
+        app.processEvents()
+        on_screen = [
+            row
+            for row in range(model.rowCount())
+            if pane.visualRect(model.index(row)).intersects(viewport)
+        ]
+        visible = pane.visible_rows()
+        assert visible.start <= on_screen[0] and on_screen[-1] < visible.stop
+        assert len(visible) <= len(on_screen) + 2 * pane.viewport().width() // pane.gridSize().width()
+
+        pane.prefetch_visible()
+        assert loader.requested[0] == model.path(visible.start)
+        assert len(on_screen) <= len(loader.requested) <= 2 * len(visible)
+    pane.close()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import pstats
+import sys
+import threading
+
+import pytest
+
+from orgpicsvideos.core.trace import TRACER, Tracer
+from orgpicsvideos.importer import main as import_main
+
+
+@pytest.fixture(autouse=True)
+def _stop_tracer():
+    yield
+    TRACER.stop()
+
+
+def test_tracer_buffer_is_bounded_and_names_threads(tmp_path: Path) -> None:
+    tracer = Tracer()
+    with tracer.span("list", "walk", "/nowhere"):
+        pass
+    assert tracer.events() == []
+
+    tracer.start(capacity=3)
+
+    def work(index: int) -> None:
+        with tracer.span("copy", "exec", f"/dest/{index}"):
+            pass
+
+    threads = [threading.Thread(target=work, args=(i,), name=f"exec_{i}") for i in range(5)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    tracer.save(tmp_path / "trace.json")
+
+    data = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))
+    spans = [e for e in data["traceEvents"] if e["ph"] == "X"]
+    # The oldest spans were dropped to stay within capacity.
+    assert [e["args"]["path"] for e in spans] == ["/dest/2", "/dest/3", "/dest/4"]
+    assert data["otherData"]["dropped_events"] == 2
+    names = {e["tid"]: e["args"]["name"] for e in data["traceEvents"] if e["ph"] == "M"}
+    assert {names[e["tid"]] for e in spans} == {"exec_2", "exec_3", "exec_4"}
+
+
+def test_import_writes_trace_and_phase_profiles(tmp_path: Path, capsys) -> None:
+    source = tmp_path / "src"
+    (source / "nested").mkdir(parents=True)
+    (source / "a.jpg").write_bytes(b"a" * 100)
+    (source / "nested" / "b.mp4").write_bytes(b"b" * 300)
+    dest = tmp_path / "dest"
+    trace = tmp_path / "out" / "run.json"
+
+    argv = sys.argv
+    sys.argv = [
+        "orgpicsvideos-import",
+        str(source),
+        str(dest),
+        "--jobs",
+        "2",
+        "--trace",
+        str(trace),
+        "--profile",
+    ]
+    try:
+        import_main()
+    finally:
+        sys.argv = argv
+
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    assert {e["name"] for e in spans if e["cat"] == "phase"} == {"scan", "plan", "exec"}
+    listed = {e["args"]["path"] for e in spans if e["cat"] == "walk"}
+    # The destination is walked too, to index the library and find sidecars.
+    assert {str(source), str(source / "nested"), str(dest)} <= listed
+    assert {Path(e["args"]["path"]).name for e in spans if e["cat"] == "metadata"} == {
+        "a.jpg",
+        "b.mp4",
+    }
+    copies = [e for e in spans if e["cat"] == "exec" and e["name"] == "copy"]
+    assert len(copies) == 2 and all(e["dur"] >= 0 for e in copies)
+    for phase in ("scan", "plan", "exec"):
+        assert pstats.Stats(str(tmp_path / "out" / f"run.{phase}.prof")).total_calls > 0
+    assert f"Trace: {trace}" in capsys.readouterr().err
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -9,6 +10,10 @@ from PySide6 import QtWidgets
 from orgpicsvideos.core.planner import build_plan
 from orgpicsvideos.core.types import MediaFile, MediaType
 from orgpicsvideos.ui.app import MainWindow
+from orgpicsvideos.ui import existence
+from orgpicsvideos.ui.existence import ExistenceProbe
+from orgpicsvideos.ui.plan_index import PlanIndex
+from orgpicsvideos.ui.plan_model import MODE_PLANNED, PlanTreeModel
 
 
 def _get_or_create_app() -> QtWidgets.QApplication:
@@ -44,23 +49,106 @@ def test_planned_tree_and_execution_tree(tmp_path: Path) -> None:
     window._populate_execution_tree(plan, dest)
 
     # Planned tree should contain file nodes with (copy) label.
-    planned_items = []
-    root = window.structure_view.topLevelItem(0)
-    stack = [root]
-    while stack:
-        item = stack.pop()
-        planned_items.append(item.text(0))
-        for i in range(item.childCount()):
-            stack.append(item.child(i))
+    planned_items = _collect_labels(window.structure_model)
     assert any("(copy)" in text for text in planned_items)
 
     # Execution tree should contain pending statuses for planned operations.
-    exec_items = []
-    root_exec = window.execution_view.topLevelItem(0)
-    stack = [root_exec]
-    while stack:
-        item = stack.pop()
-        exec_items.append(item.text(0))
-        for i in range(item.childCount()):
-            stack.append(item.child(i))
+    exec_items = _collect_labels(window.execution_model)
     assert any("(pending)" in text for text in exec_items)
+
+
+def test_tree_model_loads_files_in_batches(tmp_path: Path) -> None:
+    _get_or_create_app()
+
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    src = tmp_path / "src"
+    media = [
+        MediaFile(
+            path=src / f"img_{idx:03d}.jpg",
+            created_at=datetime(2002, 9, 27),
+            media_type=MediaType.IMAGE,
+        )
+        for idx in range(25)
+    ]
+    plan = build_plan(media, dest)
+
+    model = PlanTreeModel(PlanIndex(plan, dest), MODE_PLANNED, batch_size=10)
+    pics = model.dir_index(dest / "2002" / "sep" / "pics")
+    assert model.hasChildren(pics)
+    assert model.rowCount(pics) == 0
+
+    model.fetchMore(pics)
+    assert model.rowCount(pics) == 10
+    first = model.index(0, 0, pics)
+    assert first.data() == "img_000.jpg (copy)"
+    assert first.parent() == pics
+
+    while model.canFetchMore(pics):
+        model.fetchMore(pics)
+    assert model.rowCount(pics) == 25
+
+
+def _collect_labels(model) -> list[str]:  # type: ignore[no-untyped-def]
+    labels = []
+    stack = [model.index(0, 0)]
+    while stack:
+        index = stack.pop()
+        labels.append(index.data())
+        while model.canFetchMore(index):
+            model.fetchMore(index)
+        for row in range(model.rowCount(index)):
+            stack.append(model.index(row, 0, index))
+    return labels
+
+
+def test_existence_probe_reports_off_thread(tmp_path: Path) -> None:
+    app = _get_or_create_app()
+    present = tmp_path / "present"
+    present.mkdir()
+    missing = tmp_path / "missing"
+
+    probe = ExistenceProbe()
+    received: dict[Path, bool] = {}
+    probe.results.connect(received.update)
+    probe.request([present, missing])
+
+    deadline = time.monotonic() + 5
+    while len(received) < 2 and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    assert received == {present: True, missing: False}
+
+    # A second request is answered from the cache.
+    received.clear()
+    probe.request([present])
+    assert received == {present: True}
+
+
+def test_existence_probe_retries_after_a_failed_probe(tmp_path: Path, monkeypatch) -> None:
+    app = _get_or_create_app()
+    present = tmp_path / "present"
+    present.mkdir()
+    probe = ExistenceProbe()
+    received: dict[Path, bool] = {}
+    probe.results.connect(received.update)
+
+    def denied(paths: list[Path]) -> dict[Path, bool]:
+        raise PermissionError("denied")
+
+    monkeypatch.setattr(existence, "_probe", denied)
+    probe.request([present])
+    deadline = time.monotonic() + 5
+    while probe._pending and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    assert not probe._pending and received == {}
+
+    monkeypatch.undo()
+    probe.request([present])
+    deadline = time.monotonic() + 5
+    while not received and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    probe.shutdown()
+    assert received == {present: True}
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+from orgpicsvideos.core.cache import MetadataCache
+from orgpicsvideos.core.copier import execute_plan
+from orgpicsvideos.core.logger import LogWriter, iter_successful_copies
+from orgpicsvideos.core.types import MediaType, OperationType, PlannedOperation
+from orgpicsvideos.core.verify import verify_copies
+from orgpicsvideos.verify import main as verify_main
+from orgpicsvideos.verify import parse_sample, sample_pairs
+
+
+def _import(tmp_path: Path, names: list[str]) -> tuple[Path, Path, Path]:
+    source = tmp_path / "src"
+    source.mkdir()
+    dest = tmp_path / "dest"
+    target = dest / "2020" / "jan" / "pics"
+    ops = [PlannedOperation(OperationType.MKDIR, None, target)]
+    for index, name in enumerate(names):
+        (source / name).write_bytes(name.encode() * (index + 1))
+        ops.append(
+            PlannedOperation(OperationType.COPY, source / name, target / name, MediaType.IMAGE)
+        )
+    log_path = dest / "20200101_000000.log"
+    with LogWriter(log_path, source, dest) as writer:
+        execute_plan(ops, writer.write)
+    return source, target, log_path
+
+
+def test_verify_reports_mismatches_and_missing_files(tmp_path: Path, capsys) -> None:
+    source, target, log_path = _import(tmp_path, ["a -> b.JPG", "b.JPG", "c.JPG", "d.JPG"])
+    assert [dst.name for _, dst in iter_successful_copies(log_path)] == [
+        "a -> b.JPG",
+        "b.JPG",
+        "c.JPG",
+        "d.JPG",
+    ]
+    (target / "b.JPG").write_bytes(b"B" * len("b.JPG") * 2)
+    (target / "c.JPG").unlink()
+    (source / "d.JPG").unlink()
+    report = tmp_path / "report.jsonl"
+
+    argv = sys.argv
+    sys.argv = ["verify", str(log_path.parent), "--report", str(report), "--format", "jsonl"]
+    try:
+        with pytest.raises(SystemExit) as exc:
+            verify_main()
+    finally:
+        sys.argv = argv
+
+    assert exc.value.code == 1
+    lines = [json.loads(line) for line in report.read_text(encoding="utf-8").splitlines()]
+    assert [(Path(item["destination"]).name, item["status"]) for item in lines] == [
+        ("b.JPG", "mismatch"),
+        ("c.JPG", "missing"),
+        ("d.JPG", "source-missing"),
+    ]
+    out = capsys.readouterr().out
+    assert "checked=4 ok=1 mismatched=1 missing=1 source_missing=1" in out
+
+
+def test_verify_reuses_stored_digests(tmp_path: Path) -> None:
+    _, _, log_path = _import(tmp_path, ["a.JPG", "b.JPG"])
+    pairs = list(iter_successful_copies(log_path))
+
+    with MetadataCache(tmp_path / "cache.sqlite") as cache:
+        first = verify_copies(pairs, source_store=cache, destination_store=cache)
+        again = verify_copies(pairs, per_device=1, source_store=cache, destination_store=cache)
+        rehashed = verify_copies(pairs, source_store=cache, destination_store=cache, rehash=True)
+
+    assert first.ok == again.ok == rehashed.ok == 2
+    assert first.bytes_hashed == rehashed.bytes_hashed > 0
+    assert again.bytes_hashed == 0
+    assert again.reused == 4
+
+
+def test_sample_parsing_and_selection() -> None:
+    assert parse_sample("5%") == pytest.approx(0.05)
+    assert parse_sample("100") == 1.0
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_sample("0%")
+
+    pairs = [(Path(f"/s/{i}"), Path(f"/d/{i}")) for i in range(1000)]
+    assert list(sample_pairs(pairs, 1.0)) == pairs
+    picked = list(sample_pairs(pairs, 0.1, seed=7))
+    assert picked == list(sample_pairs(pairs, 0.1, seed=7))
+    assert 50 < len(picked) < 150
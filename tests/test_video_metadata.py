@@ -16,7 +16,7 @@ def test_video_metadata_reasonable(monkeypatch, tmp_path: Path) -> None:
 
     meta_dt = datetime(2002, 9, 27, 10, 0, 0)
     monkeypatch.setattr(utils, "_video_creation_datetime", lambda _: meta_dt)
-    monkeypatch.setattr(utils, "_is_reasonable_media_datetime", lambda dt, p: True)
+    monkeypatch.setattr(utils, "_is_reasonable_media_datetime", lambda dt, p, stat=None: True)
 
     created = utils.get_creation_time(path, MediaType.VIDEO)
     assert created == meta_dt
@@ -31,7 +31,7 @@ def test_video_metadata_suspicious_falls_back_to_mtime(monkeypatch, tmp_path: Pa
 
     meta_dt = datetime(2026, 2, 22, 14, 28, 47)
     monkeypatch.setattr(utils, "_video_creation_datetime", lambda _: meta_dt)
-    monkeypatch.setattr(utils, "_is_reasonable_media_datetime", lambda dt, p: False)
+    monkeypatch.setattr(utils, "_is_reasonable_media_datetime", lambda dt, p, stat=None: False)
 
     created = utils.get_creation_time(path, MediaType.VIDEO)
     assert created == mtime_dt
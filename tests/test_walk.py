@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from orgpicsvideos.core.cancel import CancelToken, OperationCancelled
+from orgpicsvideos.core.walk import walk
+
+
+def _make_tree(root: Path) -> set[str]:
+    expected = set()
+    for idx in range(5):
+        sub = root / f"d{idx}" / "inner"
+        sub.mkdir(parents=True)
+        for name in (f"a{idx}.jpg", f"b{idx}.txt"):
+            (sub / name).write_bytes(b"x" * idx)
+            expected.add(str(sub / name))
+    skipped = root / "$RECYCLE.BIN"
+    skipped.mkdir()
+    (skipped / "hidden.jpg").write_bytes(b"x")
+    return expected
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_walk_skips_dirs_and_loads_stat(tmp_path: Path, jobs: int) -> None:
+    expected = _make_tree(tmp_path)
+
+    listings = walk(tmp_path, skip_dir={"$RECYCLE.BIN"}.__contains__, stat_file=True, jobs=jobs)
+    entries = [entry for listing in listings for entry in listing.files]
+    assert {entry.path for entry in entries} == expected
+    assert all(entry.stat is not None for entry in entries)
+    sizes = {entry.name: entry.stat.st_size for entry in entries}
+    assert sizes["a3.jpg"] == 3
+
+
+def test_walk_reports_skipped_dirs_and_stat_filter(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+
+    listings = {
+        listing.path: listing
+        for listing in walk(tmp_path, skip_dir={"$RECYCLE.BIN"}.__contains__, stat_file=lambda n: n.endswith(".jpg"))
+    }
+    root = listings[str(tmp_path)]
+    assert root.skipped_dirs == 1
+    assert len(root.dirs) == 5
+    inner = listings[str(tmp_path / "d1" / "inner")]
+    stats = {entry.name: entry.stat for entry in inner.files}
+    assert stats["a1.jpg"] is not None
+    assert stats["b1.txt"] is None
+
+
+def test_walk_cancel(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    token = CancelToken()
+    walker = walk(tmp_path, cancel=token)
+    next(walker)
+    token.cancel()
+    with pytest.raises(OperationCancelled):
+        list(walker)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import datetime
+import errno
+import os
+from pathlib import Path
+
+import pytest
+
+from orgpicsvideos.core import xattrs
+from orgpicsvideos.core.copier import execute_plan
+from orgpicsvideos.core.fs import LocalFS, use_fs
+from orgpicsvideos.core.hashing import full_digest
+from orgpicsvideos.core.planner import build_plan
+from orgpicsvideos.core.types import MediaFile, MediaType, OperationType
+from orgpicsvideos.core.utils import get_creation_time
+from orgpicsvideos.core.verify import verify_copies
+from orgpicsvideos.core.xattrs import Stamp, read_stamp, write_stamp
+
+
+@pytest.fixture
+def stampable(tmp_path: Path) -> Path:
+    probe = tmp_path / "probe"
+    probe.write_bytes(b"")
+    if not write_stamp(probe, Stamp(sha="x")):
+        pytest.skip("extended attributes are not supported here")
+    return tmp_path
+
+
+def test_stamp_round_trips_and_expires_when_file_changes(stampable: Path) -> None:
+    path = stampable / "IMG.JPG"
+    path.write_bytes(b"photo")
+    captured = datetime(2019, 12, 24, 18, 30, 5)
+
+    assert read_stamp(path) is None
+    assert write_stamp(path, Stamp(captured=captured, src_mtime_ns=123))
+    assert write_stamp(path, Stamp(sha="abc"))
+    assert read_stamp(path) == Stamp(captured=captured, sha="abc", src_mtime_ns=123)
+
+    path.write_bytes(b"edited")
+    assert read_stamp(path) is None
+    # A new stamp replaces every stale field.
+    assert write_stamp(path, Stamp(sha="def"))
+    assert read_stamp(path) == Stamp(sha="def")
+
+
+def test_copies_are_stamped_and_trusted_by_get_creation_time(stampable: Path) -> None:
+    source = stampable / "src"
+    source.mkdir()
+    photo = source / "IMG_0001.JPG"
+    photo.write_bytes(b"no exif here")
+    stat = photo.stat()
+    captured = datetime(2015, 7, 4, 12, 0, 0)
+    media = MediaFile(
+        photo, captured, MediaType.IMAGE, size=stat.st_size, mtime_ns=stat.st_mtime_ns
+    )
+    plan = build_plan([media], stampable / "dest")
+
+    execute_plan(plan.operations, lambda _: None, stamps=True)
+
+    copy = next(op for op in plan.operations if op.op_type == OperationType.COPY)
+    assert read_stamp(copy.destination) == Stamp(
+        captured=captured, sha=full_digest(photo), src_mtime_ns=stat.st_mtime_ns
+    )
+    # Verify trusts the sha stamp and only hashes the unstamped source.
+    summary = verify_copies([(photo, copy.destination)])
+    assert (summary.ok, summary.reused, summary.bytes_hashed) == (1, 1, stat.st_size)
+    # Without the stamp the file's mtime would win, since it has no EXIF.
+    assert get_creation_time(copy.destination) == captured
+    assert get_creation_time(photo) != captured
+
+
+def test_stamps_degrade_to_noop_without_xattr_support(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "IMG.JPG"
+    path.write_bytes(b"photo")
+    monkeypatch.setattr(xattrs, "SUPPORTED", False)
+
+    assert write_stamp(path, Stamp(sha="abc")) is False
+    assert read_stamp(path) is None
+    assert get_creation_time(path) == datetime.fromtimestamp(os.stat(path).st_mtime)
+
+
+class _LockedFileFS(LocalFS):
+    def __init__(self, locked: Path) -> None:
+        self.locked = str(locked)
+
+    def setxattr(self, path, name: str, value: bytes) -> None:  # type: ignore[no-untyped-def]
+        if str(path) == self.locked:
+            raise PermissionError(errno.EACCES, "denied", str(path))
+        super().setxattr(path, name, value)
+
+
+def test_permission_error_on_one_file_keeps_stamping_the_device(stampable: Path) -> None:
+    locked = stampable / "locked.jpg"
+    other = stampable / "other.jpg"
+    locked.write_bytes(b"a")
+    other.write_bytes(b"b")
+
+    with use_fs(_LockedFileFS(locked)):
+        assert write_stamp(locked, Stamp(sha="abc")) is False
+        assert write_stamp(other, Stamp(sha="def"))
+    assert read_stamp(locked) is None
+    assert read_stamp(other) == Stamp(sha="def")